@@ -1,47 +1,71 @@
 # admin_panel.py
 import tkinter as tk
+import queue
+import threading
 from tkinter import filedialog, messagebox, ttk
 from datetime import datetime
-from database import DatabaseManager
-from utils import THEME_RED, THEME_WHITE, center_window
+from remote_database import open_database
+from roster_import import import_roster
+from image_loader import ImageLoader
+from virtual_list import VirtualList
+from clock import ClockService
+from thumbnails import THUMB_SIZE
+import tracing
+from utils import THEME_RED, THEME_WHITE, center_window, configure_window
 import os
 from PIL import Image, ImageTk 
 
 
-class AdminPanel:
-    def __init__(self):
-        self.db = DatabaseManager()
-        self._photo_cache = []
-        self.win = None
+# Screens worth having ready before the admin clicks on them
+PREBUILD_SCREENS = ("candidates", "poll_status", "manage_candidates")
 
-    # ---------- ADMIN DASHBOARD ----------
-        # ---------- ADMIN DASHBOARD ----------
-    def show_dashboard(self):
-        self.win = tk.Tk()
-        self.win.title("Admin Dashboard")
+# Rows fetched at a time by Manage Candidates as the list is scrolled
+CANDIDATE_PAGE_SIZE = 200
+# ... and by the Students roster
+STUDENT_PAGE_SIZE = 200
 
-        # ---------- Responsive initial sizing ----------
-        # Get screen size
-        screen_w = self.win.winfo_screenwidth()
-        screen_h = self.win.winfo_screenheight()
 
-        # Your original "design" size
-        base_w, base_h = 997, 700
+class AdminScreen:
+    """A sidebar screen kept (hidden) after it has been built.
 
-        # Use up to 90% of screen, but not more than your base design
-        width = min(base_w, int(screen_w * 0.9))
-        height = min(base_h, int(screen_h * 0.9))
+    version is the get_results_version() the screen shows. A static screen
+    is rebuilt when the data has moved on; a live one keeps its widgets and
+    is refreshed in place by its watcher. on_show runs on every show.
+    """
 
-        # Center the window with the computed size
-        center_window(self.win, width, height)
+    def __init__(self, frame, version, on_show=None, live=False):
+        self.frame = frame
+        self.version = version
+        self.on_show = on_show
+        self.live = live
 
-        # Allow resizing + set a reasonable minimum
-        self.win.resizable(True, True)
-        self.win.minsize(800, 500)
-        self.win.configure(bg=THEME_WHITE)
+
+class AdminPanel:
+    """The admin view: built once by the router, then entered per admin login."""
+
+    def __init__(self, db=None, root=None, on_logout=None):
+        self.db = db if db is not None else open_database()
+        self._photo_cache = []
+        self.win = root
+        self.on_logout = on_logout
+        self._image_loader = None
+        self._live_clock = None
+        self.live_updates = None
+        self._screens = {}   # key -> AdminScreen
+        self._current = None
+        self._prebuild_keys = []
+
+    # ---------- ADMIN DASHBOARD ----------
+    def mount(self, parent):
+        """Build the header, sidebar and content area once; enter() shows them."""
+        self.win = parent.winfo_toplevel()
+        self._image_loader = ImageLoader(parent)
+        # Results screens poll for new votes on this clock
+        self._live_clock = ClockService(parent, interval=3.0)
+        self.live_updates = tk.BooleanVar(master=self.win, value=True)
 
         # ---------- Header ----------
-        header = tk.Frame(self.win, bg=THEME_RED, height=60)
+        header = tk.Frame(parent, bg=THEME_RED, height=60)
         header.pack(fill="x")
         tk.Label(
             header,
@@ -52,7 +76,7 @@ class AdminPanel:
         ).pack(pady=10)
 
         # ---------- Main Frame ----------
-        main_frame = tk.Frame(self.win, bg=THEME_WHITE)
+        main_frame = tk.Frame(parent, bg=THEME_WHITE)
         main_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
         # ✅ Make main_frame use grid and be responsive
@@ -80,8 +104,11 @@ class AdminPanel:
             ("Register Candidate", self.show_candidate_registration),
             ("View Candidates", self.show_candidates),
             ("Manage Candidates", self.show_manage_candidates),
+            ("Import Students", self.show_import_students),
+            ("Students", self.show_students),
             ("Set Voting Duration", self.show_voting_duration_window),
             ("View Poll Status", self.show_poll_status),
+            ("Voter Journeys", self.show_journey_report),
             ("Manage Positions", self.show_manage_positions),
             ("Reset Votes", self._reset_votes),
             ("Log Out", self._go_back),
@@ -106,7 +133,7 @@ class AdminPanel:
                 command=cmd,
             )
             # ✅ Make buttons stretch with sidebar width
-            btn.pack(pady=8, fill="x")
+            btn.pack(pady=5, fill="x")
 
             # Hover effect
             btn.bind(
@@ -122,25 +149,118 @@ class AdminPanel:
             )
 
         tk.Label(
-            self.win,
+            parent,
             text="© 2025 UTAMU Voting System",
             font=("Segoe UI", 9),
             bg=THEME_WHITE,
             fg="gray",
         ).pack(side="bottom", pady=4)
 
+    def enter(self):
+        # ---------- Responsive initial sizing ----------
+        # Get screen size
+        screen_w = self.win.winfo_screenwidth()
+        screen_h = self.win.winfo_screenheight()
+
+        # Your original "design" size
+        base_w, base_h = 997, 700
+
+        # Use up to 90% of screen, but not more than your base design
+        width = min(base_w, int(screen_w * 0.9))
+        height = min(base_h, int(screen_h * 0.9))
+
+        # Resizable, with a reasonable minimum, centred at the computed size
+        configure_window(self.win, "Admin Dashboard", width, height, minsize=(800, 500))
+
         # Show dashboard charts by default on login
         self.show_stats_dashboard()
+        # Then build the screens an admin usually opens next while idle
+        self._prebuild_keys = list(PREBUILD_SCREENS)
+        self.win.after_idle(self._prebuild)
+
+    def leave(self):
+        self._live_clock.clear()
+        self._image_loader.cancel_all()
+        # The next admin starts from fresh screens
+        for widget in self.right_panel.winfo_children():
+            widget.destroy()
+        self._screens.clear()
+        self._current = None
+        self._prebuild_keys = []
+        self._photo_cache.clear()
 
-        self.win.mainloop()
-
+    def close(self):
+        """On shutdown: stop the picture-decoding threads."""
+        self._image_loader.shutdown()
 
 
     # ---------- Helper: Display content on right panel ----------
-    def display_content(self, builder_func):
+    def display_content(self, builder_func, key=None, live=False):
+        """Show builder_func's screen in the right panel.
+
+        Screens with a key are built once and then hidden and shown with
+        grid_remove()/grid(); a static one is rebuilt only if the data
+        changed since (get_results_version). Without a key (forms) the
+        screen is built fresh every time, as before. builder_func(frame)
+        may return a callable that is run each time the screen is shown.
+        """
+        if self._image_loader is not None:
+            self._image_loader.cancel_all()
+        if self._live_clock is not None:
+            self._live_clock.clear()
+        cached = {screen.frame for screen in self._screens.values()}
         for widget in self.right_panel.winfo_children():
-            widget.destroy()
-        builder_func(self.right_panel)
+            if widget in cached:
+                widget.grid_remove()
+            else:
+                widget.destroy()
+        self._current = key
+
+        if key is None:
+            self._new_frame(builder_func)
+            return
+
+        screen = self._screens.get(key)
+        if screen is not None and not screen.live:
+            if self.db.get_results_version() != screen.version:
+                screen.frame.destroy()
+                screen = None
+        if screen is None:
+            screen = self._build_screen(key, builder_func, live)
+        screen.frame.grid()
+        if screen.on_show is not None:
+            screen.on_show()
+
+    def _new_frame(self, builder_func):
+        frame = tk.Frame(self.right_panel, bg=THEME_WHITE)
+        frame.grid(row=0, column=0, sticky="nsew")
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+        return frame, builder_func(frame)
+
+    def _build_screen(self, key, builder_func, live):
+        """Build a keyed screen (left hidden) and remember it."""
+        version = None if live else self.db.get_results_version()
+        frame, on_show = self._new_frame(builder_func)
+        frame.grid_remove()
+        screen = self._screens[key] = AdminScreen(frame, version, on_show, live)
+        return screen
+
+    def _prebuild(self):
+        """Build the next screen waiting in _prebuild_keys, one per idle moment."""
+        shows = {
+            "candidates": self.show_candidates,
+            "poll_status": self.show_poll_status,
+            "manage_candidates": self.show_manage_candidates,
+        }
+        keys = self._prebuild_keys
+        while keys:
+            key = keys.pop(0)
+            if key not in self._screens and key != self._current:
+                shows[key](prebuild=True)
+                break
+        if keys:
+            self.win.after_idle(self._prebuild)
 
     # ---------- Actions ----------
     def show_candidate_registration(self):
@@ -546,7 +666,7 @@ class AdminPanel:
         self.display_content(build)
 
 
-    def show_poll_status(self):
+    def show_poll_status(self, prebuild=False):
         def build(frame):
             tk.Label(frame, text="Current Poll Results", font=("Segoe UI", 16, "bold"),
                      bg=THEME_WHITE, fg=THEME_RED).pack(pady=10)
@@ -554,14 +674,79 @@ class AdminPanel:
             tree.heading("Position", text="Position")
             tree.heading("Name", text="Candidate Name")
             tree.heading("Votes", text="Votes")
+            self._live_toggle(frame)
             tree.pack(fill="both", expand=True, padx=10, pady=10)
 
-            data = self.db.get_poll_status()
-            for pos, name, votes in data:
-                tree.insert("", "end", values=(pos, name, votes))
-        self.display_content(build)
+            def refresh():
+                self._sync_tree(tree, [
+                    (str(cid), (pos, name, votes))
+                    for cid, pos, name, votes in self.db.get_tallies()
+                ])
+
+            return lambda: self._watch_results(refresh)
+        self._show_screen("poll_status", build, prebuild, live=True)
+
+    def show_journey_report(self):
+        """How long students wait at each step, read from this terminal's trace log."""
+        def build(frame):
+            tk.Label(frame, text="Voter Journeys", font=("Segoe UI", 16, "bold"),
+                     bg=THEME_WHITE, fg=THEME_RED).pack(pady=(10, 2))
+            source = tk.Label(frame, font=("Segoe UI", 9), bg=THEME_WHITE, fg="#555555")
+            source.pack()
+
+            tk.Label(frame, text="Per-stage latency (ms)", font=("Segoe UI", 11, "bold"),
+                     bg=THEME_WHITE, fg=THEME_RED).pack(anchor="w", padx=10, pady=(10, 2))
+            stages = ttk.Treeview(frame, columns=("Stage", "Count", "p50", "p90", "p99", "Max"),
+                                  show="headings", height=len(tracing.STAGES))
+            for col in ("Stage", "Count", "p50", "p90", "p99", "Max"):
+                stages.heading(col, text=col)
+                stages.column(col, width=140 if col == "Stage" else 80,
+                              anchor="w" if col == "Stage" else "center")
+            stages.pack(fill="x", padx=10)
+
+            tk.Label(frame, text="Slowest journeys", font=("Segoe UI", 11, "bold"),
+                     bg=THEME_WHITE, fg=THEME_RED).pack(anchor="w", padx=10, pady=(10, 2))
+            journeys = ttk.Treeview(frame, columns=("Trace", "Started", "Waited", "Worst"),
+                                    show="headings", height=10)
+            journeys.heading("Trace", text="Trace ID")
+            journeys.heading("Started", text="Started")
+            journeys.heading("Waited", text="Total wait (ms)")
+            journeys.heading("Worst", text="Slowest stage")
+            journeys.column("Trace", width=120, anchor="w")
+            journeys.column("Started", width=180, anchor="w")
+            journeys.column("Waited", width=110, anchor="center")
+            journeys.column("Worst", width=200, anchor="w")
+            journeys.pack(fill="both", expand=True, padx=10, pady=(0, 6))
+
+            def refresh():
+                try:
+                    stage_rows, journey_rows = tracing.journey_report()
+                except OSError as e:
+                    messagebox.showerror("Trace Log", f"Could not read {tracing.TRACE_FILE}:\n{e}")
+                    return
+                if stage_rows:
+                    text = f"This terminal's journeys only, from {tracing.TRACE_FILE}"
+                elif not tracing.ENABLED:
+                    text = (f"Tracing is off on this terminal. Start it with "
+                            f"{tracing.TRACE_ENV}=1 (or a log file path) to record journeys.")
+                else:
+                    text = "No journeys recorded on this terminal yet."
+                source.config(text=text)
+                self._sync_tree(stages, [
+                    (stage, (stage, count, f"{p50:.1f}", f"{p90:.1f}", f"{p99:.1f}", f"{worst:.1f}"))
+                    for stage, count, p50, p90, p99, worst in stage_rows
+                ])
+                self._sync_tree(journeys, [
+                    (trace, (trace, started, f"{total:.1f}", f"{stage} ({ms:.1f} ms)"))
+                    for trace, started, total, stage, ms in journey_rows
+                ])
+
+            tk.Button(frame, text="Refresh", bg=THEME_RED, fg=THEME_WHITE, relief="flat",
+                      width=12, command=refresh).pack(pady=(0, 10))
+            refresh()
+        self.display_content(build, key="journeys")
     
-    def show_candidates(self):
+    def show_candidates(self, prebuild=False):
         """Show all registered candidates with their photos and logos."""
         def build(frame):
             tk.Label(
@@ -572,51 +757,23 @@ class AdminPanel:
                 fg=THEME_RED
             ).pack(pady=10)
 
-            container = tk.Frame(frame, bg=THEME_WHITE)
-            container.pack(fill="both", expand=True)
-
-            # Scrollable area
-            canvas = tk.Canvas(container, bg=THEME_WHITE, highlightthickness=0)
-            scrollbar = tk.Scrollbar(container, orient="vertical", command=canvas.yview)
-            scroll_frame = tk.Frame(canvas, bg=THEME_WHITE)
-
-            scroll_frame.bind(
-                "<Configure>",
-                lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-            )
-
-            canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
-            canvas.configure(yscrollcommand=scrollbar.set)
-
-            canvas.pack(side="left", fill="both", expand=True)
-            scrollbar.pack(side="right", fill="y")
-
-            # --- Mouse wheel scrolling (no bind_all, so no TclError when closed) ---
-            def _on_mousewheel(event, c=canvas):
-                # Windows / MacOS (event.delta)
-                if hasattr(event, "delta") and event.delta:
-                    c.yview_scroll(int(-1 * (event.delta / 120)), "units")
-                else:
-                    # Linux (Button-4 / Button-5)
-                    if event.num == 4:
-                        c.yview_scroll(-1, "units")
-                    elif event.num == 5:
-                        c.yview_scroll(1, "units")
-
-            canvas.bind("<MouseWheel>", _on_mousewheel)   # Windows / Mac
-            canvas.bind("<Button-4>", _on_mousewheel)     # Linux scroll up
-            canvas.bind("<Button-5>", _on_mousewheel)     # Linux scroll down
-
-            # Load candidates
+            # Load candidates (ballot layout + live counts: two queries total)
             try:
-                candidates = self.db.get_candidates()
+                ballot = self.db.get_ballot()
+                vote_counts = self.db.get_vote_counts()
             except Exception as e:
                 messagebox.showerror("Database Error", f"Could not load candidates:\n{e}")
                 return
 
+            candidates = [
+                (cid, name, position, photo_path, logo_path)
+                for position, rows in ballot
+                for cid, name, photo_path, logo_path in rows
+            ]
+
             if not candidates:
                 tk.Label(
-                    scroll_frame,
+                    frame,
                     text="No candidates registered yet.",
                     bg=THEME_WHITE,
                     fg="gray",
@@ -625,91 +782,332 @@ class AdminPanel:
                 return
 
             # === Show last registered candidate on top ===
-            # Assuming id increases with each insert -> reverse list in Python
-            candidates = list(reversed(candidates))
+            candidates.sort(key=lambda row: row[0], reverse=True)
 
             # Clear old images
             self._photo_cache.clear()
+            placeholder = ImageTk.PhotoImage(
+                Image.new("RGB", THUMB_SIZE, color=(240, 240, 240)), master=self.win
+            )
+            self._photo_cache.append(placeholder)
 
-            for cid, name, position, votes, photo_path, logo_path in candidates:
+            def create_row(kind, parent):
+                outer = tk.Frame(parent, bg=THEME_WHITE)
                 card = tk.Frame(
-                    scroll_frame,
+                    outer,
                     bg=THEME_WHITE,
                     bd=1,
                     relief="solid",
                     padx=10,
                     pady=10
                 )
-                card.pack(fill="x", padx=15, pady=8)
-
-                # --- Candidate photo ---
-                photo_label = tk.Label(card, bg=THEME_WHITE)
-                photo_label.pack(side="left", padx=10)
+                card.pack(fill="both", expand=True, padx=15, pady=8)
 
-                try:
-                    if photo_path and os.path.exists(photo_path):
-                        img = Image.open(photo_path)
-                    else:
-                        raise FileNotFoundError
-
-                    img = img.resize((120, 120))
-                    # tie image to admin window
-                    photo_img = ImageTk.PhotoImage(img, master=self.win)
-                except Exception:
-                    placeholder = Image.new("RGB", (120, 120), color=(240, 240, 240))
-                    photo_img = ImageTk.PhotoImage(placeholder, master=self.win)
-
-                self._photo_cache.append(photo_img)
-                photo_label.config(image=photo_img)
-                photo_label.image = photo_img  # extra safety
-
-                # --- Candidate logo (optional) ---
-                logo_label = tk.Label(card, bg=THEME_WHITE)
-                logo_label.pack(side="left", padx=10)
-
-                if logo_path and os.path.exists(logo_path):
-                    try:
-                        logo_img = Image.open(logo_path).resize((120, 120))
-                        logo_photo = ImageTk.PhotoImage(logo_img, master=self.win)
-                        self._photo_cache.append(logo_photo)
-                        logo_label.config(image=logo_photo)
-                        logo_label.image = logo_photo
-                    except Exception:
-                        pass
+                # --- Candidate photo / logo (placeholder until decoded) ---
+                outer.photo = tk.Label(card, image=placeholder, bg=THEME_WHITE)
+                outer.photo.pack(side="left", padx=10)
+                outer.logo = tk.Label(card, bg=THEME_WHITE)
+                outer.logo.pack(side="left", padx=10)
 
                 # --- Text info ---
                 info = tk.Frame(card, bg=THEME_WHITE)
                 info.pack(side="left", padx=15)
 
-                tk.Label(
+                outer.name = tk.Label(
                     info,
-                    text=name,
                     font=("Segoe UI", 13, "bold"),
                     bg=THEME_WHITE,
                     fg="#333333"
-                ).pack(anchor="w")
+                )
+                outer.name.pack(anchor="w")
 
-                tk.Label(
+                outer.position = tk.Label(
                     info,
-                    text=f"Position: {position}",
                     font=("Segoe UI", 11),
                     bg=THEME_WHITE,
                     fg="#555555"
-                ).pack(anchor="w", pady=(2, 0))
+                )
+                outer.position.pack(anchor="w", pady=(2, 0))
 
-                tk.Label(
+                outer.votes = tk.Label(
                     info,
-                    text=f"Votes: {votes}",
                     font=("Segoe UI", 11),
                     bg=THEME_WHITE,
                     fg="#777777"
-                ).pack(anchor="w", pady=(2, 0))
+                )
+                outer.votes.pack(anchor="w", pady=(2, 0))
+                return outer
+
+            def bind_row(kind, row, data):
+                cid, name, position, photo_path, logo_path = data
+                row.name.config(text=name)
+                row.position.config(text=f"Position: {position}")
+                row.votes.config(text=f"Votes: {vote_counts.get(cid, 0)}")
+
+                row.photo.config(image=placeholder)
+                self._image_loader.load_into(row.photo, photo_path, master=self.win)
+                row.logo.config(image="")
+                row.logo.image_request = None
+                if logo_path:
+                    self._image_loader.load_into(row.logo, logo_path, master=self.win)
+
+            # Virtualized: only cards in view exist, recycled while scrolling
+            card_list = VirtualList(
+                frame,
+                row_heights={"candidate": 160},
+                create_row=create_row,
+                bind_row=bind_row,
+                items=[("candidate", row) for row in candidates],
+            )
+            card_list.frame.pack(fill="both", expand=True)
+            # Picture loads are cancelled while the screen is hidden
+            return card_list.rebind_visible
 
         # Use your shared right-panel content loader
+        self._show_screen("candidates", build, prebuild)
+
+
+
+
+    def show_import_students(self):
+        """Bulk-register students from the registrar's CSV/XLSX export."""
+        def build(frame):
+            tk.Label(frame, text="Import Students", font=("Segoe UI", 16, "bold"),
+                     bg=THEME_WHITE, fg=THEME_RED).pack(pady=(12, 2))
+            tk.Label(
+                frame,
+                text="CSV or Excel file with columns Name, Username, RegNo and optionally Password.\n"
+                     "Students without a password get a random one, saved (readable by you only)\n"
+                     "to <roster>_passwords_<time>.csv next to the file for handing out.",
+                font=("Segoe UI", 9),
+                bg=THEME_WHITE,
+                fg="#555555",
+                justify="center",
+            ).pack(pady=(0, 10))
+
+            # ----- File picker -----
+            file_frame = tk.Frame(frame, bg=THEME_WHITE)
+            file_frame.pack(fill="x", padx=20)
+
+            path_var = tk.StringVar()
+            tk.Entry(file_frame, textvariable=path_var, width=60).pack(side="left", fill="x", expand=True)
+
+            def browse():
+                path = filedialog.askopenfilename(
+                    title="Select Student Roster",
+                    filetypes=[("Rosters", "*.csv *.xlsx"), ("CSV", "*.csv"), ("Excel", "*.xlsx")],
+                )
+                if path:
+                    path_var.set(path)
+
+            tk.Button(file_frame, text="Browse", bg=THEME_RED, fg=THEME_WHITE,
+                      relief="flat", command=browse).pack(side="left", padx=(6, 0))
+
+            # ----- Progress -----
+            progress = ttk.Progressbar(frame, orient="horizontal", mode="determinate", maximum=100)
+            progress.pack(fill="x", padx=20, pady=(14, 4))
+            status = tk.Label(frame, text="", bg=THEME_WHITE, fg="#333333", font=("Segoe UI", 9))
+            status.pack(anchor="w", padx=20)
+
+            # ----- Rejected rows -----
+            tk.Label(frame, text="Rejected rows", font=("Segoe UI", 11, "bold"),
+                     bg=THEME_WHITE, fg=THEME_RED).pack(anchor="w", padx=20, pady=(10, 2))
+            rejects = ttk.Treeview(frame, columns=("Line", "Reason"), show="headings", height=10)
+            rejects.heading("Line", text="Line")
+            rejects.heading("Reason", text="Reason")
+            rejects.column("Line", width=70, anchor="center", stretch=False)
+            rejects.column("Reason", width=500, anchor="w")
+            rejects.pack(fill="both", expand=True, padx=20, pady=(0, 10))
+
+            btn_frame = tk.Frame(frame, bg=THEME_WHITE)
+            btn_frame.pack(pady=(0, 10))
+
+            # The import runs on a worker thread; it reports back through this
+            # queue and the Tk thread polls it, so the window stays responsive.
+            events = queue.SimpleQueue()
+            cancel = threading.Event()
+
+            def worker(path):
+                def report(fraction, inserted, rejected):
+                    events.put(("progress", (fraction, inserted, rejected)))
+                try:
+                    result = import_roster(self.db, path, progress=report, cancelled=cancel.is_set)
+                    events.put(("done", result))
+                except Exception as e:
+                    events.put(("error", e))
+                finally:
+                    self.db.close()   # this thread's connection
+
+            def poll():
+                if not frame.winfo_exists():
+                    cancel.set()
+                    return
+                while True:
+                    try:
+                        kind, value = events.get_nowait()
+                    except queue.Empty:
+                        break
+                    if kind == "progress":
+                        fraction, inserted, rejected = value
+                        progress["value"] = fraction * 100
+                        status.config(text=f"Imported {inserted} students, rejected {rejected} rows...")
+                    else:
+                        start_btn.config(state="normal")
+                        cancel_btn.config(state="disabled")
+                        if kind == "error":
+                            status.config(text="Import failed.")
+                            messagebox.showerror("Import Failed", str(value))
+                            return
+                        finish(value)
+                        return
+                frame.after(100, poll)
+
+            def finish(result):
+                if not cancel.is_set():
+                    progress["value"] = 100
+                shown = result.rejected[:1000]
+                for line_no, reason in shown:
+                    rejects.insert("", "end", values=(line_no, reason))
+                more = len(result.rejected) - len(shown)
+                status.config(
+                    text=f"{'Stopped' if cancel.is_set() else 'Done'}: imported {result.inserted} students, "
+                         f"rejected {len(result.rejected)} rows"
+                         + (f" (first {len(shown)} listed)." if more else ".")
+                )
+                if result.passwords_file:
+                    messagebox.showinfo(
+                        "Initial Passwords",
+                        "Students without a password in the file were given a random one.\n\n"
+                        f"They are listed in:\n{result.passwords_file}\n\n"
+                        "Hand them out, then keep the file somewhere safe or delete it.",
+                    )
+
+            def start():
+                path = path_var.get().strip()
+                if not path or not os.path.exists(path):
+                    messagebox.showwarning("No File", "Please choose a roster file to import.")
+                    return
+                cancel.clear()
+                rejects.delete(*rejects.get_children())
+                progress["value"] = 0
+                status.config(text="Reading file...")
+                start_btn.config(state="disabled")
+                cancel_btn.config(state="normal")
+                threading.Thread(target=worker, args=(path,), daemon=True).start()
+                frame.after(100, poll)
+
+            start_btn = tk.Button(btn_frame, text="Import", bg=THEME_RED, fg=THEME_WHITE,
+                                  width=14, relief="flat", command=start)
+            start_btn.pack(side="left", padx=6)
+            cancel_btn = tk.Button(btn_frame, text="Stop", bg=THEME_WHITE, fg=THEME_RED,
+                                   width=14, relief="flat", state="disabled", command=cancel.set)
+            cancel_btn.pack(side="left", padx=6)
+
         self.display_content(build)
 
+    def show_students(self):
+        """The student roster: search it and see who has voted."""
+        def build(frame):
+            tk.Label(frame, text="Students", font=("Segoe UI", 16, "bold"),
+                     bg=THEME_WHITE, fg=THEME_RED).pack(pady=(10, 2))
+            summary = tk.Label(frame, font=("Segoe UI", 9), bg=THEME_WHITE, fg="#555555")
+            summary.pack()
+
+            # ----- Search and filter (both run in SQL) -----
+            controls = tk.Frame(frame, bg=THEME_WHITE)
+            controls.pack(fill="x", padx=10, pady=(8, 4))
+            tk.Label(controls, text="Search:", bg=THEME_WHITE, fg=THEME_RED).pack(side="left")
+            search_var = tk.StringVar()
+            tk.Entry(controls, textvariable=search_var, width=32).pack(side="left", padx=6)
+
+            filters = {"All": None, "Voted": True, "Not voted": False}
+            filter_var = tk.StringVar(value="All")
+            for text in filters:
+                tk.Radiobutton(
+                    controls,
+                    text=text,
+                    variable=filter_var,
+                    value=text,
+                    bg=THEME_WHITE,
+                    activebackground=THEME_WHITE,
+                    command=lambda: load_students(),
+                ).pack(side="left", padx=4)
+
+            # ----- Roster -----
+            table = tk.Frame(frame, bg=THEME_WHITE)
+            table.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+            columns = ("RegNo", "Name", "Username", "Voted")
+            tree = ttk.Treeview(table, columns=columns, show="headings", height=18)
+            tree.heading("RegNo", text="Reg. Number")
+            tree.heading("Name", text="Name")
+            tree.heading("Username", text="Username")
+            tree.heading("Voted", text="Voted")
+            tree.column("RegNo", width=130, anchor="w")
+            tree.column("Name", width=220, anchor="w")
+            tree.column("Username", width=140, anchor="w")
+            tree.column("Voted", width=70, anchor="center")
+
+            scroll = tk.Scrollbar(table, orient="vertical", command=tree.yview)
+            tree.grid(row=0, column=0, sticky="nsew")
+            scroll.grid(row=0, column=1, sticky="ns")
+            table.rowconfigure(0, weight=1)
+            table.columnconfigure(0, weight=1)
+
+            state = {"after": 0, "more": True, "page_job": None, "search_job": None}
+
+            def load_students():
+                tree.delete(*tree.get_children())
+                state["after"] = 0
+                state["more"] = True
+                load_page()
+
+            def load_page():
+                state["page_job"] = None
+                if not state["more"]:
+                    return
+                try:
+                    rows = self.db.get_students_page(
+                        search_var.get().strip() or None,
+                        filters[filter_var.get()],
+                        state["after"],
+                        STUDENT_PAGE_SIZE,
+                    )
+                except Exception as e:
+                    state["more"] = False
+                    messagebox.showerror("Database Error", f"Could not load students:\n{e}")
+                    return
+                for sid, name, username, regno, voted in rows:
+                    tree.insert("", "end", iid=str(sid),
+                                values=(regno, name, username, "✓" if voted else "—"))
+                if rows:
+                    state["after"] = rows[-1][0]
+                state["more"] = len(rows) == STUDENT_PAGE_SIZE
+
+            def on_scroll(first, last):
+                scroll.set(first, last)
+                # Fetch the next page as the end of what is loaded comes into view
+                if state["more"] and float(last) > 0.9 and state["page_job"] is None:
+                    state["page_job"] = tree.after_idle(load_page)
+
+            tree.configure(yscrollcommand=on_scroll)
+
+            def on_search(*_args):
+                if state["search_job"] is not None:
+                    tree.after_cancel(state["search_job"])
+                state["search_job"] = tree.after(250, apply_search)
 
+            def apply_search():
+                state["search_job"] = None
+                load_students()
 
+            search_var.trace_add("write", on_search)
+
+            voted, registered = self.db.get_turnout()
+            summary.config(text=f"{registered:,} registered, {voted:,} voted, "
+                                f"{registered - voted:,} not voted yet")
+            load_students()
+
+        self.display_content(build, key="students")
 
     def show_manage_positions(self):
         def build(frame):
@@ -777,9 +1175,9 @@ class AdminPanel:
                       font=("Segoe UI", 11, "bold"), width=14, relief="solid",
                       command=delete_position).pack(side="left", padx=10)
 
-        self.display_content(build)
+        self.display_content(build, key="positions")
     
-    def show_manage_candidates(self):
+    def show_manage_candidates(self, prebuild=False):
         """Manage candidates: edit in a popup and delete."""
 
         def build(frame):
@@ -798,11 +1196,20 @@ class AdminPanel:
             left = tk.Frame(container, bg=THEME_WHITE)
             left.pack(side="left", fill="both", expand=True)
 
+            # Search box (filtering happens in SQL)
+            search_row = tk.Frame(left, bg=THEME_WHITE)
+            search_row.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 6))
+            tk.Label(search_row, text="Search:", bg=THEME_WHITE, fg=THEME_RED).pack(side="left")
+            search_var = tk.StringVar()
+            tk.Entry(search_row, textvariable=search_var, width=30).pack(
+                side="left", fill="x", expand=True, padx=6
+            )
+
             columns = ("ID", "Name", "Position", "Votes")
             tree = ttk.Treeview(left, columns=columns, show="headings", height=18)
 
             for col in columns:
-                tree.heading(col, text=col)
+                tree.heading(col, text=col, command=lambda c=col: sort_by(c.lower()))
 
             tree.column("ID", width=50, anchor="center")
             tree.column("Name", width=160)
@@ -810,25 +1217,38 @@ class AdminPanel:
             tree.column("Votes", width=70, anchor="center")
 
             scroll = tk.Scrollbar(left, orient="vertical", command=tree.yview)
-            tree.configure(yscrollcommand=scroll.set)
 
-            tree.grid(row=0, column=0, sticky="nsew")
-            scroll.grid(row=0, column=1, sticky="ns")
+            tree.grid(row=1, column=0, sticky="nsew")
+            scroll.grid(row=1, column=1, sticky="ns")
 
-            left.rowconfigure(0, weight=1)
+            left.rowconfigure(1, weight=1)
             left.columnconfigure(0, weight=1)
 
-            # helper: load candidates from DB into tree
+            # The tree holds the pages fetched so far, in the SQL order.
+            # keys: iid -> (sort value, id), the same keys the pages use.
+            state = {"sort": "id", "descending": False, "search": "",
+                     "after": None, "more": True, "page_job": None, "search_job": None}
+            keys = {}
+
+            def row_key(cid, name, position, votes):
+                value = {"id": cid, "name": name or "", "position": position or "",
+                         "votes": votes}[state["sort"]]
+                return (value, cid)
+
+            def comes_before(a, b):
+                return a > b if state["descending"] else a < b
+
+            def matches(name, position):
+                needle = state["search"].lower()
+                return not needle or needle in (name or "").lower() or needle in (position or "").lower()
+
+            # helper: (re)load the first page, e.g. after a sort or search change
             def load_candidates(select_id=None):
                 tree.delete(*tree.get_children())
-                try:
-                    rows = self.db.get_candidates()
-                except Exception as e:
-                    messagebox.showerror("Database Error", f"Could not load candidates:\n{e}")
-                    return
-
-                for cid, name, position, votes, photo_path, logo_path in rows:
-                    tree.insert("", "end", iid=str(cid), values=(cid, name, position, votes))
+                keys.clear()
+                state["after"] = None
+                state["more"] = True
+                load_page()
 
                 children = tree.get_children()
                 if not children:
@@ -842,6 +1262,102 @@ class AdminPanel:
 
                 tree.selection_set(iid)
                 tree.focus(iid)
+                tree.see(iid)
+
+            def load_page():
+                state["page_job"] = None
+                if not state["more"]:
+                    return
+                try:
+                    rows = self.db.get_candidates_page(
+                        state["sort"], state["descending"], state["search"] or None,
+                        state["after"], CANDIDATE_PAGE_SIZE,
+                    )
+                except Exception as e:
+                    state["more"] = False
+                    messagebox.showerror("Database Error", f"Could not load candidates:\n{e}")
+                    return
+
+                for cid, name, position, votes, sort_value in rows:
+                    iid = str(cid)
+                    if iid in keys:
+                        continue  # already placed here by an edit
+                    tree.insert("", "end", iid=iid, values=(cid, name, position, votes))
+                    keys[iid] = (sort_value, cid)
+                if rows:
+                    state["after"] = (rows[-1][4], rows[-1][0])
+                state["more"] = len(rows) == CANDIDATE_PAGE_SIZE
+
+            def on_scroll(first, last):
+                scroll.set(first, last)
+                # Fetch the next page as the end of what is loaded comes into view
+                if state["more"] and float(last) > 0.9 and state["page_job"] is None:
+                    state["page_job"] = tree.after_idle(load_page)
+
+            tree.configure(yscrollcommand=on_scroll)
+
+            def sort_by(column):
+                if state["sort"] == column:
+                    state["descending"] = not state["descending"]
+                else:
+                    state["sort"] = column
+                    state["descending"] = column == "votes"
+                arrow = " ▼" if state["descending"] else " ▲"
+                for col in columns:
+                    tree.heading(col, text=col + (arrow if col.lower() == column else ""))
+                load_candidates(select_id=get_selected_id())
+
+            def on_search(*_args):
+                if state["search_job"] is not None:
+                    tree.after_cancel(state["search_job"])
+                state["search_job"] = tree.after(250, apply_search)
+
+            def apply_search():
+                state["search_job"] = None
+                state["search"] = search_var.get().strip()
+                load_candidates()
+
+            search_var.trace_add("write", on_search)
+
+            # helper: bring one candidate's row up to date after an edit
+            def refresh_row(cid):
+                iid = str(cid)
+                row = self.db.get_candidate_by_id(cid)
+                if row is None or not matches(row[1], row[2]):
+                    remove_row(iid)
+                    return
+                cid, name, position, votes = row[:4]
+                key = row_key(cid, name, position, votes)
+
+                # Past the last loaded row it belongs to a page not fetched yet
+                if state["more"] and state["after"] is not None and not comes_before(key, state["after"]):
+                    remove_row(iid)
+                    return
+
+                others = [child for child in tree.get_children() if child != iid]
+                index = next(
+                    (i for i, child in enumerate(others) if comes_before(key, keys[child])),
+                    len(others),
+                )
+                if iid in keys:
+                    tree.item(iid, values=(cid, name, position, votes))
+                    tree.move(iid, "", index)
+                else:
+                    tree.insert("", index, iid=iid, values=(cid, name, position, votes))
+                keys[iid] = key
+                tree.selection_set(iid)
+                tree.focus(iid)
+                tree.see(iid)
+
+            def remove_row(iid):
+                if iid not in keys:
+                    return
+                neighbour = tree.next(iid) or tree.prev(iid)
+                tree.delete(iid)
+                del keys[iid]
+                if neighbour:
+                    tree.selection_set(neighbour)
+                    tree.focus(neighbour)
 
             load_candidates()
 
@@ -1010,8 +1526,8 @@ class AdminPanel:
                         self.db.update_candidate(cid, new_name, new_pos, new_photo, new_logo)
                         messagebox.showinfo("Success", "Candidate updated successfully.")
                         win.destroy()
-                        # reload main list and reselect this candidate
-                        load_candidates(select_id=cid)
+                        # update just this row, keeping it selected
+                        refresh_row(cid)
                     except Exception as e:
                         messagebox.showerror("Database Error", str(e))
 
@@ -1056,7 +1572,7 @@ class AdminPanel:
                 try:
                     self.db.delete_candidate(cid)
                     messagebox.showinfo("Deleted", "Candidate deleted successfully.")
-                    load_candidates()
+                    remove_row(str(cid))
                 except Exception as e:
                     messagebox.showerror("Database Error", str(e))
 
@@ -1085,7 +1601,7 @@ class AdminPanel:
                 command=delete_selected,
             ).pack(anchor="w")
 
-        self.display_content(build)
+        self._show_screen("manage_candidates", build, prebuild)
 
     def show_stats_dashboard(self):
         """Visual dashboard: leaders per position + pie chart + bar graph of current poll status."""
@@ -1094,6 +1610,25 @@ class AdminPanel:
             header = tk.Frame(frame, bg=THEME_WHITE)
             header.pack(fill="x", pady=(5, 5))
 
+            # ---------- TURNOUT TILE ----------
+            turnout_tile = tk.Frame(header, bg=THEME_WHITE, highlightthickness=1,
+                                    highlightbackground=THEME_RED)
+            turnout_tile.pack(side="right", padx=10)
+            turnout_percent = tk.Label(
+                turnout_tile,
+                font=("Segoe UI", 18, "bold"),
+                bg=THEME_WHITE,
+                fg=THEME_RED,
+            )
+            turnout_percent.pack(padx=14, pady=(4, 0))
+            turnout_detail = tk.Label(
+                turnout_tile,
+                font=("Segoe UI", 9),
+                bg=THEME_WHITE,
+                fg="#555555",
+            )
+            turnout_detail.pack(padx=14, pady=(0, 4))
+
             tk.Label(
                 header,
                 text="Poll Analytics Dashboard",
@@ -1110,49 +1645,22 @@ class AdminPanel:
                 fg="#555555",
             ).pack(anchor="w", padx=10, pady=(0, 4))
 
-            # ---------- LOAD DATA ----------
-            # rows: (position, name, votes)
-            rows = self.db.get_poll_status()
-
-            if not rows:
-                tk.Label(
-                    frame,
-                    text="No poll data available yet.",
-                    font=("Segoe UI", 11, "italic"),
-                    bg=THEME_WHITE,
-                    fg="gray",
-                ).pack(pady=40)
-                return
-
-            candidates = [(pos, name, votes) for (pos, name, votes) in rows]
-            total_votes = sum(v for _, _, v in candidates)
+            self._live_toggle(header)
 
-            if total_votes == 0:
-                tk.Label(
-                    frame,
-                    text="No votes have been cast yet.\nCharts will appear once voting starts.",
-                    font=("Segoe UI", 11),
-                    bg=THEME_WHITE,
-                    fg="gray",
-                    justify="center",
-                ).pack(pady=40)
-                return
+            # Shown instead of the charts while there is nothing to plot
+            message = tk.Label(
+                frame,
+                font=("Segoe UI", 11),
+                bg=THEME_WHITE,
+                fg="gray",
+                justify="center",
+            )
 
-            # sort by votes desc and limit to top 8 for charts
-            candidates_sorted = sorted(candidates, key=lambda r: r[2], reverse=True)
-            top_candidates = candidates_sorted[:8]
+            # Everything below is built once and updated in place by render()
+            body = tk.Frame(frame, bg=THEME_WHITE)
 
             # ---------- LEADERS PER POSITION ----------
-            # NOTE: your SQL already orders by position, votes DESC
-            # so the first row for each position is the leader.
-            leaders = {}
-            for pos, name, votes in rows:
-                if pos not in leaders:      # first one we see for that pos is the leader
-                    leaders[pos] = (name, votes)
-
-            leader_items = sorted(leaders.items(), key=lambda kv: kv[0])  # sort by position name
-
-            leaders_frame = tk.Frame(frame, bg=THEME_WHITE)
+            leaders_frame = tk.Frame(body, bg=THEME_WHITE)
             leaders_frame.pack(fill="x", padx=10, pady=(6, 4))
 
             tk.Label(
@@ -1167,7 +1675,7 @@ class AdminPanel:
                 leaders_frame,
                 columns=("Position", "Leader", "Votes"),
                 show="headings",
-                height=min(len(leader_items), 7),
+                height=1,
             )
             tree.heading("Position", text="Position")
             tree.heading("Leader", text="Leading Candidate")
@@ -1179,11 +1687,8 @@ class AdminPanel:
 
             tree.pack(fill="x", expand=False)
 
-            for pos, (name, votes) in leader_items:
-                tree.insert("", "end", values=(pos, name, votes))
-
             # ---------- MAIN CHARTS CONTAINER ----------
-            charts_container = tk.Frame(frame, bg=THEME_WHITE)
+            charts_container = tk.Frame(body, bg=THEME_WHITE)
             charts_container.pack(fill="both", expand=True, padx=10, pady=10)
 
             # Left: Pie chart
@@ -1216,45 +1721,39 @@ class AdminPanel:
                 "#e53935", "#8e24aa", "#3949ab", "#00897b",
                 "#fbc02d", "#fb8c00", "#6d4c41", "#5e35b1",
             ]
+            top_n = len(slice_colors)
 
             x0, y0, x1, y1 = 30, 20, 290, 240
-            start_angle = 0
-
-            for idx, (_, name, votes) in enumerate(top_candidates):
-                if votes <= 0:
-                    continue
-                extent = (votes / total_votes) * 360
-                color = slice_colors[idx % len(slice_colors)]
+            slices = [
                 pie_canvas.create_arc(
                     x0, y0, x1, y1,
-                    start=start_angle,
-                    extent=extent,
+                    start=0,
+                    extent=0,
                     fill=color,
                     outline=THEME_WHITE,
+                    state="hidden",
                 )
-                start_angle += extent
+                for color in slice_colors
+            ]
 
             # Legend under pie
             legend_frame = tk.Frame(pie_frame, bg=THEME_WHITE)
             legend_frame.pack(pady=(6, 0), anchor="w", padx=4)
 
-            for idx, (pos, name, votes) in enumerate(top_candidates):
-                color = slice_colors[idx % len(slice_colors)]
+            legend_rows = []
+            for color in slice_colors:
                 row = tk.Frame(legend_frame, bg=THEME_WHITE)
-                row.pack(anchor="w", pady=1)
-
                 tk.Canvas(
                     row, width=12, height=12, bg=color, highlightthickness=0
                 ).pack(side="left", padx=(0, 4))
-
-                percent = (votes / total_votes) * 100 if total_votes > 0 else 0
-                tk.Label(
+                row.text = tk.Label(
                     row,
-                    text=f"{name} ({pos}) – {votes} votes ({percent:.1f}%)",
                     bg=THEME_WHITE,
                     fg="#333333",
                     font=("Segoe UI", 8),
-                ).pack(side="left")
+                )
+                row.text.pack(side="left")
+                legend_rows.append(row)
 
             # ---------------- BAR CHART ----------------
             tk.Label(
@@ -1277,13 +1776,6 @@ class AdminPanel:
             )
             bar_canvas.pack(pady=4, fill="both", expand=True)
 
-            max_votes = max(v for _, _, v in top_candidates) or 1
-
-            # dynamic left margin based on longest candidate name
-            max_name_len = max(len(name) for _, name, _ in top_candidates)
-            label_col_width = min(180, 7 * max_name_len)  # ~7px per char, capped
-
-            chart_left = 20 + label_col_width
             chart_right = bar_canvas_width - 20
             chart_top = 20
             chart_bottom = bar_canvas_height - 30
@@ -1291,107 +1783,231 @@ class AdminPanel:
             bar_height = 18
             bar_gap = 8
 
-            # Axis lines
-            bar_canvas.create_line(
-                chart_left, chart_top,
-                chart_left, chart_bottom,
-                fill="#cccccc"
-            )
-            bar_canvas.create_line(
-                chart_left, chart_bottom,
-                chart_right, chart_bottom,
-                fill="#cccccc"
-            )
+            # Axis lines (moved horizontally by render() as the name column changes)
+            y_axis = bar_canvas.create_line(0, chart_top, 0, chart_bottom, fill="#cccccc")
+            x_axis = bar_canvas.create_line(0, chart_bottom, chart_right, chart_bottom, fill="#cccccc")
 
-            # Optional x-axis ticks (0.5 and 1.0 of max_votes)
+            # x-axis ticks at 0.5 and 1.0 of max_votes
+            ticks = []
             for frac in (0.5, 1.0):
-                x = chart_left + frac * (chart_right - chart_left)
-                bar_canvas.create_line(
-                    x, chart_bottom,
-                    x, chart_bottom + 4,
-                    fill="#aaaaaa"
-                )
-                bar_canvas.create_text(
-                    x,
-                    chart_bottom + 12,
-                    text=str(int(frac * max_votes)),
-                    font=("Segoe UI", 7),
-                    fill="#777777",
-                )
-
-            # Bars + labels
-            for idx, (pos, name, votes) in enumerate(top_candidates):
-                y = chart_top + idx * (bar_height + bar_gap)
-                if y + bar_height > chart_bottom:
-                    break
-
-                bar_length = (votes / max_votes) * (chart_right - chart_left - 10)
-                color = slice_colors[idx % len(slice_colors)]
-
-                # Bar
-                bar_canvas.create_rectangle(
-                    chart_left,
-                    y,
-                    chart_left + bar_length,
-                    y + bar_height,
-                    fill=color,
-                    outline="",
-                )
-
-                # Candidate label – clear left column, fully visible
-                bar_canvas.create_text(
-                    chart_left - 10,
-                    y + bar_height / 2,
-                    text=name,
-                    anchor="e",
-                    font=("Segoe UI", 9),
-                    fill="#333333",
-                )
-
-                # Vote count at end of bar
-                bar_canvas.create_text(
-                    chart_left + bar_length + 4,
-                    y + bar_height / 2,
-                    text=str(votes),
-                    anchor="w",
-                    font=("Segoe UI", 8, "bold"),
-                    fill="#555555",
+                mark = bar_canvas.create_line(0, chart_bottom, 0, chart_bottom + 4, fill="#aaaaaa")
+                label = bar_canvas.create_text(
+                    0, chart_bottom + 12, font=("Segoe UI", 7), fill="#777777"
                 )
+                ticks.append((frac, mark, label))
+
+            # One bar, name and count per slot
+            bars = []
+            for color in slice_colors:
+                bars.append((
+                    bar_canvas.create_rectangle(0, 0, 0, 0, fill=color, outline="", state="hidden"),
+                    bar_canvas.create_text(
+                        0, 0, anchor="e", font=("Segoe UI", 9), fill="#333333", state="hidden"
+                    ),
+                    bar_canvas.create_text(
+                        0, 0, anchor="w", font=("Segoe UI", 8, "bold"), fill="#555555", state="hidden"
+                    ),
+                ))
 
             # ---------- FOOTER SUMMARY ----------
-            tk.Label(
-                frame,
-                text=f"Total votes counted: {total_votes}",
+            total_label = tk.Label(
+                body,
                 bg=THEME_WHITE,
                 fg="#555555",
                 font=("Segoe UI", 9, "italic"),
-            ).pack(pady=(4, 2))
+            )
+            total_label.pack(pady=(4, 2))
 
             # overall (all positions combined) leader
-            leader_pos, leader_name, leader_votes = top_candidates[0]
-            tk.Label(
-                frame,
-                text=f"Overall leader (all positions): {leader_name} ({leader_pos}) with {leader_votes} votes.",
+            overall_label = tk.Label(
+                body,
                 bg=THEME_WHITE,
                 fg=THEME_RED,
                 font=("Segoe UI", 9, "bold"),
-            ).pack(pady=(0, 8))
+            )
+            overall_label.pack(pady=(0, 8))
+
+            def show_message(text):
+                if body.winfo_manager():
+                    body.pack_forget()
+                message.config(text=text)
+                if not message.winfo_manager():
+                    message.pack(pady=40)
+
+            def render():
+                voted, registered = self.db.get_turnout()
+                percent = 100.0 * voted / registered if registered else 0.0
+                turnout_percent.config(text=f"{percent:.1f}%")
+                turnout_detail.config(text=f"Turnout: {voted:,} of {registered:,} students")
+
+                # rows: (candidate_id, position, name, votes)
+                rows = self.db.get_tallies()
+
+                if not rows:
+                    show_message("No poll data available yet.")
+                    return
 
-        self.display_content(build)
+                total_votes = sum(r[3] for r in rows)
+                if total_votes == 0:
+                    show_message("No votes have been cast yet.\nCharts will appear once voting starts.")
+                    return
+
+                if message.winfo_manager():
+                    message.pack_forget()
+                if not body.winfo_manager():
+                    body.pack(fill="both", expand=True)
+
+                # sort by votes desc and limit to top 8 for charts
+                top_candidates = sorted(rows, key=lambda r: r[3], reverse=True)[:top_n]
+
+                # The query orders by position, votes DESC, so the first row
+                # for each position is its leader.
+                leaders = {}
+                for _, pos, name, votes in rows:
+                    if pos not in leaders:
+                        leaders[pos] = (name, votes)
+                leader_items = sorted(leaders.items(), key=lambda kv: kv[0])
+                self._sync_tree(tree, [(pos, (pos, name, votes)) for pos, (name, votes) in leader_items])
+                tree.configure(height=min(len(leader_items), 7))
+
+                # Pie slices and legend
+                start_angle = 0
+                for idx, row in enumerate(legend_rows):
+                    if idx >= len(top_candidates):
+                        pie_canvas.itemconfigure(slices[idx], state="hidden")
+                        row.pack_forget()
+                        continue
+                    _, pos, name, votes = top_candidates[idx]
+                    extent = (votes / total_votes) * 360
+                    if votes > 0:
+                        # A single 360 degree arc draws nothing in Tk
+                        pie_canvas.itemconfigure(
+                            slices[idx], start=start_angle, extent=min(extent, 359.99), state="normal"
+                        )
+                    else:
+                        pie_canvas.itemconfigure(slices[idx], state="hidden")
+                    start_angle += extent
+
+                    percent = (votes / total_votes) * 100
+                    row.text.config(text=f"{name} ({pos}) – {votes} votes ({percent:.1f}%)")
+                    if not row.winfo_manager():
+                        row.pack(anchor="w", pady=1)
+
+                # Bars, scaled to the current leader
+                max_votes = max(r[3] for r in top_candidates) or 1
+
+                # dynamic left margin based on longest candidate name
+                max_name_len = max(len(r[2]) for r in top_candidates)
+                label_col_width = min(180, 7 * max_name_len)  # ~7px per char, capped
+                chart_left = 20 + label_col_width
+
+                bar_canvas.coords(y_axis, chart_left, chart_top, chart_left, chart_bottom)
+                bar_canvas.coords(x_axis, chart_left, chart_bottom, chart_right, chart_bottom)
+                for frac, mark, label in ticks:
+                    x = chart_left + frac * (chart_right - chart_left)
+                    bar_canvas.coords(mark, x, chart_bottom, x, chart_bottom + 4)
+                    bar_canvas.coords(label, x, chart_bottom + 12)
+                    bar_canvas.itemconfigure(label, text=str(int(frac * max_votes)))
+
+                for idx, (rect, name_text, count_text) in enumerate(bars):
+                    y = chart_top + idx * (bar_height + bar_gap)
+                    if idx >= len(top_candidates) or y + bar_height > chart_bottom:
+                        for item in (rect, name_text, count_text):
+                            bar_canvas.itemconfigure(item, state="hidden")
+                        continue
+                    _, pos, name, votes = top_candidates[idx]
+                    bar_length = (votes / max_votes) * (chart_right - chart_left - 10)
+                    mid = y + bar_height / 2
+                    bar_canvas.coords(rect, chart_left, y, chart_left + bar_length, y + bar_height)
+                    bar_canvas.coords(name_text, chart_left - 10, mid)
+                    bar_canvas.coords(count_text, chart_left + bar_length + 4, mid)
+                    bar_canvas.itemconfigure(name_text, text=name)
+                    bar_canvas.itemconfigure(count_text, text=str(votes))
+                    for item in (rect, name_text, count_text):
+                        bar_canvas.itemconfigure(item, state="normal")
+
+                total_label.config(text=f"Total votes counted: {total_votes}")
+                _, leader_pos, leader_name, leader_votes = top_candidates[0]
+                overall_label.config(
+                    text=f"Overall leader (all positions): {leader_name} ({leader_pos}) with {leader_votes} votes."
+                )
+
+            return lambda: self._watch_results(render)
+
+        self.display_content(build, key="dashboard", live=True)
+
+    def _show_screen(self, key, build, prebuild, live=False):
+        if prebuild:
+            self._build_screen(key, build, live)
+        else:
+            self.display_content(build, key=key, live=live)
+
+    # ---------- Live results ----------
+    def _live_toggle(self, parent):
+        tk.Checkbutton(
+            parent,
+            text="Live updates",
+            variable=self.live_updates,
+            bg=THEME_WHITE,
+            activebackground=THEME_WHITE,
+            font=("Segoe UI", 9),
+        ).pack(anchor="e", padx=10)
+
+    def _watch_results(self, refresh):
+        """Run refresh() now if the vote data changed since the screen last
+        showed it, then again whenever it changes.
+
+        The check is one PRAGMA every few seconds, so leaving a results
+        screen open on election night costs next to nothing. The version
+        is kept on the cached screen, so coming back to it is free when
+        nothing happened in between.
+        """
+        state = self._screens.get(self._current) or AdminScreen(None, None)
+        first = [True]
+
+        def check(_now):
+            if not first[0] and not self.live_updates.get():
+                return True
+            first[0] = False
+            version = self.db.get_results_version()
+            if version != state.version:
+                state.version = version
+                refresh()
+            return True
+
+        self._live_clock.subscribe(check)
+
+    def _sync_tree(self, tree, rows):
+        """Make `tree` show rows [(iid, values), ...] in order, touching only what changed."""
+        shown = getattr(tree, "row_values", None)
+        if shown is None:
+            shown = tree.row_values = {}
+        wanted = {iid for iid, _ in rows}
+        for iid in [iid for iid in shown if iid not in wanted]:
+            tree.delete(iid)
+            del shown[iid]
+        for index, (iid, values) in enumerate(rows):
+            if iid not in shown:
+                tree.insert("", index, iid=iid, values=values)
+            else:
+                if shown[iid] != values:
+                    tree.item(iid, values=values)
+                if tree.index(iid) != index:
+                    tree.move(iid, "", index)
+            shown[iid] = values
 
 
 
     def _reset_votes(self):
         if messagebox.askyesno("Confirm", "Are you sure you want to reset all votes?"):
             self.db.reset_votes()
+            # Ballots from old rounds are kept as history; trim the oldest
+            # ones without holding up the screen.
+            self.db.prune_history_in_background()
             messagebox.showinfo("Success", "All votes have been reset.")
             self.show_poll_status()
 
     def _go_back(self):
-        try:
-            self.win.destroy()
-        except Exception:
-            pass
-        from main import MainWindow
-        app = MainWindow()
-        app.run()
+        # A view switch: the router calls leave(), and nothing is rebuilt
+        if self.on_logout is not None:
+            self.on_logout()
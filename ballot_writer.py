@@ -0,0 +1,107 @@
+# ballot_writer.py
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class BallotWriter:
+    """Group-commit ballots from many callers on one writer thread.
+
+    Ballots queued within max_delay seconds of each other (up to max_batch
+    of them) are written in a single transaction, so a burst of voters pays
+    for one commit instead of one each. Every ballot gets its own SAVEPOINT:
+    a rejected ballot is rolled back alone and the rest of the batch still
+    commits. Callers' futures resolve only after the commit, and the
+    writer's connection runs with synchronous=FULL (the shared profiles use
+    NORMAL, which under WAL can lose the last commits on power loss), so a
+    ballot is never reported as recorded before it is durable. Batching is
+    what pays for the extra fsync per commit.
+    """
+
+    def __init__(self, db, max_batch=32, max_delay=0.005):
+        self.db = db
+        self.max_batch = max(int(max_batch), 1)
+        self.max_delay = max(float(max_delay), 0.0)
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="uvs-ballot-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, regno, selections):
+        """Queue a ballot; the returned Future raises BallotError if it is rejected."""
+        if self._closed:
+            raise RuntimeError("The ballot writer has been closed.")
+        future = Future()
+        self._queue.put((regno, dict(selections), future))
+        return future
+
+    def close(self, timeout=None):
+        """Write whatever is queued, then stop the thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join(timeout)
+
+    # ---------- writer thread ----------
+    def _run(self):
+        try:
+            # Per connection: only this thread's commits pay for the fsync
+            self.db.conn.execute("PRAGMA synchronous=FULL")
+            stop = False
+            while not stop:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                deadline = time.monotonic() + self.max_delay
+                while len(batch) < self.max_batch:
+                    try:
+                        item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+                self._write(batch)
+        finally:
+            self.db.close()
+
+    def _write(self, batch):
+        conn = self.db.conn
+        cur = conn.cursor()
+        outcomes = []
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            for regno, selections, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                cur.execute("SAVEPOINT ballot")
+                try:
+                    self.db.check_ballot(cur, selections)
+                    self.db.write_ballot(cur, regno, selections)
+                except Exception as exc:
+                    cur.execute("ROLLBACK TO ballot")
+                    outcomes.append((regno, future, exc))
+                else:
+                    outcomes.append((regno, future, None))
+                cur.execute("RELEASE ballot")
+            conn.commit()
+        except Exception as exc:
+            if conn.in_transaction:
+                conn.rollback()
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self.db.manager.note_write()
+        self.db.note_voted(*(regno for regno, _, exc in outcomes if exc is None))
+        for _, future, exc in outcomes:
+            if exc is None:
+                future.set_result(None)
+            else:
+                future.set_exception(exc)
@@ -0,0 +1,92 @@
+# benchmarks/ballot_throughput.py
+"""Compare one commit per ballot with the group-commit ballot writer.
+
+Run from the project root:
+
+    python -m benchmarks.ballot_throughput --voters 10000 --positions 5
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from database import DatabaseManager
+
+
+def seed(db, voters, positions, candidates_per_position):
+    """Fill a fresh database with students, positions and candidates."""
+    cur = db.conn.cursor()
+    cur.executemany(
+        "INSERT INTO students (name, username, regno, password) VALUES (?, ?, ?, ?)",
+        [(f"Student {i}", f"user{i}", f"REG{i:06d}", "pass") for i in range(voters)],
+    )
+    ballot = {}
+    for p in range(positions):
+        position = f"Position {p}"
+        db.add_position(position)
+        ids = []
+        for c in range(candidates_per_position):
+            cur.execute(
+                "INSERT INTO candidates (name, position) VALUES (?, ?)",
+                (f"Candidate {p}-{c}", position),
+            )
+            ids.append(cur.lastrowid)
+        ballot[position] = ids
+    db.conn.commit()
+    return ballot
+
+
+def run_cast_ballot(db, regnos, ballot):
+    for regno in regnos:
+        db.cast_ballot(
+            regno, {position: random.choice(ids) for position, ids in ballot.items()}
+        )
+
+
+def run_group_commit(db, regnos, ballot):
+    futures = [
+        db.submit_ballot(
+            regno, {position: random.choice(ids) for position, ids in ballot.items()}
+        )
+        for regno in regnos
+    ]
+    for future in futures:
+        future.result()
+
+
+def measure(name, runner, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"))
+        ballot = seed(db, args.voters, args.positions, args.candidates)
+        regnos = [f"REG{i:06d}" for i in range(args.voters)]
+
+        started = time.perf_counter()
+        runner(db, regnos, ballot)
+        elapsed = time.perf_counter() - started
+        db.close_all()
+
+    rate = args.voters / elapsed if elapsed else float("inf")
+    print(f"{name:<16} {elapsed:8.2f}s  {rate:10.1f} ballots/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--voters", type=int, default=10000)
+    parser.add_argument("--positions", type=int, default=5)
+    parser.add_argument("--candidates", type=int, default=4,
+                        help="candidates per position")
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    print(f"{args.voters} voters, {args.positions} positions, "
+          f"{args.candidates} candidates per position")
+    old = measure("cast_ballot", run_cast_ballot, args)
+    new = measure("group_commit", run_group_commit, args)
+    print(f"speed-up: {new / old:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# benchmarks/double_vote_stress.py
+"""Check that every student's ballot counts exactly once under contention.
+
+Many processes and threads all try to vote for the same students at the
+same moment, through both cast_ballot and the group-commit writer. Ballots
+carry no voter link, so at the end every student must be marked as voted,
+every position must hold exactly one vote per student, no ballot row may
+name its voter, and every other attempt must have been turned away with
+AlreadyVotedError.
+Exits non-zero if not.
+
+Run from the project root:
+
+    python -m benchmarks.double_vote_stress --students 200 --processes 4 --threads 8
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+
+from benchmarks.ballot_throughput import seed
+from database import AlreadyVotedError, DatabaseManager
+
+
+def _worker(job):
+    """Process entry point: every thread tries every student, in its own order."""
+    random.seed(job["seed"])
+    counts = {"accepted": 0, "already_voted": 0, "errors": []}
+    lock = threading.Lock()
+    start = threading.Barrier(job["threads"])
+
+    def terminal(index):
+        db = DatabaseManager(job["db_path"], profile="server")
+        regnos = list(job["regnos"])
+        random.Random(job["seed"] * 1000 + index).shuffle(regnos)
+        use_writer = index % 2 == 1
+        accepted = already = 0
+        errors = []
+        start.wait()
+        for regno in regnos:
+            selections = {p: ids[0] for p, ids in job["ballot"].items()}
+            try:
+                if use_writer:
+                    db.submit_ballot(regno, selections).result()
+                else:
+                    db.cast_ballot(regno, selections)
+                accepted += 1
+            except AlreadyVotedError:
+                already += 1
+            except Exception as exc:
+                errors.append(f"{regno}: {exc!r}")
+        db.close()
+        with lock:
+            counts["accepted"] += accepted
+            counts["already_voted"] += already
+            counts["errors"].extend(errors)
+
+    threads = [threading.Thread(target=terminal, args=(i,)) for i in range(job["threads"])]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return counts
+
+
+def run(args, db_path):
+    db = DatabaseManager(db_path, profile="server")
+    ballot = seed(db, args.students, args.positions, args.candidates)
+    regnos = [f"REG{i:06d}" for i in range(args.students)]
+
+    jobs = [
+        {"db_path": db_path, "regnos": regnos, "ballot": ballot,
+         "threads": args.threads, "seed": args.seed + p}
+        for p in range(args.processes)
+    ]
+    with multiprocessing.Pool(args.processes) as pool:
+        results = pool.map(_worker, jobs)
+
+    accepted = sum(r["accepted"] for r in results)
+    already = sum(r["already_voted"] for r in results)
+    errors = [e for r in results for e in r["errors"]]
+
+    cur = db.conn.cursor()
+    per_position = cur.execute(
+        "SELECT position, COUNT(*) FROM ballots GROUP BY position"
+    ).fetchall()
+    wrong = [
+        position for position, count in per_position if count != args.students
+    ]
+    linked = cur.execute(
+        "SELECT COUNT(*) FROM ballots WHERE regno_hash IS NOT NULL"
+    ).fetchone()[0]
+    total_votes = sum(db.get_vote_counts().values())
+    not_marked = sum(1 for regno in regnos if not db.student_has_voted(regno))
+    db.close()
+
+    attempts = args.students * args.processes * args.threads
+    report = {
+        "attempts": attempts,
+        "accepted": accepted,
+        "already_voted": already,
+        "errors": errors[:20],
+        "positions_without_one_vote_per_student": wrong[:20],
+        "ballots_linked_to_voters": linked,
+        "tally_total": total_votes,
+        "students_not_marked": not_marked,
+    }
+    report["ok"] = (
+        accepted == args.students
+        and accepted + already == attempts
+        and not errors
+        and not wrong
+        and len(per_position) == args.positions
+        and linked == 0
+        and total_votes == args.students * args.positions
+        and not_marked == 0
+    )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--positions", type=int, default=3)
+    parser.add_argument("--candidates", type=int, default=2,
+                        help="candidates per position")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8,
+                        help="terminals (threads) per process")
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = run(args, os.path.join(tmp, "stress.db"))
+    print(json.dumps(report, indent=2))
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
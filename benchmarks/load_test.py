@@ -0,0 +1,241 @@
+# benchmarks/load_test.py
+"""Simulate many voting terminals hitting one database at the same time.
+
+Seeds a fresh database, then splits the students across worker processes,
+each running several threads. Every simulated voter logs in, checks that
+they have not voted yet, submits a ballot and, every few voters, loads the
+poll status the way an admin screen would. Prints a JSON report with
+latency percentiles per operation, ballots per second and lock waits.
+
+Run from the project root:
+
+    python -m benchmarks.load_test --students 5000 --processes 4 --threads 8
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from benchmarks.ballot_throughput import seed
+from database import BallotError, DatabaseManager
+
+
+OPERATIONS = ("verify_student", "student_has_voted", "submit_ballot", "get_poll_status")
+
+
+def _is_lock_error(exc):
+    message = str(exc).lower()
+    return "locked" in message or "busy" in message
+
+
+def _timed(stats, name, func, *args):
+    """Run func(*args), recording its latency; retry if SQLite gives up on a lock."""
+    while True:
+        started = time.perf_counter()
+        try:
+            result = func(*args)
+        except sqlite3.OperationalError as exc:
+            if not _is_lock_error(exc):
+                raise
+            stats["lock_errors"] += 1
+            continue
+        elapsed = time.perf_counter() - started
+        stats["latency"][name].append(elapsed)
+        if elapsed * 1000 >= stats["lock_wait_ms"]:
+            stats["lock_waits"] += 1
+        return result
+
+
+def _vote(db, stats, student, ballot, mode, poll_every, index):
+    username, regno = student
+    _timed(stats, "verify_student", db.verify_student, username, "pass")
+    if _timed(stats, "student_has_voted", db.student_has_voted, regno):
+        stats["rejected"] += 1
+        return
+
+    selections = {position: random.choice(ids) for position, ids in ballot.items()}
+    submit = db.cast_ballot if mode == "cast_ballot" else (
+        lambda *args: db.submit_ballot(*args).result()
+    )
+    try:
+        _timed(stats, "submit_ballot", submit, regno, selections)
+    except BallotError:
+        stats["rejected"] += 1
+        return
+    stats["ballots"] += 1
+
+    if poll_every and index % poll_every == 0:
+        _timed(stats, "get_poll_status", db.get_poll_status)
+
+
+def _new_stats(lock_wait_ms):
+    return {
+        "latency": {name: [] for name in OPERATIONS},
+        "ballots": 0,
+        "rejected": 0,
+        "lock_errors": 0,
+        "lock_waits": 0,
+        "lock_wait_ms": lock_wait_ms,
+    }
+
+
+def _worker(job):
+    """Process entry point: run job["threads"] terminals over job["students"]."""
+    import threading
+
+    random.seed(job["seed"])
+    students = job["students"]
+    results = []
+    lock = threading.Lock()
+
+    def terminal(chunk):
+        db = DatabaseManager(job["db_path"], profile=job["profile"])
+        stats = _new_stats(job["lock_wait_ms"])
+        for index, student in enumerate(chunk):
+            _vote(db, stats, student, job["ballot"], job["mode"], job["poll_every"], index)
+        db.close()
+        with lock:
+            results.append(stats)
+
+    threads = [
+        threading.Thread(target=terminal, args=(students[i::job["threads"]],))
+        for i in range(job["threads"])
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(all_stats, elapsed, args):
+    latency = {name: [] for name in OPERATIONS}
+    totals = {"ballots": 0, "rejected": 0, "lock_errors": 0, "lock_waits": 0}
+    for stats in all_stats:
+        for name in OPERATIONS:
+            latency[name].extend(stats["latency"][name])
+        for key in totals:
+            totals[key] += stats[key]
+
+    operations = {}
+    for name, values in latency.items():
+        values.sort()
+        operations[name] = {
+            "count": len(values),
+            "p50_ms": _ms(_percentile(values, 50)),
+            "p95_ms": _ms(_percentile(values, 95)),
+            "p99_ms": _ms(_percentile(values, 99)),
+            "max_ms": _ms(values[-1] if values else None),
+        }
+
+    return {
+        "config": {
+            "students": args.students,
+            "positions": args.positions,
+            "candidates_per_position": args.candidates,
+            "processes": args.processes,
+            "threads_per_process": args.threads,
+            "mode": args.mode,
+            "profile": args.profile,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "ballots": totals["ballots"],
+        "ballots_per_s": round(totals["ballots"] / elapsed, 1) if elapsed else None,
+        "rejected": totals["rejected"],
+        "lock_errors": totals["lock_errors"],
+        "lock_waits": totals["lock_waits"],
+        "lock_wait_threshold_ms": args.lock_wait_ms,
+        "operations": operations,
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def run(args, db_path):
+    db = DatabaseManager(db_path, profile=args.profile)
+    ballot = seed(db, args.students, args.positions, args.candidates)
+    db.close()
+
+    students = [(f"user{i}", f"REG{i:06d}") for i in range(args.students)]
+    jobs = [
+        {
+            "db_path": db_path,
+            "profile": args.profile,
+            "students": students[p::args.processes],
+            "threads": args.threads,
+            "ballot": ballot,
+            "mode": args.mode,
+            "poll_every": args.poll_every,
+            "lock_wait_ms": args.lock_wait_ms,
+            "seed": args.seed + p,
+        }
+        for p in range(args.processes)
+    ]
+
+    started = time.perf_counter()
+    if args.processes == 1:
+        results = [_worker(jobs[0])]
+    else:
+        with multiprocessing.Pool(args.processes) as pool:
+            results = pool.map(_worker, jobs)
+    elapsed = time.perf_counter() - started
+
+    return summarize([s for per_process in results for s in per_process], elapsed, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--positions", type=int, default=5)
+    parser.add_argument("--candidates", type=int, default=4,
+                        help="candidates per position")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8,
+                        help="terminals (threads) per process")
+    parser.add_argument("--mode", choices=("cast_ballot", "group_commit"),
+                        default="cast_ballot",
+                        help="whole ballots committed one by one, or through "
+                             "the group-commit writer")
+    parser.add_argument("--poll-every", type=int, default=10,
+                        help="load poll status after every N voters per terminal (0 = never)")
+    parser.add_argument("--lock-wait-ms", type=float, default=50.0,
+                        help="calls slower than this are counted as lock waits")
+    parser.add_argument("--profile", default="server",
+                        help="connection profile from connection.PERFORMANCE_PROFILES")
+    parser.add_argument("--db", help="database file to create (default: a temporary file)")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args()
+
+    if args.db:
+        if os.path.exists(args.db):
+            parser.error(f"{args.db} already exists; the load test needs a fresh database")
+        report = run(args, args.db)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run(args, os.path.join(tmp, "load.db"))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 0 if report["ballots"] + report["rejected"] == args.students else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
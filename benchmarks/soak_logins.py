@@ -0,0 +1,152 @@
+# benchmarks/soak_logins.py
+"""Cycle the real Tk app through many logins and check nothing piles up.
+
+Drives MainWindow the way a kiosk is used all day: a student logs in, the
+vote screen is built, their ballot is recorded, the results screen is
+shown and they log out; every tenth login is an admin instead. After a
+warm-up, the process RSS, the number of live Tk widgets and the number
+of Tk interpreters are sampled, and the run fails if any of them keeps
+growing. Needs a display (on a headless box use xvfb-run).
+
+Run from the project root:
+
+    python -m benchmarks.soak_logins --logins 1000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tkinter as tk
+from datetime import datetime, timedelta
+
+# Keep the soak's journeys out of the terminal's trace log
+os.environ.setdefault("UVS_TRACE", "0")
+
+from benchmarks.ballot_throughput import seed  # noqa: E402
+from database import DatabaseManager  # noqa: E402
+from main import MainWindow  # noqa: E402
+
+ADMIN = ("soak-admin", "soak-pass-1")
+
+
+def rss_bytes():
+    """Current resident set size (Linux), or peak RSS elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def prepare(students):
+    db = DatabaseManager()
+    ballot = seed(db, students, 3, 3)
+    db.register_admin(*ADMIN)
+    now = datetime.now()
+    db.set_voting_duration((now - timedelta(hours=1)).isoformat(),
+                           (now + timedelta(days=1)).isoformat())
+    return db, ballot
+
+
+def login(app, username, password):
+    app.username_entry.delete(0, tk.END)
+    app.username_entry.insert(0, username)
+    app.password_entry.delete(0, tk.END)
+    app.password_entry.insert(0, password)
+    app._attempt_login()
+    app.root.update()
+
+
+def soak(args):
+    db, ballot = prepare(args.logins)
+    selections = {position: ids[0] for position, ids in ballot.items()}
+    app = MainWindow()
+    app.start()  # run() without its mainloop: the soak pumps events itself
+    root = app.root
+    root.update()
+
+    samples = []
+    started = time.perf_counter()
+    for i in range(args.logins):
+        if i % 10 == 9:
+            login(app, *ADMIN)
+            assert app.router.current == "admin", "admin login did not reach the dashboard"
+            app.admin_panel.show_poll_status()
+        else:
+            login(app, f"user{i}", "pass")
+            assert app.router.current == "student", f"user{i} did not reach the vote screen"
+            db.cast_ballot(f"REG{i:06d}", selections)
+            app.student_panel._display_poll_status_screen()
+        root.update()
+        (app.admin_panel if app.router.current == "admin" else app.student_panel)._go_back()
+        root.update()
+        assert app.router.current == "login"
+
+        if (i + 1) % args.sample_every == 0:
+            gc.collect()
+            samples.append({
+                "logins": i + 1,
+                "rss_mb": round(rss_bytes() / 1e6, 1),
+                "widgets": count_widgets(root),
+                "tk_interpreters": sum(isinstance(o, tk.Tk) for o in gc.get_objects()),
+                "python_objects": len(gc.get_objects()),
+            })
+    elapsed = time.perf_counter() - started
+    root.destroy()
+    db.close()
+
+    # Compare the end with the first sample after warm-up
+    baseline = next((s for s in samples if s["logins"] >= args.warmup), samples[0])
+    last = samples[-1]
+    rss_growth = last["rss_mb"] - baseline["rss_mb"]
+    report = {
+        "logins": args.logins,
+        "seconds": round(elapsed, 1),
+        "ms_per_login": round(elapsed * 1000 / args.logins, 1),
+        "baseline": baseline,
+        "final": last,
+        "rss_growth_mb": round(rss_growth, 1),
+        "samples": samples,
+    }
+    report["ok"] = (
+        last["tk_interpreters"] == 1
+        and last["widgets"] <= baseline["widgets"]
+        and rss_growth <= args.max_growth_mb
+    )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=100,
+                        help="logins before the baseline sample is taken")
+    parser.add_argument("--sample-every", type=int, default=50)
+    parser.add_argument("--max-growth-mb", type=float, default=8.0,
+                        help="RSS growth after warm-up that still counts as flat")
+    args = parser.parse_args()
+
+    # The soak drives a local database, never a vote service
+    os.environ.pop("UVS_SERVICE_URL", None)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # MainWindow opens voting_system.db in the working directory
+        os.chdir(tmp)
+        try:
+            report = soak(args)
+        finally:
+            os.chdir(cwd)
+    print(json.dumps(report, indent=2))
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
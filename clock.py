@@ -0,0 +1,67 @@
+# clock.py
+import itertools
+import time
+
+
+class ClockService:
+    """One ticking loop per window that screens subscribe to.
+
+    Callbacks get the current time.monotonic() once per interval and return
+    False to unsubscribe. The loop runs only while something is subscribed,
+    and ticks are aligned to the monotonic clock so they do not drift.
+    Screens drop all their subscriptions with clear() when they are replaced.
+    """
+
+    def __init__(self, widget, interval=1.0):
+        self.widget = widget
+        self.interval = interval
+        self._subscribers = {}
+        self._ids = itertools.count(1)
+        self._after_id = None
+        self._origin = time.monotonic()
+
+    def subscribe(self, callback):
+        """Call callback(now) right away and then on every tick. Returns a token."""
+        token = next(self._ids)
+        self._subscribers[token] = callback
+        if callback(time.monotonic()) is False:
+            self._subscribers.pop(token, None)
+        self._schedule()
+        return token
+
+    def unsubscribe(self, token):
+        self._subscribers.pop(token, None)
+        if not self._subscribers:
+            self._cancel()
+
+    def clear(self):
+        self._subscribers.clear()
+        self._cancel()
+
+    def _schedule(self):
+        if self._after_id is not None or not self._subscribers:
+            return
+        elapsed = (time.monotonic() - self._origin) % self.interval
+        delay_ms = max(int((self.interval - elapsed) * 1000), 1)
+        self._after_id = self.widget.after(delay_ms, self._tick)
+
+    def _cancel(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _tick(self):
+        self._after_id = None
+        now = time.monotonic()
+        for token, callback in list(self._subscribers.items()):
+            try:
+                keep = callback(now)
+            except Exception:
+                # A widget from a replaced screen; never let it kill the clock
+                keep = False
+            if keep is False:
+                self._subscribers.pop(token, None)
+        self._schedule()
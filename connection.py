@@ -0,0 +1,156 @@
+# connection.py
+import os
+import sqlite3
+import threading
+
+from instrumentation import connection_factory
+
+
+# Named PRAGMA sets. "default" suits a single polling laptop, "kiosk" keeps
+# memory low on old terminals and "server" is for the machine hosting the
+# shared database during an election.
+PERFORMANCE_PROFILES = {
+    "default": {
+        "busy_timeout": 5000,          # ms to wait on a locked database
+        "synchronous": "NORMAL",
+        "cache_size": -16000,          # negative = KiB (16 MB)
+        "mmap_size": 64 * 1024 * 1024,
+        "ballot_batch": 32,            # most ballots per group commit
+        "ballot_delay_ms": 1,          # how long a batch waits for company
+    },
+    "kiosk": {
+        "busy_timeout": 5000,
+        "synchronous": "NORMAL",
+        "cache_size": -4000,
+        "mmap_size": 16 * 1024 * 1024,
+        "ballot_batch": 8,
+        "ballot_delay_ms": 0,
+    },
+    "server": {
+        "busy_timeout": 10000,
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "ballot_batch": 256,
+        "ballot_delay_ms": 1,
+    },
+}
+
+DEFAULT_PROFILE = os.environ.get("UVS_DB_PROFILE", "default")
+
+
+class ConnectionManager:
+    """One tuned SQLite connection per thread for a single database file."""
+
+    def __init__(self, db_path, profile=DEFAULT_PROFILE):
+        if profile not in PERFORMANCE_PROFILES:
+            raise ValueError(f"Unknown database profile: {profile}")
+        self.db_path = db_path
+        self.profile = profile
+        self.settings = PERFORMANCE_PROFILES[profile]
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._connections = []
+        self._schema_ready = False
+        # Process-wide memo for read-mostly data such as the ballot layout.
+        # DatabaseManager drops entries whenever it writes the source tables.
+        self.cache = {}
+        # Bumped by DatabaseManager after every write that changes results,
+        # so screens in this process can tell when to re-query.
+        self.write_version = 0
+        # Group-commit writer, started on first DatabaseManager.submit_ballot
+        self.ballot_writer = None
+
+    def note_write(self):
+        with self._lock:
+            self.write_version += 1
+
+    def attach_ballot_writer(self, factory):
+        """Create the ballot writer for this database once and return it."""
+        with self._lock:
+            if self.ballot_writer is None:
+                self.ballot_writer = factory()
+            return self.ballot_writer
+
+    def connection(self):
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _open(self):
+        s = self.settings
+        conn = sqlite3.connect(self.db_path, timeout=s["busy_timeout"] / 1000,
+                               factory=connection_factory())
+        # Lets DatabaseManager.prune_history hand space back to the OS. SQLite
+        # only honours it on a brand-new file, so it must come before WAL.
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA busy_timeout={int(s['busy_timeout'])}")
+        conn.execute(f"PRAGMA synchronous={s['synchronous']}")
+        conn.execute(f"PRAGMA cache_size={int(s['cache_size'])}")
+        conn.execute(f"PRAGMA mmap_size={int(s['mmap_size'])}")
+        return conn
+
+    def ensure_schema(self, bootstrap):
+        """Run the schema bootstrap once per process for this database."""
+        if self._schema_ready:
+            return
+        with self._lock:
+            if not self._schema_ready:
+                bootstrap()
+                self._schema_ready = True
+
+    def close_thread_connection(self):
+        """Close the calling thread's connection (reopened on next use)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def close_all(self):
+        with self._lock:
+            writer, self.ballot_writer = self.ballot_writer, None
+        if writer is not None:
+            writer.close()
+        with self._lock:
+            conns, self._connections = self._connections, []
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                # Owned by another thread; it goes away with that thread.
+                pass
+        self._local = threading.local()
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_manager(db_path, profile=None):
+    """Return the process-wide ConnectionManager for db_path.
+
+    The first caller for a file picks its profile. Asking for a different
+    profile later is an error rather than silently getting the first one.
+    """
+    key = os.path.abspath(db_path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = ConnectionManager(db_path, profile or DEFAULT_PROFILE)
+            _managers[key] = manager
+        elif profile is not None and profile != manager.profile:
+            raise ValueError(
+                f"{db_path} is already open with the {manager.profile!r} profile, "
+                f"not {profile!r}"
+            )
+        return manager
@@ -1,16 +1,54 @@
 # database.py
-import sqlite3
 import os
-from datetime import datetime
+import sqlite3
+import threading
+import time
+
+from ballot_writer import BallotWriter
+from connection import get_manager
+from instrumentation import instrument_class
+from thumbnails import THUMB_DIR_NAME, make_thumbnail
+from voter_bitmap import VoterBitmap
+from voting_window import VotingWindow
 
 
 DB_NAME = "voting_system.db"
+# Election rounds whose ballots prune_history keeps
+HISTORY_EPOCHS = 5
+
+# Columns the Manage Candidates list can be sorted by, as indexed expressions
+CANDIDATE_SORTS = {
+    "id": "id",
+    "name": "IFNULL(name, '')",
+    "position": "IFNULL(position, '')",
+    "votes": "votes",
+}
+
+
+class BallotError(ValueError):
+    """Raised when a submitted ballot is rejected before anything is written."""
 
 
+class AlreadyVotedError(BallotError):
+    """The student's vote was already recorded (possibly from another terminal)."""
+
+
+@instrument_class
 class DatabaseManager:
-    def __init__(self):
-        self.conn = sqlite3.connect(DB_NAME)
-        self.create_tables()
+    def __init__(self, db_path=DB_NAME, profile=None):
+        self.db_path = db_path
+        # All DatabaseManager instances for the same file share one
+        # connection per thread, and the schema is bootstrapped only once.
+        self.manager = get_manager(db_path, profile)
+        self.manager.ensure_schema(self.create_tables)
+
+    @property
+    def conn(self):
+        return self.manager.connection()
+
+    @property
+    def thumbnail_dir(self):
+        return os.path.join(os.path.dirname(os.path.abspath(self.db_path)), THUMB_DIR_NAME)
 
     def create_tables(self):
         cur = self.conn.cursor()
@@ -48,6 +86,12 @@ class DatabaseManager:
             )
         ''')
 
+        # Pre-sized 120x120 copies of photo/logo used by every screen
+        columns = {row[1] for row in cur.execute("PRAGMA table_info(candidates)")}
+        for column in ("photo_thumb", "logo_thumb"):
+            if column not in columns:
+                cur.execute(f"ALTER TABLE candidates ADD COLUMN {column} TEXT")
+
         # Duration settings table
         cur.execute('''
             CREATE TABLE IF NOT EXISTS voting_settings (
@@ -57,6 +101,212 @@ class DatabaseManager:
             )
         ''')
 
+        # Positions table
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS positions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL
+            )
+        ''')
+
+        # Elections: one row per election or rehearsal round. The highest
+        # epoch is the current one; resetting votes just opens a new epoch,
+        # and ballots/tallies of earlier epochs stay behind as history.
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS elections (
+                epoch INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at TEXT NOT NULL
+                    DEFAULT (strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime'))
+            )
+        ''')
+        if not cur.execute("SELECT 1 FROM elections LIMIT 1").fetchone():
+            cur.execute("INSERT INTO elections (epoch) VALUES (1)")
+
+        # students.voted_epoch replaces has_voted: a student has voted when it
+        # equals the current epoch, so a reset never has to touch this table.
+        columns = {row[1] for row in cur.execute("PRAGMA table_info(students)")}
+        if "voted_epoch" not in columns:
+            cur.execute("ALTER TABLE students ADD COLUMN voted_epoch INTEGER")
+            cur.execute(
+                "UPDATE students SET voted_epoch = (SELECT MAX(epoch) FROM elections) "
+                "WHERE has_voted = 1"
+            )
+
+        # "Not voted yet" is the rowid range; this serves "voted" pages
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_students_voted ON students (voted_epoch)"
+        )
+        self._create_student_search(cur)
+
+        # Ballots table: append-only audit log, one row per vote
+        # (rows from before epochs existed belong to the first election)
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS ballots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                regno_hash TEXT,
+                candidate_id INTEGER NOT NULL,
+                position TEXT NOT NULL,
+                cast_at TEXT NOT NULL
+                    DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')),
+                epoch INTEGER NOT NULL DEFAULT 1
+            )
+        ''')
+        columns = {row[1] for row in cur.execute("PRAGMA table_info(ballots)")}
+        if "epoch" not in columns:
+            cur.execute("ALTER TABLE ballots ADD COLUMN epoch INTEGER NOT NULL DEFAULT 1")
+        # Ballots carry no voter link: the claim lives in students.voted_epoch.
+        # Older databases stored sha256(regno), which students.regno reverses,
+        # so scrub it once (the append-only trigger is recreated just below).
+        if cur.execute(
+            "SELECT 1 FROM ballots WHERE regno_hash IS NOT NULL LIMIT 1"
+        ).fetchone():
+            cur.execute("DROP TRIGGER IF EXISTS ballots_append_only")
+            cur.execute("UPDATE ballots SET regno_hash = NULL")
+        cur.execute('''
+            CREATE TRIGGER IF NOT EXISTS ballots_append_only
+            BEFORE UPDATE ON ballots
+            BEGIN
+                SELECT RAISE(ABORT, 'ballots are append-only');
+            END
+        ''')
+
+        # Tallies table: running totals per candidate and epoch, kept up to
+        # date by triggers so results never need to count ballots
+        tally_columns = {row[1] for row in cur.execute("PRAGMA table_info(tallies)")}
+        if tally_columns and "epoch" not in tally_columns:
+            # Tallies from before epochs: rebuild keyed by (epoch, candidate).
+            # The view and triggers that use the table are recreated below.
+            cur.execute("DROP VIEW IF EXISTS candidate_results")
+            for trigger in ("ballots_tally", "candidates_tally_insert",
+                            "candidates_tally_position", "candidates_tally_delete"):
+                cur.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cur.execute("ALTER TABLE tallies RENAME TO tallies_legacy")
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS tallies (
+                epoch INTEGER NOT NULL,
+                candidate_id INTEGER NOT NULL,
+                position TEXT NOT NULL,
+                votes INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (epoch, candidate_id)
+            )
+        ''')
+        if tally_columns and "epoch" not in tally_columns:
+            cur.execute('''
+                INSERT INTO tallies (epoch, candidate_id, position, votes)
+                SELECT (SELECT MAX(epoch) FROM elections), candidate_id, position, votes
+                FROM tallies_legacy
+            ''')
+            cur.execute("DROP TABLE tallies_legacy")
+        elif not tally_columns:
+            # Carry over counts recorded in the old candidates.votes column
+            cur.execute('''
+                INSERT OR IGNORE INTO tallies (epoch, candidate_id, position, votes)
+                SELECT (SELECT MAX(epoch) FROM elections), id,
+                       COALESCE(position, ''), COALESCE(votes, 0)
+                FROM candidates
+            ''')
+        cur.execute('''
+            CREATE TRIGGER IF NOT EXISTS ballots_tally
+            AFTER INSERT ON ballots
+            BEGIN
+                INSERT INTO tallies (epoch, candidate_id, position, votes)
+                VALUES (NEW.epoch, NEW.candidate_id, NEW.position, 1)
+                ON CONFLICT(epoch, candidate_id) DO UPDATE SET votes = votes + 1;
+            END
+        ''')
+        cur.execute('''
+            CREATE TRIGGER IF NOT EXISTS elections_tally_open
+            AFTER INSERT ON elections
+            BEGIN
+                INSERT OR IGNORE INTO tallies (epoch, candidate_id, position, votes)
+                SELECT NEW.epoch, id, COALESCE(position, ''), 0 FROM candidates;
+            END
+        ''')
+        cur.execute('''
+            CREATE TRIGGER IF NOT EXISTS candidates_tally_insert
+            AFTER INSERT ON candidates
+            BEGIN
+                INSERT OR IGNORE INTO tallies (epoch, candidate_id, position, votes)
+                SELECT MAX(epoch), NEW.id, COALESCE(NEW.position, ''), 0 FROM elections;
+            END
+        ''')
+        # Only the current epoch follows candidate edits; history keeps the
+        # position each candidate actually stood for.
+        cur.execute('''
+            CREATE TRIGGER IF NOT EXISTS candidates_tally_position
+            AFTER UPDATE OF position ON candidates
+            BEGIN
+                UPDATE tallies SET position = COALESCE(NEW.position, '')
+                WHERE epoch = (SELECT MAX(epoch) FROM elections)
+                  AND candidate_id = NEW.id;
+            END
+        ''')
+        cur.execute('''
+            CREATE TRIGGER IF NOT EXISTS candidates_tally_delete
+            AFTER DELETE ON candidates
+            BEGIN
+                DELETE FROM tallies
+                WHERE epoch = (SELECT MAX(epoch) FROM elections)
+                  AND candidate_id = OLD.id;
+            END
+        ''')
+
+        # Candidate rows with their live vote count (replaces candidates.votes)
+        cur.execute('''
+            CREATE VIEW IF NOT EXISTS candidate_results AS
+            SELECT c.id, c.name, c.position, COALESCE(t.votes, 0) AS votes,
+                   c.photo, c.logo_path
+            FROM candidates c
+            LEFT JOIN tallies t
+                ON t.epoch = (SELECT MAX(epoch) FROM elections)
+               AND t.candidate_id = c.id
+        ''')
+
+        # Indexes for the lookups the screens and vote path run most often
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_candidates_position "
+            "ON candidates (position, id)"
+        )
+        cur.execute("DROP INDEX IF EXISTS idx_tallies_position_votes")
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tallies_epoch_position_votes "
+            "ON tallies (epoch, position, votes DESC)"
+        )
+        # Keyset pages of the Manage Candidates list, sorted by name or position
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_candidates_name "
+            "ON candidates (IFNULL(name, ''), id)"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_candidates_position_sort "
+            "ON candidates (IFNULL(position, ''), id)"
+        )
+        # Lets prune_history find old epochs' ballots without a scan
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ballots_epoch ON ballots (epoch)"
+        )
+
+        # Catalog version: bumped by triggers on every change to candidates
+        # or positions, so each process can tell when its cached ballot is
+        # out of date, whichever terminal made the change.
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS catalog_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL
+            )
+        ''')
+        cur.execute("INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)")
+        for table in ("candidates", "positions"):
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                cur.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {table}_catalog_{event.lower()}
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+                    END
+                ''')
+        self.conn.commit()
+
                 # Create default admin if none exists
         cur.execute("SELECT * FROM admins")
         if not cur.fetchone():
@@ -67,15 +317,159 @@ class DatabaseManager:
 
 
           # ---------- STUDENT OPERATIONS ----------
+    def _create_student_search(self, cur):
+        """Full-text index over name, username and regno for the Students screen.
+
+        trigram (SQLite 3.34+) finds any substring; older builds index
+        words and search by prefix. Kept in step by triggers; the one on
+        UPDATE only fires for those three columns, so votes never touch it.
+        Without FTS5 at all, get_students_page falls back to LIKE.
+        """
+        if not cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'students_fts'").fetchone():
+            for tokenize in ("trigram", "unicode61"):
+                try:
+                    cur.execute(f'''
+                        CREATE VIRTUAL TABLE students_fts USING fts5(
+                            name, username, regno,
+                            content='students', content_rowid='id',
+                            tokenize='{tokenize}'
+                        )
+                    ''')
+                except sqlite3.OperationalError:
+                    continue
+                # Index the students registered before the table existed
+                cur.execute("INSERT INTO students_fts (students_fts) VALUES ('rebuild')")
+                break
+            else:
+                return
+
+        cur.execute('''
+            CREATE TRIGGER IF NOT EXISTS students_fts_insert
+            AFTER INSERT ON students
+            BEGIN
+                INSERT INTO students_fts (rowid, name, username, regno)
+                VALUES (new.id, new.name, new.username, new.regno);
+            END
+        ''')
+        cur.execute('''
+            CREATE TRIGGER IF NOT EXISTS students_fts_delete
+            AFTER DELETE ON students
+            BEGIN
+                INSERT INTO students_fts (students_fts, rowid, name, username, regno)
+                VALUES ('delete', old.id, old.name, old.username, old.regno);
+            END
+        ''')
+        cur.execute('''
+            CREATE TRIGGER IF NOT EXISTS students_fts_update
+            AFTER UPDATE OF name, username, regno ON students
+            BEGIN
+                INSERT INTO students_fts (students_fts, rowid, name, username, regno)
+                VALUES ('delete', old.id, old.name, old.username, old.regno);
+                INSERT INTO students_fts (rowid, name, username, regno)
+                VALUES (new.id, new.name, new.username, new.regno);
+            END
+        ''')
+
+    def student_search_mode(self):
+        """'trigram', 'words' or None (no FTS5), as created for this file."""
+        mode = self.manager.cache.get("student_search")
+        if mode is None:
+            row = self.conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'students_fts'"
+            ).fetchone()
+            if row is None:
+                mode = "like"
+            else:
+                mode = "trigram" if "trigram" in row[0] else "words"
+            self.manager.cache["student_search"] = mode
+        return None if mode == "like" else mode
+
+    def get_students_page(self, search=None, voted=None, after=0, limit=100):
+        """One page of the admin Students screen, in registration order.
+
+        Rows are (id, name, username, regno, voted). `after` is the id of
+        the last row shown (keyset paging). `search` matches name, username
+        or regno through students_fts; `voted` True/False keeps only
+        students who have / have not voted in the current election.
+        """
+        source, key = "students s", "s.id"
+        where, params = [], []
+        term = (search or "").strip()
+        if term:
+            mode = self.student_search_mode()
+            if mode == "trigram" and len(term) >= 3:
+                match = '"' + term.replace('"', '""') + '"'
+            elif mode == "words":
+                match = " ".join('"' + word.replace('"', '""') + '"*' for word in term.split())
+            else:
+                # Too short for trigrams (or no FTS5): a plain scan
+                match = None
+                pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                where.append(
+                    "(s.name LIKE ? ESCAPE '\\' OR s.username LIKE ? ESCAPE '\\' "
+                    "OR s.regno LIKE ? ESCAPE '\\')"
+                )
+                params += [pattern] * 3
+            if match is not None:
+                source = "students_fts f JOIN students s ON s.id = f.rowid"
+                key = "f.rowid"
+                where.append("students_fts MATCH ?")
+                params.append(match)
+        if voted is True:
+            where.append("s.voted_epoch = (SELECT MAX(epoch) FROM elections)")
+        elif voted is False:
+            where.append("s.voted_epoch IS NOT (SELECT MAX(epoch) FROM elections)")
+        where.append(f"{key} > ?")
+        params += [after or 0, limit]
+
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT s.id, s.name, s.username, s.regno, "
+            "s.voted_epoch IS (SELECT MAX(epoch) FROM elections) "
+            f"FROM {source} WHERE {' AND '.join(where)} ORDER BY {key} LIMIT ?",
+            params,
+        )
+        return cur.fetchall()
+
     def register_student(self, name, username, regno, password):
-        conn = sqlite3.connect(DB_NAME)
-        cur = conn.cursor()
+        cur = self.conn.cursor()
         cur.execute("""
             INSERT INTO students (name, username, regno, password)
             VALUES (?, ?, ?, ?)
         """, (name, username, regno, password))
-        conn.commit()
-        conn.close()
+        self.conn.commit()
+
+    def register_students(self, rows):
+        """Insert many (name, username, regno, password) rows in one transaction.
+
+        On a UNIQUE clash nothing from `rows` is kept and the IntegrityError
+        is re-raised, so the caller can retry the rows one by one.
+        """
+        try:
+            self.conn.executemany("""
+                INSERT INTO students (name, username, regno, password)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return len(rows)
+
+    def find_existing_students(self, usernames, regnos):
+        """Return ([usernames], [regnos]) from the given ones that are already registered."""
+        taken = []
+        for column, values in (("username", list(usernames)), ("regno", list(regnos))):
+            found = []
+            # Stay well below SQLite's limit on bound parameters
+            for start in range(0, len(values), 500):
+                chunk = values[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                found.extend(r[0] for r in self.conn.execute(
+                    f"SELECT {column} FROM students WHERE {column} IN ({marks})", chunk
+                ))
+            taken.append(found)
+        return taken[0], taken[1]
 
     def verify_student(self, username, password):
         cur = self.conn.cursor()
@@ -85,14 +479,51 @@ class DatabaseManager:
 
     def mark_student_voted(self, regno):
         cur = self.conn.cursor()
-        cur.execute("UPDATE students SET has_voted=1 WHERE regno=?", (regno,))
+        cur.execute(
+            "UPDATE students SET voted_epoch = (SELECT MAX(epoch) FROM elections) "
+            "WHERE regno=?",
+            (regno,),
+        )
         self.conn.commit()
+        self.note_voted(regno)
 
     def student_has_voted(self, regno):
-        cur = self.conn.cursor()
-        cur.execute("SELECT has_voted FROM students WHERE regno=?", (regno,))
-        row = cur.fetchone()
-        return row and row[0] == 1
+        """True if the student voted in the current election.
+
+        Answered from the in-memory voter bitmap, which may trail other
+        processes' votes by up to its max_age; write_ballot still refuses
+        a second ballot, so a stale answer can never let anyone vote twice.
+        """
+        voters = self.voters()
+        voted = voters.has_voted(regno)
+        if voted is None:
+            # Not in the bitmap yet: registered a moment ago, or unknown
+            row = self.conn.execute(
+                "SELECT voted_epoch IS (SELECT MAX(epoch) FROM elections) "
+                "FROM students WHERE regno=?",
+                (regno,),
+            ).fetchone()
+            return bool(row and row[0] == 1)
+        return voted
+
+    def voters(self, max_age=None):
+        """The shared VoterBitmap, synced if it is older than max_age seconds."""
+        voters = self.manager.cache.get("voters")
+        if voters is None:
+            voters = self.manager.cache.setdefault("voters", VoterBitmap())
+        voters.sync(self.conn, max_age)
+        return voters
+
+    def note_voted(self, *regnos):
+        """Mark committed votes in the voter bitmap (if it has been loaded)."""
+        voters = self.manager.cache.get("voters")
+        if voters is not None:
+            for regno in regnos:
+                voters.mark(regno)
+
+    def get_turnout(self):
+        """(students who voted, students registered) in the current election."""
+        return self.voters(max_age=0).turnout()
 
     # ---------- CANDIDATE OPERATIONS ----------
     def add_candidate(self, name, position, photo_path=None, logo_path=None):
@@ -102,12 +533,17 @@ class DatabaseManager:
         if logo_path:
             logo_path = os.path.abspath(logo_path)
 
+        photo_thumb = make_thumbnail(photo_path, self.thumbnail_dir)
+        logo_thumb = make_thumbnail(logo_path, self.thumbnail_dir)
+
         cur = self.conn.cursor()
         cur.execute(
-            "INSERT INTO candidates (name, position, photo, logo_path) VALUES (?, ?, ?, ?)",
-            (name, position, photo_path, logo_path),
+            "INSERT INTO candidates (name, position, photo, logo_path, photo_thumb, logo_thumb) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (name, position, photo_path, logo_path, photo_thumb, logo_thumb),
         )
         self.conn.commit()
+        self._invalidate_ballot()
 
 
     def update_candidate(self, candidate_id, name, position, photo_path, logo_path):
@@ -118,31 +554,75 @@ class DatabaseManager:
         if logo_path:
             logo_path = os.path.abspath(logo_path)
 
+        photo_thumb = make_thumbnail(photo_path, self.thumbnail_dir)
+        logo_thumb = make_thumbnail(logo_path, self.thumbnail_dir)
+
         cur = self.conn.cursor()
         cur.execute(
             """
             UPDATE candidates
-            SET name = ?, position = ?, photo = ?, logo_path = ?
+            SET name = ?, position = ?, photo = ?, logo_path = ?,
+                photo_thumb = ?, logo_thumb = ?
             WHERE id = ?
             """,
-            (name, position, photo_path, logo_path, candidate_id),
+            (name, position, photo_path, logo_path, photo_thumb, logo_thumb, candidate_id),
         )
         self.conn.commit()
+        self._invalidate_ballot()
 
     def get_candidates(self, position=None):
         cur = self.conn.cursor()
         if position:
-            cur.execute("SELECT id, name, position, votes, photo, logo_path FROM candidates WHERE position=?", (position,))
+            cur.execute("SELECT id, name, position, votes, photo, logo_path FROM candidate_results WHERE position=?", (position,))
         else:
-            cur.execute("SELECT id, name, position, votes, photo, logo_path FROM candidates")
+            cur.execute("SELECT id, name, position, votes, photo, logo_path FROM candidate_results")
         return cur.fetchall()
     
 
+    def get_candidates_page(self, sort="id", descending=False, search=None, after=None, limit=100):
+        """One page of the Manage Candidates list.
+
+        Rows are (id, name, position, votes, sort_value), ordered by `sort`
+        (a CANDIDATE_SORTS key) and then id. Pass the (sort_value, id) of
+        the last row shown as `after` to get the next page: the query seeks
+        straight to it in the index, so every page costs the same however
+        far down the list it is. `search` keeps rows whose name or position
+        contains it (case-insensitive).
+        """
+        if sort not in CANDIDATE_SORTS:
+            raise ValueError(f"Cannot sort candidates by {sort!r}")
+        key = CANDIDATE_SORTS[sort]
+        op, direction = ("<", "DESC") if descending else (">", "ASC")
+
+        where, params = [], []
+        if search:
+            pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            where.append("(name LIKE ? ESCAPE '\\' OR position LIKE ? ESCAPE '\\')")
+            params += [pattern, pattern]
+        if after is not None:
+            if sort == "id":
+                where.append(f"id {op} ?")
+                params.append(after[1])
+            else:
+                # The plain range on the first column lets SQLite seek the index
+                where.append(f"{key} {op}= ? AND ({key}, id) {op} (?, ?)")
+                params += [after[0], after[0], after[1]]
+
+        sql = f"SELECT id, name, position, votes, {key} FROM candidate_results"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {key} {direction}, id {direction} LIMIT ?"
+        params.append(limit)
+
+        cur = self.conn.cursor()
+        cur.execute(sql, params)
+        return cur.fetchall()
+
     def get_candidate_by_id(self, candidate_id: int):
         """Return one candidate row by id."""
         cur = self.conn.cursor()
         cur.execute(
-            "SELECT id, name, position, votes, photo, logo_path FROM candidates WHERE id = ?",
+            "SELECT id, name, position, votes, photo, logo_path FROM candidate_results WHERE id = ?",
             (candidate_id,),
         )
         return cur.fetchone()
@@ -155,23 +635,168 @@ class DatabaseManager:
         cur = self.conn.cursor()
         cur.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,))
         self.conn.commit()
+        self._invalidate_ballot()
 
+    # ---------- BALLOT ----------
+    def get_ballot(self):
+        """Return the ballot as ((position, ((id, name, photo, logo), ...)), ...).
 
-    def get_all_positions(self):
+        Positions come in name order with their candidates in registration
+        order, all from one query. photo/logo are the 120x120 thumbnails
+        (or the original file for rows that predate thumbnails). The result
+        is cached for the process, keyed on catalog_version, so a change
+        made by any terminal or the vote service is seen on the next call.
+        """
         cur = self.conn.cursor()
-        cur.execute("SELECT DISTINCT position FROM candidates")
-        return [r[0] for r in cur.fetchall()]
+        # Read the version first: a change committed between the two reads
+        # only makes the next call load the ballot again.
+        version = cur.execute(
+            "SELECT version FROM catalog_version WHERE id = 1"
+        ).fetchone()[0]
+        cached = self.manager.cache.get("ballot")
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        cur.execute("""
+            SELECT p.name, c.id, c.name,
+                   COALESCE(NULLIF(c.photo_thumb, ''), c.photo),
+                   COALESCE(NULLIF(c.logo_thumb, ''), c.logo_path)
+            FROM positions p
+            LEFT JOIN candidates c ON c.position = p.name
+            ORDER BY p.name, c.id
+        """)
+        grouped = {}
+        for position, cid, name, photo, logo_path in cur.fetchall():
+            candidates = grouped.setdefault(position, [])
+            if cid is not None:
+                candidates.append((cid, name, photo, logo_path))
+        ballot = tuple((pos, tuple(cands)) for pos, cands in grouped.items())
+        self.manager.cache["ballot"] = (version, ballot)
+        return ballot
 
-    def cast_vote(self, candidate_id):
+    def get_vote_counts(self):
+        """Return {candidate_id: votes} for every candidate in the current election."""
         cur = self.conn.cursor()
-        cur.execute("UPDATE candidates SET votes = votes + 1 WHERE id=?", (candidate_id,))
-        self.conn.commit()
+        cur.execute(
+            "SELECT candidate_id, votes FROM tallies "
+            "WHERE epoch = (SELECT MAX(epoch) FROM elections)"
+        )
+        return dict(cur.fetchall())
+
+    def backfill_thumbnails(self):
+        """Create thumbnails for candidates registered before they existed.
 
-    def record_vote(self, regno, candidate_id):
+        A picture that cannot be read gets an empty thumbnail path, so it
+        is tried once rather than on every start; the ballot then falls
+        back to the original file.
+        """
         cur = self.conn.cursor()
-        cur.execute("UPDATE candidates SET votes = votes + 1 WHERE id=?", (candidate_id,))
-        cur.execute("UPDATE students SET has_voted=1 WHERE regno=?", (regno,))
-        self.conn.commit()
+        cur.execute("""
+            SELECT id, photo, logo_path, photo_thumb, logo_thumb FROM candidates
+            WHERE (photo IS NOT NULL AND photo <> '' AND photo_thumb IS NULL)
+               OR (logo_path IS NOT NULL AND logo_path <> '' AND logo_thumb IS NULL)
+        """)
+        updates = []
+        for cid, photo, logo, photo_thumb, logo_thumb in cur.fetchall():
+            if photo_thumb is None:
+                photo_thumb = make_thumbnail(photo, self.thumbnail_dir) or ""
+            if logo_thumb is None:
+                logo_thumb = make_thumbnail(logo, self.thumbnail_dir) or ""
+            updates.append((photo_thumb, logo_thumb, cid, photo, logo))
+        if updates:
+            # Skip candidates whose pictures were changed while we worked
+            cur.executemany(
+                "UPDATE candidates SET photo_thumb = ?, logo_thumb = ? "
+                "WHERE id = ? AND photo IS ? AND logo_path IS ?",
+                updates,
+            )
+            self.conn.commit()
+            self._invalidate_ballot()
+        return len(updates)
+
+    def _invalidate_ballot(self):
+        self.manager.cache.pop("ballot", None)
+        self.manager.note_write()
+
+    def cast_ballot(self, regno, selections):
+        """Record a whole ballot ({position: candidate_id}) in one transaction.
+
+        The candidates are checked first, then write_ballot claims the voter
+        and inserts the votes, so either every vote is written with a single
+        commit or nothing is. Raises AlreadyVotedError if the student has
+        voted, even from another terminal a moment earlier.
+        """
+        cur = self.conn.cursor()
+        self.check_ballot(cur, selections)
+        try:
+            self.write_ballot(cur, regno, selections)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.manager.note_write()
+        self.note_voted(regno)
+
+    def submit_ballot(self, regno, selections):
+        """Queue a ballot for the shared group-commit writer.
+
+        Returns a concurrent.futures.Future that resolves once the ballot's
+        batch is committed, or raises the BallotError that rejected it.
+        """
+        writer = self.manager.ballot_writer
+        if writer is None:
+            settings = self.manager.settings
+            writer = self.manager.attach_ballot_writer(lambda: BallotWriter(
+                DatabaseManager(self.db_path, self.manager.profile),
+                max_batch=settings["ballot_batch"],
+                max_delay=settings["ballot_delay_ms"] / 1000,
+            ))
+        return writer.submit(regno, selections)
+
+    def check_ballot(self, cur, selections):
+        """Raise BallotError unless every candidate stands for the position chosen."""
+        if not selections:
+            raise BallotError("Please select at least one candidate.")
+
+        ids = list(selections.values())
+        placeholders = ",".join("?" * len(ids))
+        cur.execute(
+            f"SELECT id, position FROM candidates WHERE id IN ({placeholders})",
+            ids,
+        )
+        positions_by_id = dict(cur.fetchall())
+        for position, candidate_id in selections.items():
+            if positions_by_id.get(candidate_id) != position:
+                raise BallotError(
+                    f"Candidate #{candidate_id} is not standing for {position}."
+                )
+
+    def write_ballot(self, cur, regno, selections):
+        """Claim the voter and insert a checked ballot; the caller commits.
+
+        Checking voted_epoch and setting it is one conditional UPDATE, so of
+        two terminals submitting for the same student exactly one claims
+        the row and the other gets AlreadyVotedError. The ballot rows store
+        no voter link, so they cannot be joined back to the student. Used by
+        cast_ballot and BallotWriter.
+        """
+        cur.execute(
+            "UPDATE students SET voted_epoch = (SELECT MAX(epoch) FROM elections) "
+            "WHERE regno=? AND voted_epoch IS NOT (SELECT MAX(epoch) FROM elections)",
+            (regno,),
+        )
+        if cur.rowcount != 1:
+            cur.execute("SELECT 1 FROM students WHERE regno=?", (regno,))
+            if cur.fetchone() is None:
+                raise BallotError(f"No student found with registration number {regno}.")
+            raise AlreadyVotedError("You have already voted.")
+
+        # The claim above holds the write lock, so no reset can slip in here
+        epoch = cur.execute("SELECT MAX(epoch) FROM elections").fetchone()[0]
+        cur.executemany(
+            "INSERT INTO ballots (candidate_id, position, epoch) VALUES (?, ?, ?)",
+            [(cid, position, epoch) for position, cid in selections.items()],
+        )
 
 
     # ---------- VOTING TIME OPERATIONS ----------
@@ -181,32 +806,24 @@ class DatabaseManager:
         cur.execute("INSERT INTO voting_settings (start_time, end_time) VALUES (?, ?)",
                     (start_time, end_time))
         self.conn.commit()
+        self.manager.cache.pop("voting_window", None)
 
     def get_voting_duration(self):
         cur = self.conn.cursor()
         cur.execute("SELECT start_time, end_time FROM voting_settings ORDER BY id DESC LIMIT 1")
         return cur.fetchone()
 
-    def is_voting_open(self):
-        data = self.get_voting_duration()
-        if not data:
-            return False, "Voting period not set."
+    def voting_window(self):
+        """The cached VotingWindow; re-read only after set_voting_duration
+        (or every RECHECK_SECONDS, to notice another process's change)."""
+        window = self.manager.cache.get("voting_window")
+        if window is None or window.is_stale():
+            window = VotingWindow(self.get_voting_duration())
+            self.manager.cache["voting_window"] = window
+        return window
 
-        start_str, end_str = data
-        now = datetime.now()
-
-        try:
-            start = datetime.fromisoformat(start_str)
-            end = datetime.fromisoformat(end_str)
-        except ValueError:
-            return False, "Invalid voting period format."
-
-        if now < start:
-            return False, "Voting has not started yet."
-        elif now > end:
-            return False, "Voting period is over."
-        else:
-            return True, "Voting is open."
+    def is_voting_open(self):
+        return self.voting_window().status()
 
         
     # ---------------- Position Management ----------------
@@ -221,11 +838,11 @@ class DatabaseManager:
         self.conn.commit()
 
     def add_position(self, position_name):
-        self.create_positions_table()
         try:
             cur = self.conn.cursor()
             cur.execute("INSERT INTO positions (name) VALUES (?)", (position_name.strip(),))
             self.conn.commit()
+            self._invalidate_ballot()
         except Exception as e:
             print("Error adding position:", e)
 
@@ -233,9 +850,9 @@ class DatabaseManager:
         cur = self.conn.cursor()
         cur.execute("DELETE FROM positions WHERE name = ?", (position_name,))
         self.conn.commit()
+        self._invalidate_ballot()
 
     def get_all_positions(self):
-        self.create_positions_table()
         cur = self.conn.cursor()
         cur.execute("SELECT name FROM positions ORDER BY name ASC")
         return [row[0] for row in cur.fetchall()]
@@ -243,11 +860,118 @@ class DatabaseManager:
         
         
         # ---------- POLL STATUS ----------
-    def get_poll_status(self):
+    def get_poll_status(self, epoch=None):
+            """(position, name, votes) for the current election, or an earlier `epoch`."""
             cur = self.conn.cursor()
-            cur.execute("SELECT position, name, votes FROM candidates ORDER BY position, votes DESC")
+            cur.execute("""
+                SELECT t.position, c.name, t.votes
+                FROM tallies t
+                JOIN candidates c ON c.id = t.candidate_id
+                WHERE t.epoch = COALESCE(?, (SELECT MAX(epoch) FROM elections))
+                ORDER BY t.position, t.votes DESC
+            """, (epoch,))
             return cur.fetchall()
-        
+
+    def get_tallies(self, epoch=None):
+        """Like get_poll_status, with the candidate id first: (id, position, name, votes)."""
+        cur = self.conn.cursor()
+        cur.execute("""
+            SELECT t.candidate_id, t.position, c.name, t.votes
+            FROM tallies t
+            JOIN candidates c ON c.id = t.candidate_id
+            WHERE t.epoch = COALESCE(?, (SELECT MAX(epoch) FROM elections))
+            ORDER BY t.position, t.votes DESC
+        """, (epoch,))
+        return cur.fetchall()
+
+    # ---------- ELECTION ROUNDS ----------
+    def get_current_epoch(self):
+        return self.conn.execute("SELECT MAX(epoch) FROM elections").fetchone()[0]
+
+    def get_elections(self):
+        """Every election round, newest first: (epoch, started_at, votes_cast)."""
+        cur = self.conn.cursor()
+        cur.execute("""
+            SELECT e.epoch, e.started_at,
+                   (SELECT COALESCE(SUM(t.votes), 0) FROM tallies t WHERE t.epoch = e.epoch)
+            FROM elections e
+            ORDER BY e.epoch DESC
+        """)
+        return cur.fetchall()
+
+    def prune_history(self, keep=HISTORY_EPOCHS, batch_size=5000, pause=0.05):
+        """Delete ballots and tallies of all but the newest `keep` elections.
+
+        Works in small transactions with a pause in between, so terminals
+        voting in the current election are never locked out for long. The
+        elections rows themselves are kept. Returns the number of ballots
+        removed.
+        """
+        cur = self.conn.cursor()
+        cutoff = self.get_current_epoch() - max(keep, 1) + 1
+        removed = 0
+        while True:
+            cur.execute(
+                "DELETE FROM ballots WHERE id IN "
+                "(SELECT id FROM ballots WHERE epoch < ? LIMIT ?)",
+                (cutoff, batch_size),
+            )
+            deleted = cur.rowcount
+            self.conn.commit()
+            removed += deleted
+            if deleted < batch_size:
+                break
+            time.sleep(pause)
+        cur.execute("DELETE FROM tallies WHERE epoch < ?", (cutoff,))
+        self.conn.commit()
+
+        # Hand the freed pages back to the OS a few at a time. This only
+        # does anything on databases created with auto_vacuum=INCREMENTAL.
+        free_pages = cur.execute("PRAGMA freelist_count").fetchone()[0]
+        while free_pages:
+            cur.execute("PRAGMA incremental_vacuum(1000)").fetchall()
+            remaining = cur.execute("PRAGMA freelist_count").fetchone()[0]
+            if remaining >= free_pages:
+                break   # auto_vacuum is off for this file
+            free_pages = remaining
+            time.sleep(pause)
+        return removed
+
+    def backfill_thumbnails_in_background(self):
+        """Run backfill_thumbnails on a daemon thread and return the thread,
+        so decoding old photos never holds up the Tk event loop."""
+        def run():
+            try:
+                self.backfill_thumbnails()
+            finally:
+                self.close()
+
+        thread = threading.Thread(target=run, name="uvs-thumbnails", daemon=True)
+        thread.start()
+        return thread
+
+    def prune_history_in_background(self, keep=HISTORY_EPOCHS):
+        """Run prune_history on a daemon thread and return the thread."""
+        def run():
+            try:
+                self.prune_history(keep)
+            finally:
+                self.close()
+
+        thread = threading.Thread(target=run, name="uvs-prune-history", daemon=True)
+        thread.start()
+        return thread
+
+    def get_results_version(self):
+        """Cheap token that changes whenever vote data may have changed.
+
+        PRAGMA data_version moves when another connection (another terminal
+        or thread) commits. write_version covers writes made through this
+        process's own connections.
+        """
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        return data_version, self.manager.write_version
+
 
     # ---------- ADMIN OPERATIONS ----------
     def register_admin(self, username, password):
@@ -279,13 +1003,19 @@ class DatabaseManager:
 
         # ---------- ADMIN OPERATIONS ----------
     def reset_votes(self):
-        """Reset all candidate votes and student voting status."""
+        """Reset all candidate votes and student voting status.
+
+        Opens a new election epoch: one row in elections (and a zero tally
+        per candidate). No student or ballot row is rewritten; the previous
+        round stays queryable until prune_history removes it.
+        """
         cur = self.conn.cursor()
-        # Reset candidate votes
-        cur.execute("UPDATE candidates SET votes = 0")
-        # Reset student voted status
-        cur.execute("UPDATE students SET has_voted = 0")
+        cur.execute("INSERT INTO elections DEFAULT VALUES")
         self.conn.commit()
+        self.manager.note_write()
+        voters = self.manager.cache.get("voters")
+        if voters is not None:
+            voters.invalidate()
 
     def verify_admin_login(self, username, password):
         query = "SELECT * FROM admins WHERE username=? AND password=?"
@@ -311,5 +1041,9 @@ class DatabaseManager:
 
 
     def close(self):
-        self.conn.close()
+        self.manager.close_thread_connection()
+
+    def close_all(self):
+        """On shutdown: stop the ballot writer and close every thread's connection."""
+        self.manager.close_all()
 
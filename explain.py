@@ -0,0 +1,233 @@
+# explain.py
+"""Print EXPLAIN QUERY PLAN for every query DatabaseManager runs.
+
+    python -m explain                  # plans against a fresh scratch database
+    python -m explain --db voting_system.db   # plans against a copy of it
+    python -m explain --check          # exit 1 if a hot query scans a table
+
+Nothing is copied out of database.py: each entry in CALLS runs the real
+method on a scratch database while set_trace_callback records every
+statement it executes, so the plans always match the code.
+"""
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+from database import DatabaseManager
+from voter_bitmap import VoterBitmap
+
+
+USER, REGNO, POSITION = "explain_user", "EXPLAIN-0001", "Explain Position"
+
+
+# Arguments that depend on rows created by earlier calls are resolved
+# before tracing starts, so their lookups do not show up in the plans.
+def _candidate(db):
+    return db.conn.execute("SELECT MAX(id) FROM candidates").fetchone()[0]
+
+
+def _selections(db):
+    return {POSITION: _candidate(db)}
+
+
+def _last_student(db):
+    return db.conn.execute("SELECT MAX(id) FROM students").fetchone()[0]
+
+
+def _voters_catch_up(db, last_student):
+    """A bitmap loaded before the latest vote: new students, then new votes."""
+    voters = VoterBitmap()
+    voters._last_student = last_student - 1
+    voters._catch_up(db.conn, db.get_current_epoch())
+
+
+# (name, method or function(db, *args), args, hot)
+# Hot calls run per login, per ballot or per screen; every statement they
+# execute must be served from an index: no full table scan, no temporary sort.
+# The calls run in order, so later ones find the rows earlier ones wrote.
+CALLS = [
+    ("add_position", "add_position", (POSITION,), False),
+    ("register_student", "register_student",
+     ("Explain Student", USER, REGNO, "pass"), False),
+    ("register_students", "register_students",
+     ([("Explain Student 2", "explain_user2", "EXPLAIN-0002", "pass")],), False),
+    ("find_existing_students", "find_existing_students", ([USER], [REGNO]), True),
+    ("verify_student", "verify_student", (USER, "pass"), True),
+    # The voter bitmap: one full load per process, then only what changed
+    ("voters: load", "voters", (), False),
+    ("student_has_voted", "student_has_voted", ("EXPLAIN-UNKNOWN",), True),
+    ("student_search_mode", "student_search_mode", (), False),
+    # Admin Students screen: keyset pages, full-text search, voted filters
+    ("get_students_page()", "get_students_page", (), True),
+    ("get_students_page(search)", "get_students_page", ("explain",), True),
+    ("get_students_page(voted)", "get_students_page", (None, True), True),
+    ("get_students_page(not voted)", "get_students_page", (None, False), True),
+    ("reset_student_password", "reset_student_password", (USER, REGNO, "pass"), True),
+    ("add_candidate", "add_candidate", ("Explain Candidate", POSITION), False),
+    ("get_candidates(position)", "get_candidates", (POSITION,), True),
+    ("get_candidates()", "get_candidates", (), False),
+    # Manage Candidates pages (the next page after (sort value, id))
+    ("get_candidates_page(id)", "get_candidates_page", ("id", False, None, ("", 0)), True),
+    ("get_candidates_page(name)", "get_candidates_page", ("name", False, None, ("a", 0)), True),
+    ("get_candidates_page(position, desc)", "get_candidates_page",
+     ("position", True, None, ("z", 0)), True),
+    # Votes live in tallies, so this one sorts; it is one page of candidates
+    ("get_candidates_page(votes)", "get_candidates_page", ("votes", True), False),
+    ("get_candidates_page(search)", "get_candidates_page", ("id", False, "explain"), False),
+    ("get_candidate_by_id", "get_candidate_by_id", (_candidate,), True),
+    ("update_candidate", "update_candidate",
+     (_candidate, "Explain Candidate", POSITION, None, None), True),
+    ("get_ballot", "get_ballot", (), True),
+    ("get_vote_counts", "get_vote_counts", (), True),
+    ("cast_ballot", "cast_ballot", (REGNO, _selections), True),
+    ("voters: catch up", _voters_catch_up, (_last_student,), True),
+    ("mark_student_voted", "mark_student_voted", ("EXPLAIN-0002",), True),
+    ("get_turnout", "get_turnout", (), True),
+    ("backfill_thumbnails", "backfill_thumbnails", (), False),
+    ("set_voting_duration", "set_voting_duration",
+     ("2025-01-01 08:00:00", "2025-01-01 17:00:00"), False),
+    # voting_settings only ever holds one row; the reverse rowid walk stops
+    # after it.
+    ("get_voting_duration", "get_voting_duration", (), False),
+    ("get_all_positions", "get_all_positions", (), False),
+    ("get_poll_status", "get_poll_status", (), True),
+    ("get_tallies", "get_tallies", (), True),
+    ("get_current_epoch", "get_current_epoch", (), True),
+    ("get_elections", "get_elections", (), False),
+    ("register_admin", "register_admin", ("explain_admin", "pass"), False),
+    ("verify_admin", "verify_admin", ("explain_admin", "pass"), True),
+    ("update_admin_password", "update_admin_password", ("explain_admin", "new"), True),
+    ("reset_votes", "reset_votes", (), False),
+    ("prune_history", "prune_history", (1,), True),
+    ("delete_candidate", "delete_candidate", (_candidate,), True),
+    ("delete_position", "delete_position", (POSITION,), True),
+]
+
+# Statements that have no query plan worth checking
+_SKIP = re.compile(r"^\s*(--|BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE|PRAGMA|"
+                   r"CREATE|DROP|ALTER|ANALYZE|VACUUM)", re.IGNORECASE)
+# Statements are traced with their values filled in; these shapes collapse
+# repeats of one statement (executemany, per-row triggers) into one entry.
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+# "SCAN students" is a full table scan; "SCAN t USING COVERING INDEX ..." is
+# an in-order index walk, which is fine for queries that return every row.
+_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+_TEMP_SORT = re.compile(r"USE TEMP B-TREE")
+
+
+def traced_statements(db, call, args):
+    """Run one call and return the distinct statements it executed."""
+    if isinstance(call, str):
+        call = getattr(db, call)
+    else:
+        call = call.__get__(db)
+    args = [arg(db) if callable(arg) else arg for arg in args]
+
+    seen, statements = set(), []
+
+    def record(sql):
+        sql = " ".join(sql.split())
+        shape = _LITERAL.sub("?", sql)
+        if not _SKIP.match(sql) and shape not in seen:
+            seen.add(shape)
+            statements.append(sql)
+
+    db.conn.set_trace_callback(record)
+    try:
+        call(*args)
+    finally:
+        db.conn.set_trace_callback(None)
+    return statements
+
+
+def query_plan(conn, sql, params=()):
+    """Return the plan as a list of (depth, detail) rows."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    depth = {0: -1}
+    plan = []
+    for node_id, parent, _unused, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        plan.append((depth[node_id], detail))
+    return plan
+
+
+def plan_problems(plan):
+    problems = []
+    for _depth, detail in plan:
+        if _FULL_SCAN.match(detail):
+            problems.append(f"full table scan: {detail}")
+        elif _TEMP_SORT.search(detail):
+            problems.append(f"temporary sort: {detail}")
+    return problems
+
+
+def scratch_copy(source, target):
+    """Copy a live database file (WAL included) for the calls to write to."""
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+def explain(db_path):
+    """Run CALLS against db_path; return [(name, hot, [(sql, plan, problems)])]."""
+    db = DatabaseManager(db_path)
+    results = []
+    try:
+        for name, call, args, hot in CALLS:
+            statements = []
+            for sql in traced_statements(db, call, args):
+                plan = query_plan(db.conn, sql)
+                statements.append((sql, plan, plan_problems(plan) if hot else []))
+            results.append((name, hot, statements))
+    finally:
+        db.close_all()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db",
+                        help="database file to inspect; the calls run on a copy "
+                             "(default: a fresh scratch database)")
+    parser.add_argument("--check", action="store_true",
+                        help="exit with status 1 if any hot query scans a table")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scratch = os.path.join(tmp, "explain.db")
+        if args.db:
+            scratch_copy(args.db, scratch)
+        results = explain(scratch)
+
+    failures = []
+    for name, hot, statements in results:
+        marker = "HOT " if hot else "    "
+        print(f"{marker}{name}")
+        for sql, plan, problems in statements:
+            print(f"      {sql}")
+            for depth, detail in plan:
+                print(f"      {'   ' * depth}`--{detail}")
+            for problem in problems:
+                print(f"      !! {problem}")
+                failures.append((name, problem))
+        print()
+
+    if failures:
+        print(f"{len(failures)} hot query plan problem(s) found.")
+        if args.check:
+            return 1
+    else:
+        print("All hot queries are served by indexes.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+# image_loader.py
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import ImageTk
+
+from thumbnails import load_thumbnail
+
+
+class ImageLoader:
+    """Decode candidate images on worker threads and hand them to the Tk thread.
+
+    Workers only touch PIL. Finished images go through a queue that the Tk
+    thread drains with after(), so every widget update happens on the Tk
+    thread. Cards can show their placeholder straight away and swap in the
+    real picture when it arrives. The most recently shown PhotoImages are
+    kept (up to max_photos) so recycled rows do not decode them again.
+    """
+
+    def __init__(self, widget, workers=4, poll_ms=30, max_photos=256):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self.max_photos = max_photos
+        self._photos = OrderedDict()   # path -> PhotoImage, or None if unreadable
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="uvs-images")
+        self._results = queue.SimpleQueue()
+        self._pending = 0
+        self._poll_id = None
+        self._generation = 0
+        self._idle_callbacks = []
+
+    def load(self, path, callback):
+        """Decode `path` in the background, then call callback(img_or_None) on the Tk thread."""
+        self._submit(path, callback, self._generation)
+
+    def _submit(self, path, callback, generation):
+        future = self._pool.submit(load_thumbnail, path)
+        future.add_done_callback(
+            lambda f: self._results.put((generation, callback, f))
+        )
+        self._pending += 1
+        self._schedule()
+
+    def load_into(self, label, path, master=None, on_missing=None):
+        """Show the image at `path` on `label` once decoded.
+
+        If the label is re-used for another path before this one arrives
+        (recycled list rows), the late image is dropped.
+        """
+        label.image_request = path
+
+        def show(photo):
+            if photo is None:
+                if on_missing is not None:
+                    on_missing()
+                return
+            label.config(image=photo)
+            label.image = photo
+
+        if path in self._photos:
+            self._photos.move_to_end(path)
+            show(self._photos[path])
+            return
+
+        def apply(img):
+            if not label.winfo_exists() or getattr(label, "image_request", None) != path:
+                return
+            photo = ImageTk.PhotoImage(img, master=master) if img is not None else None
+            self._remember(path, photo)
+            show(photo)
+
+        self.load(path, apply)
+
+    def _remember(self, path, photo):
+        self._photos[path] = photo
+        self._photos.move_to_end(path)
+        while len(self._photos) > self.max_photos:
+            self._photos.popitem(last=False)
+
+    def preload(self, paths, master=None):
+        """Decode `paths` into the photo cache ahead of time.
+
+        Unlike load(), these survive cancel_all(), so a screen can be warmed
+        up before it is shown and pick the pictures up without waiting.
+        """
+        for path in list(dict.fromkeys(paths))[:self.max_photos]:
+            if path in self._photos:
+                continue
+
+            def keep(img, path=path):
+                if path not in self._photos:
+                    photo = ImageTk.PhotoImage(img, master=master) if img is not None else None
+                    self._remember(path, photo)
+
+            self._submit(path, keep, None)
+
+    def when_idle(self, callback):
+        """Call callback() on the Tk thread once nothing is left to decode.
+
+        Checked from the next poll on, so rows laid out just after the
+        screen is built have had the chance to request their images.
+        """
+        self._idle_callbacks.append(callback)
+        self._schedule()
+
+    def cancel_all(self):
+        """Drop callbacks for everything requested so far (e.g. on screen change)."""
+        self._generation += 1
+
+    def shutdown(self):
+        self.cancel_all()
+        self._photos.clear()
+        self._idle_callbacks = []
+        if self._poll_id is not None:
+            try:
+                self.widget.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule(self):
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.poll_ms, self._drain)
+
+    def _drain(self):
+        self._poll_id = None
+        while True:
+            try:
+                generation, callback, future = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if future.cancelled() or generation not in (None, self._generation):
+                continue
+            try:
+                img = future.result()
+            except Exception:
+                img = None
+            callback(img)
+
+        if self._pending > 0:
+            self._schedule()
+        elif self._idle_callbacks:
+            callbacks, self._idle_callbacks = self._idle_callbacks, []
+            for callback in callbacks:
+                callback()
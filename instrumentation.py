@@ -0,0 +1,322 @@
+# instrumentation.py
+"""Optional timing of every DatabaseManager method and SQL statement.
+
+Off unless UVS_INSTRUMENT is set before the app starts:
+
+    UVS_INSTRUMENT=1 python main.py                    # writes uvs_metrics.json on exit
+    UVS_INSTRUMENT=metrics.prom python vote_service.py # Prometheus text instead
+
+When it is off nothing is wrapped, so the vote path runs exactly the code it
+always has. When it is on, every call costs two perf_counter() reads, a
+thread-local lookup of this thread's tables and a dict update plus a bisect
+into the histogram; SQL statements also pay a cached name lookup, and
+fetches a row-count update. No lock is taken except the first time a thread
+records. Metrics are available in-process through snapshot(), written on
+demand with dump(), and written once more at exit.
+"""
+import atexit
+import bisect
+import functools
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+
+INSTRUMENT_ENV = "UVS_INSTRUMENT"
+DEFAULT_OUTPUT = "uvs_metrics.json"
+
+# Latency histogram bucket upper bounds, in seconds
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+           0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_setting = os.environ.get(INSTRUMENT_ENV, "").strip()
+ENABLED = _setting.lower() not in ("", "0", "false", "no", "off")
+OUTPUT = (DEFAULT_OUTPUT if _setting.lower() in ("1", "true", "yes", "on") else _setting) if ENABLED else None
+
+
+class Stat:
+    """Counters and a latency histogram for one method or statement."""
+
+    __slots__ = ("count", "errors", "busy", "rows", "total", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.busy = 0
+        self.rows = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)   # the last one is +Inf
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "busy": self.busy,
+            "rows": self.rows,
+            "seconds_total": self.total,
+            "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], self.buckets)),
+        }
+
+
+class Metrics:
+    """Process-wide store behind the wrapped methods and connections.
+
+    Each thread records into its own tables, so the hot path takes no lock;
+    snapshot() adds the threads' tables together.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = []
+
+    def shard(self):
+        """This thread's (methods, statements) tables."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = ({}, {})
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def record(self, table, name, seconds, error=None):
+        stat = table.get(name)
+        if stat is None:
+            stat = table[name] = Stat()
+        stat.count += 1
+        stat.total += seconds
+        stat.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        if error is not None:
+            stat.errors += 1
+            if isinstance(error, sqlite3.OperationalError) and _is_busy(error):
+                stat.busy += 1
+
+    def add_rows(self, name, rows):
+        statements = self.shard()[1]
+        stat = statements.get(name)
+        if stat is None:
+            stat = statements[name] = Stat()
+        stat.rows += rows
+
+    def reset(self):
+        with self._lock:
+            for methods, statements in self._shards:
+                methods.clear()
+                statements.clear()
+
+    def snapshot(self):
+        totals = ({}, {})
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for table, total in zip(shard, totals):
+                for name, stat in list(table.items()):
+                    merged = total.get(name)
+                    if merged is None:
+                        merged = total[name] = Stat()
+                    merged.count += stat.count
+                    merged.errors += stat.errors
+                    merged.busy += stat.busy
+                    merged.rows += stat.rows
+                    merged.total += stat.total
+                    merged.buckets = [a + b for a, b in zip(merged.buckets, stat.buckets)]
+        return {
+            "methods": {k: v.as_dict() for k, v in totals[0].items()},
+            "statements": {k: v.as_dict() for k, v in totals[1].items()},
+        }
+
+
+metrics = Metrics()
+_names = {}
+
+
+def _is_busy(error):
+    text = str(error).lower()
+    return "locked" in text or "busy" in text
+
+
+def statement_name(sql):
+    """Collapse whitespace and IN (?,?,...) lists so one query is one metric."""
+    name = _names.get(sql)
+    if name is None:
+        text = " ".join(str(sql).split())
+        text = re.sub(r"\(\?(?:\s*,\s*\?)+\)", "(?,...)", text)
+        name = text[:200]
+        if len(_names) < 10000:
+            _names[sql] = name
+    return name
+
+
+# ---------- SQL ----------
+class InstrumentedCursor(sqlite3.Cursor):
+    _statement = None
+
+    def execute(self, sql, parameters=()):
+        return self._timed(sql, super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._timed(sql, super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self._timed(sql_script, super().executescript, sql_script)
+
+    def _timed(self, sql, run, *args):
+        name = self._statement = statement_name(sql)
+        start = time.perf_counter()
+        try:
+            run(*args)
+        except Exception as exc:
+            metrics.record(metrics.shard()[1], name, time.perf_counter() - start, exc)
+            raise
+        metrics.record(metrics.shard()[1], name, time.perf_counter() - start)
+        return self
+
+    def _rows(self, rows):
+        if self._statement is not None and rows:
+            metrics.add_rows(self._statement, rows)
+
+    def fetchone(self):
+        row = super().fetchone()
+        self._rows(row is not None)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = super().fetchmany(*args, **kwargs)
+        self._rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self._rows(len(rows))
+        return rows
+
+    def __next__(self):
+        row = super().__next__()
+        self._rows(1)
+        return row
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def commit(self):
+        _timed_statement("COMMIT", super().commit)
+
+    def rollback(self):
+        _timed_statement("ROLLBACK", super().rollback)
+
+
+def _timed_statement(name, run):
+    start = time.perf_counter()
+    try:
+        run()
+    except Exception as exc:
+        metrics.record(metrics.shard()[1], name, time.perf_counter() - start, exc)
+        raise
+    metrics.record(metrics.shard()[1], name, time.perf_counter() - start)
+
+
+def connection_factory():
+    """The sqlite3.connect(factory=...) to use: plain connections unless enabled."""
+    return InstrumentedConnection if ENABLED else sqlite3.Connection
+
+
+# ---------- methods ----------
+def instrument_class(cls):
+    """Time every public method of cls (in place) when instrumentation is on."""
+    if not ENABLED:
+        return cls
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not callable(attr) or isinstance(attr, (staticmethod, classmethod)):
+            continue
+        setattr(cls, name, _timed_method(name, attr))
+    return cls
+
+
+def _timed_method(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as exc:
+            metrics.record(metrics.shard()[0], name, time.perf_counter() - start, exc)
+            raise
+        metrics.record(metrics.shard()[0], name, time.perf_counter() - start)
+        return result
+    return wrapper
+
+
+# ---------- output ----------
+def snapshot():
+    return metrics.snapshot()
+
+
+def dump(path=None):
+    """Write the metrics to path (default: the UVS_INSTRUMENT file) and return the path.
+
+    A .prom or .txt path gets Prometheus text format, anything else JSON.
+    """
+    path = path or OUTPUT or DEFAULT_OUTPUT
+    data = snapshot()
+    if path.endswith((".prom", ".txt")):
+        text = prometheus_text(data)
+    else:
+        text = json.dumps(data, indent=2, sort_keys=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+    return path
+
+
+def prometheus_text(data=None):
+    data = data or snapshot()
+    lines = []
+    for kind, label in (("method", "methods"), ("sql", "statements")):
+        stats = data[label]
+        metric = f"uvs_{kind}_seconds"
+        lines.append(f"# HELP {metric} Latency of DatabaseManager {label}.")
+        lines.append(f"# TYPE {metric} histogram")
+        for name, stat in sorted(stats.items()):
+            labels = f'{kind}="{_escape(name)}"'
+            cumulative = 0
+            for bound, count in stat["buckets"].items():
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{metric}_sum{{{labels}}} {stat['seconds_total']:.9f}")
+            lines.append(f"{metric}_count{{{labels}}} {stat['count']}")
+        for counter, key, help_text in (
+            ("errors", "errors", "Calls that raised."),
+            ("busy", "busy", "Calls that failed with SQLITE_BUSY/LOCKED after the busy timeout."),
+            ("rows", "rows", "Rows fetched."),
+        ):
+            if kind == "method" and key == "rows":
+                continue
+            name_ = f"uvs_{kind}_{counter}_total"
+            lines.append(f"# HELP {name_} {help_text}")
+            lines.append(f"# TYPE {name_} counter")
+            for name, stat in sorted(stats.items()):
+                lines.append(f'{name_}{{{kind}="{_escape(name)}"}} {stat[key]}')
+    return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+if ENABLED:
+    atexit.register(dump)
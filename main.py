@@ -1,33 +1,70 @@
 # main.py
+import os
+import time
 import tkinter as tk
 from tkinter import messagebox
 
-from utils import THEME_RED, THEME_WHITE, center_window
+from utils import THEME_RED, THEME_WHITE, center_window, configure_window
 from admin_panel import AdminPanel
 from student_panel import StudentPanel
-from database import DatabaseManager
+from remote_database import open_database
+from router import ScreenRouter
+import tracing
 
 # Secret reset key for admin forgotten-password
 MASTER_RESET_KEY = "UTAMU-RESET-2025"  
 
+# Set on a shared polling laptop: the ballot is built once and reused
+KIOSK_ENV = "UVS_KIOSK"
+KIOSK = os.environ.get(KIOSK_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
 
 class MainWindow:
+    """The application: one Tk root whose router swaps between the login,
+    student and admin views. Logging out is a view switch back to login."""
+
     def __init__(self):
-        self.db = DatabaseManager()
-        self.student_panel = StudentPanel()
+        self.db = open_database()
         self.root = None
+        self.router = None
+        self.student_panel = None
+        self.admin_panel = None
         self.username_entry = None
         self.password_entry = None
 
     def run(self):
+        self.start()
+        try:
+            self.root.mainloop()
+        finally:
+            self.router.close()
+            self.db.close_all()
+
+    def start(self):
+        """Create the root window and show the login view."""
         self.root = tk.Tk()
-        self.root.title("Login")
-        center_window(self.root, 480, 420)
         self.root.configure(bg=THEME_WHITE)
-        self.root.resizable(False, False)
-
+        self.router = ScreenRouter(self.root)
+        self.student_panel = StudentPanel(root=self.root, db=self.db,
+                                          on_logout=self.show_login, kiosk=KIOSK)
+        self.admin_panel = AdminPanel(db=self.db, root=self.root, on_logout=self.show_login)
+        self.router.add("login", self)
+        self.router.add("student", self.student_panel)
+        self.router.add("admin", self.admin_panel)
+        self.show_login()
+
+        # One-off: create thumbnails for candidates registered before they
+        # existed, so the ballot never has to shrink full-size photos. It
+        # decodes every original, so it runs off the Tk thread.
+        self.db.backfill_thumbnails_in_background()
+
+    def show_login(self):
+        self.router.show("login")
+
+    # ----------------- LOGIN VIEW -----------------
+    def mount(self, parent):
         frame = tk.Frame(
-            self.root,
+            parent,
             bg=THEME_WHITE,
             highlightbackground=THEME_RED,
             highlightthickness=2,
@@ -99,10 +136,28 @@ class MainWindow:
             fg="gray",
         ).pack(side="bottom", pady=2)
 
-        self.root.mainloop()
+    def enter(self):
+        configure_window(self.root, "Login", 480, 420, resizable=False)
+        # The last user's password must not be left in the form
+        self.password_entry.delete(0, tk.END)
+        self.username_entry.delete(0, tk.END)
+        self.username_entry.focus_set()
+        if KIOSK:
+            # Build the next voter's ballot while they type their password
+            self.root.after_idle(self._prewarm_ballot)
+
+    def _prewarm_ballot(self):
+        if self.router.current != "login":
+            return
+        self.router.mount("student")
+        self.student_panel.prewarm()
+
+    def leave(self):
+        pass
 
     # ----------------- LOGIN LOGIC -----------------
     def _attempt_login(self):
+        started = time.perf_counter()
         username = self.username_entry.get().strip()
         password = self.password_entry.get().strip()
 
@@ -119,14 +174,14 @@ class MainWindow:
                 return
 
             # Otherwise proceed to admin dashboard
-            self.root.withdraw()
             self.show_dashboard()
             return
 
         # 2️⃣ Otherwise check Student
         student = self.db.verify_student(username, password)
         if student:
-            self.root.withdraw()
+            tracing.begin()
+            tracing.record("login", started)
             # student[3] is regno (from your original code)
             self.show_voting_window(student[3])
             return
@@ -202,7 +257,6 @@ class MainWindow:
 
             win.destroy()
             # After changing, go straight to admin dashboard
-            self.root.withdraw()
             self.show_dashboard()
 
         tk.Button(
@@ -396,10 +450,10 @@ class MainWindow:
 
     # ----------------- OTHER HELPERS -----------------
     def show_voting_window(self, reg_no):
-        self.student_panel.show_voting_window(reg_no)
+        self.router.show("student", reg_no)
 
     def show_dashboard(self):
-        AdminPanel().show_dashboard()
+        self.router.show("admin")
 
     def show_registration(self):
         # delegate to student panel's registration UI
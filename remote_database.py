@@ -0,0 +1,162 @@
+# remote_database.py
+import http.client
+import json
+import os
+import sqlite3
+import threading
+from urllib.parse import urlsplit
+
+from database import AlreadyVotedError, BallotError, DatabaseManager
+from vote_service import READ_METHODS, SERIAL_METHODS, SERVICE_TOKEN_ENV, TOKEN_HEADER
+from voting_window import VotingWindow
+
+
+SERVICE_URL_ENV = "UVS_SERVICE_URL"
+
+ERROR_TYPES = {
+    "BallotError": BallotError,
+    "AlreadyVotedError": AlreadyVotedError,
+    "IntegrityError": sqlite3.IntegrityError,
+}
+
+
+class ServiceError(RuntimeError):
+    """The vote service could not be reached or failed to handle a request."""
+
+
+class RemoteDatabase:
+    """Stand-in for DatabaseManager that talks to a running vote_service.
+
+    Methods take the same arguments and return the same shapes (lists in
+    place of tuples), so the panels can use either. Each thread keeps one
+    keep-alive HTTP connection to the service.
+    """
+
+    def __init__(self, url, token=None, timeout=10):
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Vote service URL must look like http://host:port, got {url!r}")
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.token = token
+        self.timeout = timeout
+        self._local = threading.local()
+        self._window = None
+
+    # ---------- transport ----------
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _request(self, method, path, payload=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers[TOKEN_HEADER] = self.token
+
+        # One retry covers a keep-alive connection the service has dropped
+        # (e.g. after a restart). A repeated cast_ballot is refused by the
+        # voted-already check, so it can never count twice.
+        for attempt in (1, 2):
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = json.loads(response.read() or b"{}")
+                break
+            except (ConnectionResetError, BrokenPipeError) as exc:
+                self.close()
+                if attempt == 2:
+                    raise ServiceError(f"Vote service at {self.url} is unreachable: {exc}") from exc
+            except (http.client.HTTPException, OSError, ValueError) as exc:
+                self.close()
+                raise ServiceError(f"Vote service at {self.url} is unreachable: {exc}") from exc
+
+        if response.status == 200:
+            return data.get("result")
+        error = ERROR_TYPES.get(data.get("type"), ServiceError)
+        raise error(data.get("error") or f"Vote service returned HTTP {response.status}")
+
+    def _call(self, name, *args):
+        return self._request("POST", f"/api/{name}", {"args": list(args)})
+
+    def __getattr__(self, name):
+        if name in READ_METHODS or name in SERIAL_METHODS:
+            return lambda *args: self._call(name, *args)
+        raise AttributeError(name)
+
+    # ---------- endpoints with their own routes ----------
+    def get_ballot(self):
+        return tuple(
+            (position, tuple(tuple(c) for c in candidates))
+            for position, candidates in self._request("GET", "/ballot")
+        )
+
+    def cast_ballot(self, regno, selections):
+        self._request("POST", "/cast-ballot", {"regno": regno, "selections": selections})
+
+    def get_voting_duration(self):
+        duration = self._request("GET", "/duration")
+        if duration["start"] is None:
+            return None
+        return duration["start"], duration["end"]
+
+    def is_voting_open(self):
+        # Decided by the service's clock, so every terminal agrees
+        duration = self._request("GET", "/duration")
+        return duration["open"], duration["message"]
+
+    def voting_window(self):
+        # Countdowns run on this terminal's clock; the service still
+        # refuses ballots outside the window by its own.
+        if self._window is None or self._window.is_stale():
+            self._window = VotingWindow(self.get_voting_duration())
+        return self._window
+
+    def set_voting_duration(self, start_time, end_time):
+        self._call("set_voting_duration", start_time, end_time)
+        self._window = None
+
+    def get_vote_counts(self):
+        # JSON object keys are strings; callers look candidates up by int id
+        return {int(cid): votes for cid, votes in self._call("get_vote_counts").items()}
+
+    def get_results_version(self):
+        return tuple(self._call("get_results_version"))
+
+    def get_turnout(self):
+        return tuple(self._call("get_turnout"))
+
+    def backfill_thumbnails(self):
+        """The service makes thumbnails next to its own database at startup."""
+
+    def backfill_thumbnails_in_background(self):
+        """See backfill_thumbnails."""
+
+    def prune_history_in_background(self, keep=None):
+        """The service prunes old election rounds itself after each reset."""
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def close_all(self):
+        self.close()
+
+
+def open_database():
+    """The database the panels should use.
+
+    A RemoteDatabase when UVS_SERVICE_URL points at a vote_service,
+    otherwise the local voting_system.db file.
+    """
+    url = os.environ.get(SERVICE_URL_ENV)
+    if url:
+        return RemoteDatabase(url, token=os.environ.get(SERVICE_TOKEN_ENV))
+    return DatabaseManager()
@@ -0,0 +1,290 @@
+# roster_import.py
+"""Bulk-load students from the registrar's CSV or XLSX export.
+
+The file is read as a stream and inserted in chunks, one transaction per
+chunk, so a 30k-row roster never sits in memory at once. Rows that cannot
+be imported are reported with their line number instead of stopping the
+import. Students without a password in the file get a random one, written
+to a passwords CSV beside the roster for the admin to hand out.
+"""
+import csv
+import os
+import secrets
+import sqlite3
+import time
+from collections import namedtuple
+
+
+CHUNK_SIZE = 1000
+REQUIRED_COLUMNS = ("name", "username", "regno")
+
+# Header spellings seen in registrar exports, after _normalize()
+COLUMN_ALIASES = {
+    "name": ("name", "names", "full name", "student name"),
+    "username": ("username", "user name", "login"),
+    "regno": ("regno", "reg no", "registration number", "registration no", "student number"),
+    "password": ("password", "initial password"),
+}
+
+# Initial passwords: no look-alike characters (0/O, 1/l/I), as they are
+# read off a printout
+PASSWORD_ALPHABET = "abcdefghjkmnpqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+PASSWORD_LENGTH = 10
+
+ImportResult = namedtuple("ImportResult", "inserted rejected passwords_file")
+
+
+class RosterError(ValueError):
+    """The file cannot be imported at all (unreadable, or missing columns)."""
+
+
+def _normalize(header):
+    text = str(header or "").strip().lower().replace("_", " ").replace(".", " ")
+    return " ".join(text.split())
+
+
+def _column_map(headers):
+    """Map our field names to column indexes in the file's header row."""
+    positions = {}
+    normalized = [_normalize(h) for h in headers]
+    for field, aliases in COLUMN_ALIASES.items():
+        for index, header in enumerate(normalized):
+            if header in aliases:
+                positions[field] = index
+                break
+    missing = [f for f in REQUIRED_COLUMNS if f not in positions]
+    if missing:
+        raise RosterError(
+            "The file has no column for: " + ", ".join(missing)
+            + ". Expected headers like Name, Username, RegNo and (optionally) Password."
+        )
+    return positions
+
+
+# ---------- readers ----------
+def _decoded_lines(f, counter):
+    """Decode a binary file line by line, counting bytes read for progress."""
+    first = True
+    for raw in f:
+        counter[0] += len(raw)
+        try:
+            line = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            # Excel on Windows often saves CSV as cp1252
+            line = raw.decode("cp1252", errors="replace")
+        if first:
+            line = line.lstrip("\ufeff")
+            first = False
+        yield line
+
+
+def _iter_csv(path):
+    """Yield (line_no, cells, fraction_done) for each data row of a CSV file."""
+    size = os.path.getsize(path) or 1
+    counter = [0]
+    with open(path, "rb") as f:
+        reader = csv.reader(_decoded_lines(f, counter))
+        header = next(reader, None)
+        if header is None:
+            raise RosterError("The file is empty.")
+        yield 1, header, 0.0
+        for cells in reader:
+            yield reader.line_num, cells, counter[0] / size
+
+
+def _iter_xlsx(path):
+    """Yield (row_no, cells, fraction_done) for each row of the first worksheet."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RosterError("Reading .xlsx files needs openpyxl (pip install openpyxl), "
+                          "or save the sheet as CSV.")
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        total = sheet.max_row or 0
+        for row_no, cells in enumerate(sheet.iter_rows(values_only=True), start=1):
+            cells = ["" if c is None else str(c) for c in cells]
+            yield row_no, cells, (row_no / total if total else 0.0)
+    finally:
+        workbook.close()
+
+
+def iter_roster(path):
+    """Yield (line_no, student_dict_or_None, error, fraction_done) for every data row."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xlsm"):
+        rows = _iter_xlsx(path)
+    elif ext in (".csv", ".txt"):
+        rows = _iter_csv(path)
+    else:
+        raise RosterError(f"Unsupported file type '{ext}'. Use .csv or .xlsx.")
+
+    columns = None
+    for line_no, cells, fraction in rows:
+        if columns is None:
+            columns = _column_map(cells)
+            continue
+        if not any(str(c).strip() for c in cells):
+            continue  # blank line
+
+        student = {}
+        for field, index in columns.items():
+            student[field] = cells[index].strip() if index < len(cells) else ""
+        missing = [f for f in REQUIRED_COLUMNS if not student[f]]
+        if missing:
+            yield line_no, None, "missing " + ", ".join(missing), fraction
+            continue
+        # Never default to the reg. number: it is printed on ID cards and
+        # is what the reset-password screen asks for.
+        if not student.get("password"):
+            student["password"] = generate_password()
+            student["generated"] = True
+        yield line_no, student, None, fraction
+
+    if columns is None:
+        raise RosterError("The file is empty.")
+
+
+def generate_password(length=PASSWORD_LENGTH):
+    return "".join(secrets.choice(PASSWORD_ALPHABET) for _ in range(length))
+
+
+def passwords_path_for(path):
+    """Where the generated passwords of an import of `path` are written."""
+    stem = os.path.splitext(path)[0]
+    return f"{stem}_passwords_{time.strftime('%Y%m%d-%H%M%S')}.csv"
+
+
+class _PasswordsFile:
+    """The passwords CSV, created (readable by the owner only) on first use."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._writer = None
+
+    @property
+    def used(self):
+        return self._file is not None
+
+    def prepare(self, students):
+        """Create the file if any of `students` needs it, before they are
+        inserted: a file that cannot be written must stop the import."""
+        if not self.used and any(s.get("generated") for s in students):
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            self._file = open(fd, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(("Name", "Username", "RegNo", "Password"))
+
+    def write(self, students):
+        for s in students:
+            if s.get("generated"):
+                self._writer.writerow((s["name"], s["username"], s["regno"], s["password"]))
+        if self.used:
+            self._file.flush()
+
+    def close(self):
+        if self.used:
+            self._file.close()
+
+
+# ---------- import ----------
+def import_roster(db, path, chunk_size=CHUNK_SIZE, progress=None, cancelled=None,
+                  passwords_path=None):
+    """Import students from `path` into `db` and return an ImportResult.
+
+    `rejected` is a list of (line_no, reason). `passwords_file` is the CSV
+    of generated passwords (passwords_path, or one beside the roster), or
+    None if every row brought its own. progress(fraction, inserted,
+    rejected_count) is called after every chunk; cancelled() is checked
+    between chunks. Chunks already committed stay imported.
+    """
+    inserted = 0
+    rejected = []
+    seen_usernames = set()
+    seen_regnos = set()
+    chunk = []
+    passwords = _PasswordsFile(passwords_path or passwords_path_for(path))
+
+    def flush(fraction):
+        nonlocal inserted
+        if chunk:
+            passwords.prepare(s for _, s in chunk)
+            students = _insert_chunk(db, chunk, rejected)
+            # Written as each chunk commits, so a stopped or failed import
+            # still leaves the passwords of everyone it registered
+            passwords.write(students)
+            inserted += len(students)
+            chunk.clear()
+        if progress is not None:
+            progress(fraction, inserted, len(rejected))
+
+    fraction = 0.0
+    try:
+        for line_no, student, error, fraction in iter_roster(path):
+            if error:
+                rejected.append((line_no, error))
+                continue
+            username, regno = student["username"], student["regno"]
+            if username in seen_usernames:
+                rejected.append((line_no, f"username '{username}' appears earlier in the file"))
+                continue
+            if regno in seen_regnos:
+                rejected.append((line_no, f"reg. number '{regno}' appears earlier in the file"))
+                continue
+            seen_usernames.add(username)
+            seen_regnos.add(regno)
+            chunk.append((line_no, student))
+
+            if len(chunk) >= chunk_size:
+                flush(fraction)
+                if cancelled is not None and cancelled():
+                    break
+        else:
+            flush(1.0)
+    finally:
+        passwords.close()
+
+    rejected.sort()
+    return ImportResult(inserted, rejected, passwords.path if passwords.used else None)
+
+
+def _insert_chunk(db, chunk, rejected):
+    """Insert one chunk, rejecting rows that clash with students already registered.
+
+    Returns the student dicts that were inserted.
+    """
+    usernames, regnos = db.find_existing_students(
+        [s["username"] for _, s in chunk], [s["regno"] for _, s in chunk]
+    )
+    usernames, regnos = set(usernames), set(regnos)
+
+    rows = []
+    for line_no, s in chunk:
+        if s["username"] in usernames:
+            rejected.append((line_no, f"username '{s['username']}' is already registered"))
+        elif s["regno"] in regnos:
+            rejected.append((line_no, f"reg. number '{s['regno']}' is already registered"))
+        else:
+            rows.append((line_no, s))
+    if not rows:
+        return []
+
+    def values(s):
+        return s["name"], s["username"], s["regno"], s["password"]
+
+    try:
+        db.register_students([values(s) for _, s in rows])
+        return [s for _, s in rows]
+    except sqlite3.IntegrityError:
+        # Someone registered one of these students since the check above;
+        # fall back to row-by-row so only the clashing rows are rejected.
+        inserted = []
+        for line_no, s in rows:
+            try:
+                db.register_students([values(s)])
+                inserted.append(s)
+            except sqlite3.IntegrityError as exc:
+                rejected.append((line_no, str(exc)))
+        return inserted
@@ -0,0 +1,52 @@
+# router.py
+import tkinter as tk
+
+from utils import THEME_WHITE
+
+
+class ScreenRouter:
+    """Switch the one Tk root between whole views (login, student, admin).
+
+    A view builds its widgets once, in mount(frame), and is then shown with
+    enter(*args) and hidden with leave(). Hidden views keep their frame, so
+    logging out and back in is the same small amount of work every time:
+    no new Tk interpreter, no nested mainloop, no pile of old windows.
+    Views may also define close(), called once on shutdown.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.current = None
+        self._views = {}
+        self._frames = {}
+
+    def add(self, name, view):
+        self._views[name] = view
+
+    def mount(self, name):
+        """Build view `name` without showing it; returns its frame."""
+        frame = self._frames.get(name)
+        if frame is None:
+            frame = self._frames[name] = tk.Frame(self.root, bg=THEME_WHITE)
+            self._views[name].mount(frame)
+        return frame
+
+    def show(self, name, *args):
+        """Hide the current view and enter `name` (mounting it the first time)."""
+        view = self._views[name]
+        if self.current is not None:
+            previous = self._views[self.current]
+            previous.leave()
+            self._frames[self.current].pack_forget()
+
+        frame = self.mount(name)
+        frame.pack(fill="both", expand=True)
+        self.current = name
+        view.enter(*args)
+
+    def close(self):
+        """On shutdown: let every mounted view release its threads."""
+        for name in self._frames:
+            close = getattr(self._views[name], "close", None)
+            if close is not None:
+                close()
@@ -1,18 +1,57 @@
 # student_panel.py
+import time
 import tkinter as tk
 from tkinter import messagebox
-from database import DatabaseManager
-from utils import THEME_RED, THEME_WHITE, center_window
+from database import AlreadyVotedError, BallotError
+from remote_database import open_database
+from utils import THEME_RED, THEME_WHITE, center_window, configure_window
+from clock import ClockService
+from image_loader import ImageLoader
+from virtual_list import VirtualList
+from thumbnails import THUMB_SIZE
+import tracing
 from PIL import Image, ImageTk
-import os
+
+
+class BallotView:
+    """A built ballot screen and the per-voter state it shows."""
+
+    def __init__(self, frame, key, selections, candidate_list, countdown, placeholder):
+        self.frame = frame
+        self.key = key
+        self.selections = selections
+        self.candidate_list = candidate_list
+        self.countdown = countdown
+        self.placeholder = placeholder
+
+    def reset(self):
+        """Clear every choice and redraw the ☐ marks, back at the top of the list."""
+        for var in self.selections.values():
+            var.set(0)
+        # Picture loads may have been cancelled while the ballot was hidden;
+        # forget what each card showed so the rebind asks again (a cache hit
+        # once prewarm has decoded them).
+        for row in self.candidate_list.row_widgets():
+            row.bound_cid = None
+        self.candidate_list.scroll_to_top()
+        self.candidate_list.rebind_visible()
 
 
 class StudentPanel:
-    def __init__(self, root=None):
-        self.db = DatabaseManager()
+    """The student view: built once by the router, then entered per voter."""
+
+    def __init__(self, root=None, db=None, on_logout=None, kiosk=False):
+        self.db = db if db is not None else open_database()
         self._photo_cache = []  # prevent garbage collection of PhotoImage
         self.root = root
+        self.on_logout = on_logout
+        # Kiosk: one ballot built per election and reset for each voter
+        self.kiosk = kiosk
+        self._kiosk_view = None
+        self.reg_no = None
         self.content_frame = None
+        self._image_loader = None
+        self._clock = None
 
     # ---------- REGISTRATION ----------
     def show_registration(self):
@@ -104,19 +143,13 @@ class StudentPanel:
             messagebox.showerror("Database Error", str(e))
 
     # ---------- VOTING WINDOW ----------
-    def show_voting_window(self, reg_no):
-        parent = self.root if self.root is not None else None
-        win = tk.Toplevel(parent)
-        win.title("Vote Dashboard")
-        center_window(win, 890, 650)
-        win.configure(bg=THEME_WHITE)
-
-        # allow resizing
-        win.resizable(True, True)
-        self.current_window = win
+    def mount(self, parent):
+        """Build the sidebar and content area once; enter() shows them per voter."""
+        self._image_loader = ImageLoader(parent)
+        self._clock = ClockService(parent)
 
         # Main layout container (grid, responsive)
-        main = tk.Frame(win, bg=THEME_WHITE)
+        main = tk.Frame(parent, bg=THEME_WHITE)
         main.pack(fill="both", expand=True)
 
         # Configure grid so right side grows
@@ -146,9 +179,9 @@ class StudentPanel:
         btn_container.grid(row=1, column=0, sticky="n", padx=10, pady=10)
 
         actions = [
-            ("Vote", lambda: self._display_vote_screen(reg_no)),
+            ("Vote", lambda: self._display_vote_screen(self.reg_no)),
             ("Poll Status", self._display_poll_status_screen),
-            ("Log Out", lambda: self._go_back(win)),
+            ("Log Out", self._go_back),
         ]
 
         for text, cmd in actions:
@@ -169,15 +202,40 @@ class StudentPanel:
         self.content_frame.rowconfigure(0, weight=1)
         self.content_frame.columnconfigure(0, weight=1)
 
+    def enter(self, reg_no):
+        started = time.perf_counter()
+        self.reg_no = reg_no
+        configure_window(self.content_frame.winfo_toplevel(), "Vote Dashboard", 890, 650)
+        tracing.record("voting_window", started)
+
         # Show Vote screen by default
         self._display_vote_screen(reg_no)
 
+    def leave(self):
+        """Stop this voter's timers and drop their screen before the next login."""
+        tracing.end()
+        self.reg_no = None
+        self._clear_content()
+        if self._kiosk_view is not None:
+            self._kiosk_view.reset()  # nothing of this voter's choices survives
+        self._photo_cache.clear()
+
+    def close(self):
+        """On shutdown: stop the picture-decoding threads."""
+        self._image_loader.shutdown()
+
     # ---------- INTERNAL: refresh content ----------
-    def display_content(self, builder_func):
+    def display_content(self, builder_func, stage=None):
+        """Replace the content area with builder_func's screen.
+
+        With a stage name the build is traced up to the first idle moment
+        after it, i.e. until Tk has drawn the new screen.
+        """
         if self.content_frame is None:
             return
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        started = time.perf_counter()
+        trace = tracing.current()
+        self._clear_content()
 
         # Wrap builder in a root frame that expands
         root_inner = tk.Frame(self.content_frame, bg=THEME_WHITE)
@@ -186,77 +244,70 @@ class StudentPanel:
         self.content_frame.columnconfigure(0, weight=1)
 
         builder_func(root_inner)
+        if stage and trace:
+            root_inner.after_idle(lambda: tracing.record(stage, started, trace))
+
+    def _clear_content(self):
+        """Drop the current screen; the kiosk ballot is only hidden."""
+        if self._image_loader is not None:
+            self._image_loader.cancel_all()
+        if self._clock is not None:
+            self._clock.clear()  # stop the previous screen's countdown
+        kiosk_frame = self._kiosk_view.frame if self._kiosk_view is not None else None
+        for widget in self.content_frame.winfo_children():
+            if widget is kiosk_frame:
+                widget.grid_remove()
+            else:
+                widget.destroy()
+
+    # ---------- COUNTDOWN ----------
+    def _start_countdown(self, countdown_label, window, frame):
+        """Tick countdown_label down to the end of the voting window on the shared clock."""
+        # Convert the wall-clock end time to a monotonic deadline once, so
+        # later system clock changes cannot make the countdown jump.
+        deadline = time.monotonic() + window.remaining()
+        last_text = [None]
+
+        def update_countdown(now):
+            remaining = int(deadline - now)
+
+            if remaining <= 0:
+                countdown_label.config(text="Voting period has ended.", fg="red")
+                # disable all buttons if time expires
+                for widget in frame.winfo_children():
+                    if isinstance(widget, tk.Button):
+                        widget.config(state="disabled", text="Voting Closed")
+                return False
+
+            hours, remainder = divmod(remaining, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            text = f"Voting ends in: {hours:02d}h {minutes:02d}m {seconds:02d}s"
+            if text != last_text[0]:
+                last_text[0] = text
+                countdown_label.config(
+                    text=text,
+                    fg="#008000" if hours > 0 or minutes > 5 else "orange",
+                )
+            return True
+
+        self._clock.subscribe(update_countdown)
 
     # ---------- VOTE SCREEN ----------
     def _display_vote_screen(self, reg_no):
-        is_open, msg = self.db.is_voting_open()
+        window = self.db.voting_window()
+        is_open, msg = window.status()
         if not is_open:
             messagebox.showwarning("Voting Unavailable", msg)
             return
 
-        def build(frame):
-            # layout config
-            frame.rowconfigure(3, weight=1)   # scrollable list row
-            frame.columnconfigure(0, weight=1)
-
-            # ---------- TITLE (CENTERED) ----------
-            tk.Label(
-                frame,
-                text="CAST YOUR VOTE",
-                font=("Segoe UI", 18, "bold"),
-                bg=THEME_WHITE,
-                fg=THEME_RED,
-            ).grid(row=0, column=0, pady=10)   # no sticky, so it centers
-
-            # ---------- COUNTDOWN (CENTERED) ----------
-            from datetime import datetime
-            duration = self.db.get_voting_duration()
-            if not duration:
-                tk.Label(
-                    frame,
-                    text="Voting period not set.",
-                    bg=THEME_WHITE,
-                    fg="red",
-                ).grid(row=1, column=0, pady=5)
-                return
-
-            start_str, end_str = duration
-            end_time = datetime.fromisoformat(end_str)
-
-            countdown_label = tk.Label(
-                frame,
-                text="Calculating remaining time...",
-                bg=THEME_WHITE,
-                fg="#333",
-                font=("Arial", 11, "bold"),
-            )
-            countdown_label.grid(row=1, column=0, pady=4)
-
-            def update_countdown():
-                now = datetime.now()
-                remaining = end_time - now
-
-                if remaining.total_seconds() <= 0:
-                    countdown_label.config(
-                        text="Voting period has ended.", fg="red"
-                    )
-                    for widget in frame.winfo_children():
-                        if isinstance(widget, tk.Button):
-                            widget.config(state="disabled", text="Voting Closed")
-                    return
-
-                hours, remainder = divmod(int(remaining.total_seconds()), 3600)
-                minutes, seconds = divmod(remainder, 60)
-                countdown_label.config(
-                    text=f"Voting ends in: {hours:02d}h {minutes:02d}m {seconds:02d}s",
-                    fg="#008000" if hours > 0 or minutes > 5 else "orange",
-                )
-                countdown_label.after(1000, update_countdown)
-
-            update_countdown()
+        if self.kiosk and not self.db.student_has_voted(reg_no):
+            self._show_kiosk_ballot(window)
+            return
 
+        def build(frame):
             # Already voted?
             if self.db.student_has_voted(reg_no):
+                self._build_vote_header(frame, window)
                 tk.Label(
                     frame,
                     text="You have already voted.",
@@ -266,198 +317,261 @@ class StudentPanel:
                 ).grid(row=2, column=0, pady=10)
                 return
 
-            positions = self.db.get_all_positions()
             self._photo_cache.clear()
-            selections = {}  # position -> IntVar(candidate_id or 0)
-
-            # ---------- ACTIONS ROW (ONLY SUBMIT BUTTON – TOP RIGHT) ----------
-            actions_row = tk.Frame(frame, bg=THEME_WHITE)
-            actions_row.grid(row=2, column=0, sticky="ew", padx=10, pady=(2, 4))
-            actions_row.columnconfigure(0, weight=1)  # spacer to push right
-
-            def submit_votes():
-                chosen_votes = {}
-                for position, var in selections.items():
-                    cid = var.get()
-                    if cid != 0:
-                        chosen_votes[position] = cid
-
-                if not chosen_votes:
-                    messagebox.showwarning(
-                        "No Selection", "Please select at least one candidate."
-                    )
-                    return
+            view = self._build_ballot(frame, self.db.get_ballot(), window)
+            self._photo_cache.append(view.placeholder)
 
-                confirm = messagebox.askyesno(
-                    "Confirm Vote", "Are you sure you want to submit your votes?"
-                )
-                if not confirm:
-                    return
+        self.display_content(build, stage="vote_screen")
+        self._trace_images()
 
-                try:
-                    for position, cid in chosen_votes.items():
-                        self.db.record_vote(reg_no, cid)
-                    self._display_poll_status_screen()
-                except Exception as e:
-                    messagebox.showerror(
-                        "Database Error",
-                        f"An error occurred while submitting votes: {e}",
-                    )
+    def _trace_images(self):
+        trace = tracing.current()
+        if trace and self._image_loader is not None:
+            started = time.perf_counter()
+            self._image_loader.when_idle(lambda: tracing.record("images", started, trace))
 
-            tk.Button(
-                actions_row,
-                text="Submit Votes",
-                bg=THEME_RED,
-                fg=THEME_WHITE,
-                font=("Segoe UI", 12, "bold"),
-                width=18,
-                relief="flat",
-                command=submit_votes,
-            ).grid(row=0, column=1, sticky="e", pady=2)
+    def _build_vote_header(self, frame, window):
+        """Title and countdown (rows 0 and 1); returns the countdown label."""
+        # layout config
+        frame.rowconfigure(3, weight=1)   # scrollable list row
+        frame.columnconfigure(0, weight=1)
 
-            tk.Label(
-                actions_row,
-                text=f"Voting open from {start_str} to {end_str}",
-                bg=THEME_WHITE,
-                fg="#555",
-                font=("Arial", 9, "italic"),
-            ).grid(row=1, column=1, sticky="e", pady=(0, 2))
-
-            # ---------- SCROLLABLE CANDIDATES LIST (BELOW) ----------
-            list_container = tk.Frame(frame, bg=THEME_WHITE)
-            list_container.grid(row=3, column=0, sticky="nsew", padx=5, pady=5)
-            frame.rowconfigure(3, weight=1)
-
-            canvas = tk.Canvas(list_container, bg=THEME_WHITE, highlightthickness=0)
-            scrollbar = tk.Scrollbar(list_container, orient="vertical", command=canvas.yview)
-            scroll_frame = tk.Frame(canvas, bg=THEME_WHITE)
-
-            scroll_frame.bind(
-                "<Configure>",
-                lambda e: canvas.configure(scrollregion=canvas.bbox("all")),
-            )
-            canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
-            canvas.configure(yscrollcommand=scrollbar.set)
+        # ---------- TITLE (CENTERED) ----------
+        tk.Label(
+            frame,
+            text="CAST YOUR VOTE",
+            font=("Segoe UI", 18, "bold"),
+            bg=THEME_WHITE,
+            fg=THEME_RED,
+        ).grid(row=0, column=0, pady=10)   # no sticky, so it centers
 
-            canvas.pack(side="left", fill="both", expand=True)
-            scrollbar.pack(side="right", fill="y")
+        # ---------- COUNTDOWN (CENTERED) ----------
+        countdown_label = tk.Label(
+            frame,
+            text="Calculating remaining time...",
+            bg=THEME_WHITE,
+            fg="#333",
+            font=("Arial", 11, "bold"),
+        )
+        countdown_label.grid(row=1, column=0, pady=4)
+
+        self._start_countdown(countdown_label, window, frame)
+        return countdown_label
+
+    def _build_ballot(self, frame, ballot, window):
+        """Build the whole ballot into `frame` and return it as a BallotView.
+
+        Everything that changes from one voter to the next lives in
+        view.selections, so a kiosk can reuse the widgets with view.reset().
+        """
+        countdown_label = self._build_vote_header(frame, window)
+        placeholder = ImageTk.PhotoImage(
+            Image.new("RGB", THUMB_SIZE, color=(240, 240, 240))
+        )
+        selections = {}  # position -> IntVar(candidate_id or 0)
+
+        # ---------- ACTIONS ROW (ONLY SUBMIT BUTTON – TOP RIGHT) ----------
+        actions_row = tk.Frame(frame, bg=THEME_WHITE)
+        actions_row.grid(row=2, column=0, sticky="ew", padx=10, pady=(2, 4))
+        actions_row.columnconfigure(0, weight=1)  # spacer to push right
+
+        def submit_votes():
+            chosen_votes = {}
+            for position, var in selections.items():
+                cid = var.get()
+                if cid != 0:
+                    chosen_votes[position] = cid
+
+            if not chosen_votes:
+                messagebox.showwarning(
+                    "No Selection", "Please select at least one candidate."
+                )
+                return
 
-            def _on_mousewheel(event, c=canvas):
-                if not c.winfo_exists():
-                    return
-                if getattr(event, "delta", 0):
-                    c.yview_scroll(int(-1 * (event.delta / 120)), "units")
-                else:
-                    if event.num == 4:
-                        c.yview_scroll(-1, "units")
-                    elif event.num == 5:
-                        c.yview_scroll(1, "units")
+            confirm = messagebox.askyesno(
+                "Confirm Vote", "Are you sure you want to submit your votes?"
+            )
+            if not confirm:
+                return
 
-            canvas.bind("<MouseWheel>", _on_mousewheel)
-            canvas.bind("<Button-4>", _on_mousewheel)
-            canvas.bind("<Button-5>", _on_mousewheel)
+            try:
+                with tracing.span("submit_votes"):
+                    self.db.cast_ballot(self.reg_no, chosen_votes)
+                self._display_poll_status_screen()
+            except AlreadyVotedError as e:
+                # Another terminal got there first; nothing was changed here
+                messagebox.showinfo("Already Voted", str(e))
+                self._display_poll_status_screen()
+            except BallotError as e:
+                messagebox.showwarning("Vote Not Recorded", str(e))
+            except Exception as e:
+                messagebox.showerror(
+                    "Database Error",
+                    f"An error occurred while submitting votes: {e}",
+                )
 
-            # Build position sections
-            for position in positions:
-                tk.Label(
-                    scroll_frame,
-                    text=position.upper(),
+        tk.Button(
+            actions_row,
+            text="Submit Votes",
+            bg=THEME_RED,
+            fg=THEME_WHITE,
+            font=("Segoe UI", 12, "bold"),
+            width=18,
+            relief="flat",
+            command=submit_votes,
+        ).grid(row=0, column=1, sticky="e", pady=2)
+
+        tk.Label(
+            actions_row,
+            text="Voting open from {} to {}".format(*window.duration),
+            bg=THEME_WHITE,
+            fg="#555",
+            font=("Arial", 9, "italic"),
+        ).grid(row=1, column=1, sticky="e", pady=(0, 2))
+
+        # ---------- CANDIDATES LIST (BELOW, VIRTUALIZED) ----------
+        # Only the cards in view exist as widgets; they are recycled
+        # while scrolling, so big ballots build as fast as small ones.
+        items = []
+        for position, candidates in ballot:
+            selections[position] = tk.IntVar(value=0)
+            items.append(("header", position))
+            for cid, name, photo_path, logo_path in candidates:
+                items.append(("candidate", (position, cid, name, photo_path, logo_path)))
+
+        def create_row(kind, parent):
+            outer = tk.Frame(parent, bg=THEME_WHITE)
+            if kind == "header":
+                outer.title = tk.Label(
+                    outer,
                     font=("Segoe UI", 13, "bold"),
                     bg=THEME_WHITE,
                     fg=THEME_RED,
-                ).pack(anchor="w", padx=15, pady=(12, 4))
-
-                group_box = tk.LabelFrame(
-                    scroll_frame,
-                    bg=THEME_WHITE,
-                    padx=10,
-                    pady=5,
-                    highlightbackground=THEME_RED,
-                    highlightthickness=1,
                 )
-                group_box.pack(fill="x", padx=20, pady=5)
-
-                candidates = self.db.get_candidates(position=position)
-                selections[position] = tk.IntVar(value=0)
-                labels_map = {}
-
-                for cid, name, pos, votes, photo_path, logo_path in candidates:
-                    row = tk.Frame(group_box, bg=THEME_WHITE)
-                    row.pack(fill="x", pady=3)
-
-                    safe_photo = os.path.normpath((photo_path or "").strip()) if photo_path else ""
-                    safe_logo = os.path.normpath((logo_path or "").strip()) if logo_path else ""
-
-                    try:
-                        if safe_photo and os.path.exists(safe_photo):
-                            img = Image.open(safe_photo)
-                        else:
-                            raise FileNotFoundError
-                        img = img.resize((120, 120))
-                        photo = ImageTk.PhotoImage(img)
-                    except Exception:
-                        from PIL import Image as PILImage
-                        placeholder = PILImage.new("RGB", (120, 120), color=(240, 240, 240))
-                        photo = ImageTk.PhotoImage(placeholder)
-
-                    self._photo_cache.append(photo)
-                    tk.Label(row, image=photo, bg=THEME_WHITE).pack(
-                        side="left", padx=20, pady=20
-                    )
-
-                    if safe_logo and os.path.exists(safe_logo):
-                        try:
-                            logo_img = Image.open(safe_logo).resize((120, 120))
-                            logo_photo = ImageTk.PhotoImage(logo_img)
-                            self._photo_cache.append(logo_photo)
-                            tk.Label(row, image=logo_photo, bg=THEME_WHITE).pack(
-                                side="left", padx=20, pady=20
-                            )
-                        except Exception:
-                            pass
-
-                    display_text = f"☐ {name}"
-                    lbl_choice = tk.Label(
-                        row,
-                        text=display_text,
-                        bg=THEME_WHITE,
-                        fg="#333333",
-                        font=("Arial", 15, "bold"),
-                        padx=10,
-                        pady=8,
-                        anchor="w",
-                    )
-                    lbl_choice.pack(side="left", padx=10)
+                outer.title.pack(anchor="sw", side="bottom", padx=15, pady=(12, 4))
+                return outer
 
-                    labels_map[cid] = (lbl_choice, name)
+            card = tk.Frame(
+                outer,
+                bg=THEME_WHITE,
+                highlightbackground=THEME_RED,
+                highlightthickness=1,
+            )
+            card.pack(fill="both", expand=True, padx=20, pady=3)
 
-                    def on_click(event, cid=cid, position=position, labels_map=labels_map):
-                        current = selections[position].get()
-                        if current == cid:
-                            selections[position].set(0)
-                        else:
-                            selections[position].set(cid)
+            outer.photo = tk.Label(card, image=placeholder, bg=THEME_WHITE)
+            outer.photo.pack(side="left", padx=20, pady=20)
+            outer.logo = tk.Label(card, bg=THEME_WHITE)
+            outer.choice = tk.Label(
+                card,
+                bg=THEME_WHITE,
+                fg="#333333",
+                font=("Arial", 15, "bold"),
+                padx=10,
+                pady=8,
+                anchor="w",
+            )
+            outer.choice.pack(side="left", padx=10)
 
-                        selected_id = selections[position].get()
-                        for other_cid, (other_lbl, other_name) in labels_map.items():
-                            if other_cid == selected_id:
-                                other_lbl.config(text=f"☑ {other_name}")
-                            else:
-                                other_lbl.config(text=f"☐ {other_name}")
+            def on_click(event, row=outer):
+                position, cid = row.item[0], row.item[1]
+                if selections[position].get() == cid:
+                    selections[position].set(0)
+                else:
+                    selections[position].set(cid)
+                candidate_list.rebind_visible()
 
-                    lbl_choice.bind("<Button-1>", on_click)
+            outer.choice.bind("<Button-1>", on_click)
+            return outer
 
-        self.display_content(build)
+        def bind_row(kind, row, data):
+            if kind == "header":
+                row.title.config(text=data.upper())
+                return
 
+            row.item = data
+            position, cid, name, photo_path, logo_path = data
+            mark = "☑" if selections[position].get() == cid else "☐"
+            row.choice.config(text=f"{mark} {name}")
+
+            if getattr(row, "bound_cid", None) == cid:
+                return  # same candidate, images already shown
+            row.bound_cid = cid
+
+            row.photo.config(image=placeholder)
+            self._image_loader.load_into(row.photo, photo_path)
+            if logo_path:
+                row.logo.config(image="")
+                row.logo.pack(side="left", padx=20, pady=20, before=row.choice)
+                self._image_loader.load_into(
+                    row.logo, logo_path, on_missing=row.logo.pack_forget
+                )
+            else:
+                row.logo.image_request = None
+                row.logo.pack_forget()
+
+        candidate_list = VirtualList(
+            frame,
+            row_heights={"header": 44, "candidate": 170},
+            create_row=create_row,
+            bind_row=bind_row,
+            items=items,
+        )
+        candidate_list.frame.grid(row=3, column=0, sticky="nsew", padx=5, pady=5)
+        frame.rowconfigure(3, weight=1)
+
+        return BallotView(frame, (ballot, window.duration), selections,
+                          candidate_list, countdown_label, placeholder)
+
+    # ---------- KIOSK ----------
+    def prewarm(self):
+        """Build the kiosk ballot (hidden) and decode its pictures ahead of
+        the next login, e.g. while a student is typing their password."""
+        window = self.db.voting_window()
+        if not window.is_open():
+            return
+        view = self._kiosk_ballot(window)
+        paths = [
+            path
+            for _position, candidates in view.key[0]
+            for _cid, _name, photo_path, logo_path in candidates
+            for path in (photo_path, logo_path)
+            if path
+        ]
+        self._image_loader.preload(paths)
+
+    def _kiosk_ballot(self, window):
+        """The prebuilt ballot, rebuilt only when the candidates or voting period change."""
+        key = (self.db.get_ballot(), window.duration)
+        view = self._kiosk_view
+        if view is not None and view.key == key and view.frame.winfo_exists():
+            return view
+        if view is not None:
+            view.frame.destroy()
+        frame = tk.Frame(self.content_frame, bg=THEME_WHITE)
+        frame.grid(row=0, column=0, sticky="nsew")
+        frame.grid_remove()
+        self.content_frame.rowconfigure(0, weight=1)
+        self.content_frame.columnconfigure(0, weight=1)
+        self._clock.clear()  # _build_ballot starts a countdown; it restarts on show
+        view = self._kiosk_view = self._build_ballot(frame, key[0], window)
+        return view
+
+    def _show_kiosk_ballot(self, window):
+        started = time.perf_counter()
+        trace = tracing.current()
+        self._clear_content()
+        view = self._kiosk_ballot(window)
+        view.reset()
+        view.frame.grid()
+        self._start_countdown(view.countdown, window, view.frame)
+        if trace:
+            view.frame.after_idle(lambda: tracing.record("vote_screen", started, trace, kiosk=True))
+        self._trace_images()
 
     # ---------- POLL STATUS ----------
-       # ---------- POLL STATUS ----------
-       # ---------- POLL STATUS ----------
-        # ---------- POLL STATUS ----------
     def _display_poll_status_screen(self):
         def build(frame):
-            from datetime import datetime
-
             # Make main grid responsive
             frame.rowconfigure(1, weight=1)
             frame.columnconfigure(0, weight=3)  # left: list with photos
@@ -476,19 +590,16 @@ class StudentPanel:
                 fg=THEME_RED,
             ).grid(row=0, column=0, pady=(0, 4), sticky="n")
 
-            duration = self.db.get_voting_duration()
-            if not duration:
+            window = self.db.voting_window()
+            if window.remaining() is None:
                 tk.Label(
                     header,
-                    text="Voting period not set.",
+                    text=window.status()[1],
                     bg=THEME_WHITE,
                     fg="red",
                 ).grid(row=1, column=0, pady=5)
                 return
 
-            start_str, end_str = duration
-            end_time = datetime.fromisoformat(end_str)
-
             countdown_label = tk.Label(
                 header,
                 text="Calculating remaining time...",
@@ -498,27 +609,7 @@ class StudentPanel:
             )
             countdown_label.grid(row=1, column=0, pady=4)
 
-            def update_countdown():
-                now = datetime.now()
-                remaining = end_time - now
-
-                if remaining.total_seconds() <= 0:
-                    countdown_label.config(text="Voting period has ended.", fg="red")
-                    # disable all buttons if time expires
-                    for widget in frame.winfo_children():
-                        if isinstance(widget, tk.Button):
-                            widget.config(state="disabled", text="Voting Closed")
-                    return
-
-                hours, remainder = divmod(int(remaining.total_seconds()), 3600)
-                minutes, seconds = divmod(remainder, 60)
-                countdown_label.config(
-                    text=f"Voting ends in: {hours:02d}h {minutes:02d}m {seconds:02d}s",
-                    fg="#008000" if hours > 0 or minutes > 5 else "orange",
-                )
-                countdown_label.after(1000, update_countdown)
-
-            update_countdown()
+            self._start_countdown(countdown_label, window, frame)
 
             # ===== MAIN AREA: LEFT (CARDS) + RIGHT (ANALYTICS) =====
             main = tk.Frame(frame, bg=THEME_WHITE)
@@ -528,115 +619,83 @@ class StudentPanel:
             main.rowconfigure(0, weight=1)
 
             # ---------------- LEFT: SCROLLABLE CARDS WITH PICS/LOGOS ----------------
-            list_container = tk.Frame(main, bg=THEME_WHITE)
-            list_container.grid(row=0, column=0, sticky="nsew", padx=(0, 6))
-            list_container.rowconfigure(0, weight=1)
-            list_container.columnconfigure(0, weight=1)
-
-            canvas = tk.Canvas(list_container, bg=THEME_WHITE, highlightthickness=0)
-            scrollbar = tk.Scrollbar(list_container, orient="vertical", command=canvas.yview)
-            inner = tk.Frame(canvas, bg=THEME_WHITE)
-
-            inner.bind(
-                "<Configure>",
-                lambda e: canvas.configure(scrollregion=canvas.bbox("all")),
+            # Virtualized: only cards in view are built, and they are
+            # recycled as the list scrolls.
+            self._photo_cache.clear()
+            placeholder = ImageTk.PhotoImage(
+                Image.new("RGB", THUMB_SIZE, color=(240, 200, 200))
             )
-            canvas.create_window((0, 0), window=inner, anchor="nw")
-            canvas.configure(yscrollcommand=scrollbar.set)
+            self._photo_cache.append(placeholder)
+            ballot = self.db.get_ballot()
+            vote_counts = self.db.get_vote_counts()
+
+            items = []
+            for pos, candidates in ballot:
+                items.append(("header", pos))
+                for cid, name, photo_path, logo_path in candidates:
+                    items.append(("candidate", (cid, name, photo_path, logo_path)))
+
+            def create_row(kind, parent):
+                outer = tk.Frame(parent, bg=THEME_WHITE)
+                if kind == "header":
+                    outer.title = tk.Label(
+                        outer,
+                        font=("Segoe UI", 14, "bold"),
+                        bg=THEME_WHITE,
+                        fg=THEME_RED,
+                    )
+                    outer.title.pack(anchor="sw", side="bottom", padx=15, pady=(14, 6))
+                    return outer
 
-            canvas.grid(row=0, column=0, sticky="nsew")
-            scrollbar.grid(row=0, column=1, sticky="ns")
+                cf = tk.Frame(
+                    outer,
+                    bg="#f9f9f9",
+                    highlightbackground="#ffcccc",
+                    highlightthickness=1,
+                )
+                cf.pack(fill="both", expand=True, padx=25, pady=5)
+
+                outer.photo = tk.Label(cf, image=placeholder, bg="#f9f9f9")
+                outer.photo.pack(side="left", padx=20, pady=20)
+                outer.logo = tk.Label(cf, bg="#f9f9f9")
+                outer.info = tk.Label(
+                    cf,
+                    bg="#f9f9f9",
+                    fg="#333333",
+                    justify="left",
+                    font=("Arial", 11, "bold"),
+                )
+                outer.info.pack(side="left", padx=10, pady=8)
+                return outer
 
-            # --- Mouse wheel scrolling only affects this canvas/inner ---
-            def _on_mousewheel(event):
-                if not canvas.winfo_exists():
+            def bind_row(kind, row, data):
+                if kind == "header":
+                    row.title.config(text=data.upper())
                     return
 
-                if hasattr(event, "delta") and event.delta:
-                    canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-                else:  # Linux
-                    if event.num == 4:
-                        canvas.yview_scroll(-1, "units")
-                    elif event.num == 5:
-                        canvas.yview_scroll(1, "units")
-
-            # Bind to both canvas and inner so scrolling works over the cards
-            for widget in (canvas, inner):
-                widget.bind("<MouseWheel>", _on_mousewheel)   # Windows / Mac
-                widget.bind("<Button-4>", _on_mousewheel)     # Linux up
-                widget.bind("<Button-5>", _on_mousewheel)     # Linux down)
-
-            # Keep photos/logos EXACTLY as before
-            self._photo_cache.clear()
-            positions = self.db.get_all_positions()
+                cid, name, photo_path, logo_path = data
+                row.info.config(text=f"{name}\nVotes: {vote_counts.get(cid, 0)}")
 
-            for pos in positions:
-                tk.Label(
-                    inner,
-                    text=pos.upper(),
-                    font=("Segoe UI", 14, "bold"),
-                    bg=THEME_WHITE,
-                    fg=THEME_RED,
-                ).pack(anchor="w", padx=15, pady=(14, 6))
-
-                candidates = self.db.get_candidates(position=pos)
-                for cid, name, position, votes, photo_path, logo_path in candidates:
-                    cf = tk.Frame(
-                        inner,
-                        bg="#f9f9f9",
-                        highlightbackground="#ffcccc",
-                        highlightthickness=1,
+                row.photo.config(image=placeholder)
+                self._image_loader.load_into(row.photo, photo_path)
+                if logo_path:
+                    row.logo.config(image="")
+                    row.logo.pack(side="left", padx=20, pady=20, before=row.info)
+                    self._image_loader.load_into(
+                        row.logo, logo_path, on_missing=row.logo.pack_forget
                     )
-                    cf.pack(fill="x", padx=25, pady=5)
-
-                    safe_photo = (photo_path or "").strip()
-                    safe_logo = (logo_path or "").strip()
-                    if safe_photo:
-                        safe_photo = os.path.normpath(safe_photo)
-                    if safe_logo:
-                        safe_logo = os.path.normpath(safe_logo)
-
-                    # Photo
-                    try:
-                        if safe_photo and os.path.exists(safe_photo):
-                            img = Image.open(safe_photo)
-                        else:
-                            raise FileNotFoundError
-                        img = img.resize((120, 120))
-                        photo = ImageTk.PhotoImage(img)
-                    except Exception:
-                        from PIL import Image as PILImage
-
-                        photo = ImageTk.PhotoImage(
-                            PILImage.new("RGB", (120, 120), color=(240, 200, 200))
-                        )
-
-                    tk.Label(cf, image=photo, bg="#f9f9f9").pack(
-                        side="left", padx=20, pady=20
-                    )
-                    self._photo_cache.append(photo)
-
-                    # Logo
-                    if safe_logo and os.path.exists(safe_logo):
-                        try:
-                            logo_img = Image.open(safe_logo).resize((120, 120))
-                            logo_photo = ImageTk.PhotoImage(logo_img)
-                            self._photo_cache.append(logo_photo)
-                            tk.Label(cf, image=logo_photo, bg="#f9f9f9").pack(
-                                side="left", padx=20, pady=20
-                            )
-                        except Exception:
-                            pass
-
-                    # Text info
-                    tk.Label(
-                        cf,
-                        text=f"{name}\nVotes: {votes}",
-                        bg="#f9f9f9",
-                        fg="#333333",
-                        justify="left",
-                        font=("Arial", 11, "bold"),
-                    ).pack(side="left", padx=10, pady=8)
+                else:
+                    row.logo.image_request = None
+                    row.logo.pack_forget()
+
+            cards = VirtualList(
+                main,
+                row_heights={"header": 48, "candidate": 172},
+                create_row=create_row,
+                bind_row=bind_row,
+                items=items,
+            )
+            cards.frame.grid(row=0, column=0, sticky="nsew", padx=(0, 6))
 
             # ---------------- RIGHT: ANALYTICS PANEL (UNCHANGED) ----------------
             analytics = tk.LabelFrame(
@@ -880,21 +939,12 @@ class StudentPanel:
                     font=("Segoe UI", 9),
                 ).pack(anchor="w", padx=10)
 
-        self.display_content(build)
+        self.display_content(build, stage="poll_status")
 
 
 
     # ---------- GO BACK / LOG OUT ----------
-    def _go_back(self, win=None):
-        try:
-            if win:
-                win.destroy()
-            elif hasattr(self, "root") and self.root is not None:
-                self.root.destroy()
-        except Exception:
-            pass
-
-        from main import MainWindow
-
-        app = MainWindow()
-        app.run()
+    def _go_back(self):
+        # A view switch: the router calls leave(), and nothing is rebuilt
+        if self.on_logout is not None:
+            self.on_logout()
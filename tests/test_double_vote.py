@@ -0,0 +1,27 @@
+# tests/test_double_vote.py
+"""Every ballot counts exactly once when many terminals vote at once."""
+import argparse
+
+from benchmarks.double_vote_stress import run
+from database import DatabaseManager
+
+
+def test_each_student_votes_exactly_once_under_contention(tmp_path):
+    args = argparse.Namespace(students=50, positions=3, candidates=2,
+                              processes=2, threads=4, seed=2025)
+    path = str(tmp_path / "stress.db")
+
+    report = run(args, path)
+
+    assert report["errors"] == []
+    assert report["accepted"] == args.students
+    assert report["already_voted"] == report["attempts"] - args.students
+    assert report["positions_without_one_vote_per_student"] == []
+    assert report["students_not_marked"] == 0
+    assert report["ok"]
+
+    db = DatabaseManager(path)
+    ballots = db.conn.execute("SELECT COUNT(*) FROM ballots").fetchone()[0]
+    assert ballots == args.students * args.positions
+    assert sum(db.get_vote_counts().values()) == ballots
+    db.close_all()
@@ -0,0 +1,46 @@
+# tests/test_explain.py
+"""The query-plan check from explain.py, run as part of the test suite."""
+import inspect
+
+import explain
+from database import DatabaseManager
+
+
+# DatabaseManager members with no statement of their own to explain: they
+# delegate to methods in explain.CALLS, only touch caches or connections,
+# or run schema DDL.
+NOT_EXPLAINED = {
+    "conn", "thumbnail_dir", "create_tables", "create_positions_table",
+    "submit_ballot", "check_ballot", "write_ballot", "note_voted",
+    "voting_window", "is_voting_open", "prune_history_in_background",
+    "backfill_thumbnails_in_background",
+    "get_results_version", "verify_admin_login", "verify_student_login",
+    "close", "close_all",
+}
+
+
+def test_hot_queries_are_served_by_indexes():
+    assert explain.main(["--check"]) == 0
+
+
+def test_check_runs_on_a_copy_of_an_existing_database(tmp_path):
+    path = str(tmp_path / "existing.db")
+    db = DatabaseManager(path)
+    db.add_position("Guild President")
+    db.close_all()
+
+    assert explain.main(["--check", "--db", path]) == 0
+
+    db = DatabaseManager(path)
+    assert db.get_all_positions() == ["Guild President"]
+    assert db.get_candidates() == []
+    db.close_all()
+
+
+def test_every_database_method_is_explained():
+    called = {call for _name, call, _args, _hot in explain.CALLS if isinstance(call, str)}
+    methods = {
+        name for name, _member in inspect.getmembers(DatabaseManager)
+        if not name.startswith("_")
+    }
+    assert methods - called - NOT_EXPLAINED == set()
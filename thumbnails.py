@@ -0,0 +1,86 @@
+# thumbnails.py
+import hashlib
+import os
+import tempfile
+
+
+THUMB_SIZE = (120, 120)
+THUMB_DIR_NAME = "thumbnails"
+
+
+def _file_digest(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def make_thumbnail(path, cache_dir, size=THUMB_SIZE):
+    """Return the path of a pre-sized PNG thumbnail for the image at `path`.
+
+    Thumbnails are keyed by a hash of the source file's content, so the same
+    picture uploaded twice is only stored once. Returns None when the source
+    is missing or is not a readable image.
+    """
+    if not path or not os.path.exists(path):
+        return None
+
+    from PIL import Image
+
+    try:
+        digest = _file_digest(path)
+    except OSError:
+        return None
+
+    thumb_path = os.path.join(cache_dir, f"{digest}_{size[0]}x{size[1]}.png")
+    if os.path.exists(thumb_path):
+        return thumb_path
+
+    try:
+        with Image.open(path) as img:
+            # For JPEGs this makes the decoder work at 1/2, 1/4 or 1/8 scale,
+            # which is most of the cost for full-size camera photos.
+            img.draft("RGB", size)
+            mode = "RGBA" if "A" in img.getbands() else "RGB"
+            thumb = img.convert(mode).resize(size)
+    except Exception:
+        return None
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # A temp file of its own per call: the backfill thread and the Tk thread
+    # may write the same picture's thumbnail at once, even in one process.
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as tmp:
+        try:
+            thumb.save(tmp, "PNG")
+        except Exception:
+            tmp.close()
+            os.remove(tmp.name)
+            raise
+    # Temp files are created owner-only; thumbnails are shared like photos
+    os.chmod(tmp.name, 0o644)
+    os.replace(tmp.name, thumb_path)
+    return thumb_path
+
+
+def load_thumbnail(path, size=THUMB_SIZE):
+    """Open a thumbnail as a PIL image, or None if it cannot be read.
+
+    Falls back to resizing when given an original that has no thumbnail yet.
+    """
+    safe_path = os.path.normpath(path.strip()) if path and path.strip() else ""
+    if not safe_path or not os.path.exists(safe_path):
+        return None
+
+    from PIL import Image
+
+    try:
+        img = Image.open(safe_path)
+        if img.size != size:
+            img.draft("RGB", size)
+            img = img.resize(size)
+        else:
+            img.load()
+        return img
+    except Exception:
+        return None
@@ -0,0 +1,195 @@
+# tracing.py
+"""Time each stage of a student's visit, from login to the results screen.
+
+A journey gets a short trace id at login; every stage after that
+(building the vote screen, loading pictures, submitting the ballot, ...)
+is written as one JSON line to a size-rotated log file. The admin panel's
+Voter Journeys screen, or `python -m tracing`, reads the files back and
+reports per-stage percentiles and the slowest journeys.
+
+Off unless asked for, like UVS_INSTRUMENT: UVS_TRACE=1 writes
+uvs_traces.log in the current directory, UVS_TRACE=<path> writes there.
+Each terminal writes its own file, so a report covers the journeys of
+the terminal that wrote it.
+"""
+import argparse
+import glob
+import json
+import logging
+import math
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+
+TRACE_ENV = "UVS_TRACE"
+DEFAULT_TRACE_FILE = "uvs_traces.log"
+MAX_BYTES = 1024 * 1024
+BACKUP_COUNT = 5
+
+# Stages in the order a student meets them
+STAGES = ("login", "voting_window", "vote_screen", "images", "submit_votes", "poll_status")
+
+_setting = os.environ.get(TRACE_ENV, "").strip()
+ENABLED = _setting.lower() not in ("", "0", "false", "no", "off")
+# Resolved once, so a later chdir cannot split the log in two
+TRACE_FILE = os.path.abspath(
+    DEFAULT_TRACE_FILE if _setting.lower() in ("", "0", "false", "no", "off",
+                                               "1", "true", "yes", "on") else _setting
+)
+
+_logger = None
+_current = None
+
+
+def _get_logger():
+    global _logger
+    if _logger is None:
+        logger = logging.getLogger("uvs.trace")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        handler = RotatingFileHandler(TRACE_FILE, maxBytes=MAX_BYTES,
+                                      backupCount=BACKUP_COUNT, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        _logger = logger
+    return _logger
+
+
+# ---------- recording ----------
+def begin():
+    """Start a journey and return its trace id (None when tracing is off)."""
+    global _current
+    _current = uuid.uuid4().hex[:12] if ENABLED else None
+    return _current
+
+
+def end():
+    """Stop attributing spans to the current journey (e.g. on logout)."""
+    global _current
+    _current = None
+
+
+def current():
+    return _current
+
+
+def record(stage, started, trace=None, **fields):
+    """Write a span for `stage` that began at time.perf_counter() value `started`."""
+    trace = trace or _current
+    if trace is None:
+        return
+    span = {
+        "trace": trace,
+        "stage": stage,
+        "at": datetime.now().isoformat(timespec="milliseconds"),
+        "ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    span.update(fields)
+    _get_logger().info(json.dumps(span))
+
+
+@contextmanager
+def span(stage, **fields):
+    """Time the body of a with-block as one stage of the current journey."""
+    trace = _current
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        fields["error"] = True
+        raise
+    finally:
+        record(stage, started, trace, **fields)
+
+
+# ---------- report ----------
+def read_spans(path=None):
+    """Every span in the trace file and its rotated backups, oldest file first."""
+    path = path or TRACE_FILE
+    backups = []
+    for name in glob.glob(glob.escape(path) + ".*"):
+        suffix = name.rsplit(".", 1)[1]
+        if suffix.isdigit():
+            backups.append((int(suffix), name))
+    # RotatingFileHandler keeps the oldest lines in the highest number
+    files = [name for _, name in sorted(backups, reverse=True)]
+    if os.path.exists(path):
+        files.append(path)
+    spans = []
+    for name in files:
+        with open(name, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    continue  # half-written line from a crash
+    return spans
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    rank = math.ceil(fraction * len(values))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+def journey_report(path=None, slowest=20):
+    """(stage_rows, journey_rows) for the admin report.
+
+    stage_rows: (stage, count, p50, p90, p99, max) in milliseconds.
+    journey_rows: (trace, started_at, total_ms, slowest_stage, slowest_ms),
+    slowest journeys first. total_ms is the time the student spent waiting
+    on the system, i.e. the sum of the journey's stages.
+    """
+    by_stage = {}
+    journeys = {}
+    for s in read_spans(path):
+        ms = float(s.get("ms", 0))
+        by_stage.setdefault(s.get("stage"), []).append(ms)
+        j = journeys.setdefault(s.get("trace"), {"at": s.get("at"), "total": 0.0, "worst": (None, -1.0)})
+        j["total"] += ms
+        if ms > j["worst"][1]:
+            j["worst"] = (s.get("stage"), ms)
+
+    order = {stage: i for i, stage in enumerate(STAGES)}
+    stage_rows = []
+    for stage in sorted(by_stage, key=lambda st: (order.get(st, len(order)), str(st))):
+        values = sorted(by_stage[stage])
+        stage_rows.append((stage, len(values), percentile(values, 0.5),
+                           percentile(values, 0.9), percentile(values, 0.99), values[-1]))
+
+    journey_rows = sorted(
+        ((trace, j["at"], j["total"], j["worst"][0], j["worst"][1]) for trace, j in journeys.items()),
+        key=lambda row: row[2], reverse=True,
+    )[:slowest]
+    return stage_rows, journey_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Voter journey latency report")
+    parser.add_argument("--file", default=TRACE_FILE)
+    parser.add_argument("--slowest", type=int, default=10)
+    args = parser.parse_args()
+
+    stage_rows, journey_rows = journey_report(args.file, args.slowest)
+    if not stage_rows:
+        print(f"No spans in {args.file}.")
+        return
+    print(f"Journeys from {os.path.abspath(args.file)} (one terminal's log only).")
+    print()
+    print(f"{'stage':<16}{'count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for stage, count, p50, p90, p99, worst in stage_rows:
+        print(f"{stage:<16}{count:>8}{p50:>10.1f}{p90:>10.1f}{p99:>10.1f}{worst:>10.1f}")
+    print()
+    print(f"Slowest {len(journey_rows)} journeys:")
+    for trace, at, total, stage, ms in journey_rows:
+        print(f"  {trace}  {at}  {total:9.1f} ms  (worst: {stage} {ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,3 +10,10 @@ def center_window(window, width: int, height: int):
     x = (screen_w // 2) - (width // 2)
     y = (screen_h // 2) - (height // 2)
     window.geometry(f"{width}x{height}+{x}+{y}")
+
+def configure_window(window, title, width, height, resizable=True, minsize=(1, 1)):
+    """Retitle, resize and centre the (shared) root window for a view."""
+    window.title(title)
+    window.resizable(resizable, resizable)
+    window.minsize(*minsize)
+    center_window(window, width, height)
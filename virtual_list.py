@@ -0,0 +1,154 @@
+# virtual_list.py
+import bisect
+import tkinter as tk
+
+from utils import THEME_WHITE
+
+
+class VirtualList:
+    """Scrollable list that only keeps widgets for the rows in view.
+
+    Rows are (kind, data) pairs with a fixed height per kind. The list
+    creates a row widget with create_row(kind, parent) only when it needs
+    one, fills it with bind_row(kind, widget, data), and recycles widgets
+    scrolled out of view for the rows scrolling in. The number of widgets
+    therefore depends on the window height, not on the number of rows.
+    """
+
+    def __init__(self, parent, row_heights, create_row, bind_row,
+                 items=(), bg=THEME_WHITE, buffer_rows=2):
+        self.row_heights = row_heights
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.buffer_rows = buffer_rows
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.canvas = tk.Canvas(self.frame, bg=bg, highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self.frame, orient="vertical", command=self._yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self._items = []
+        self._offsets = []
+        self._active = {}   # index -> (kind, widget, window_id)
+        self._free = {}     # kind -> [(widget, window_id), ...]
+        self._width = 1
+        self._refresh_id = None
+
+        self.canvas.bind("<Configure>", self._on_configure)
+        self._bind_wheel(self.canvas)
+        self.set_items(items)
+
+    # ---------- public API ----------
+    def set_items(self, items):
+        """Replace every row and redraw from the top."""
+        for index in list(self._active):
+            self._release(index)
+        self._items = list(items)
+        self._offsets = []
+        y = 0
+        for kind, _data in self._items:
+            self._offsets.append(y)
+            y += self.row_heights[kind]
+        self.canvas.configure(scrollregion=(0, 0, self._width, y))
+        self.canvas.yview_moveto(0)
+        self._refresh()
+
+    def scroll_to_top(self):
+        self.canvas.yview_moveto(0)
+        self._refresh()
+
+    def row_widgets(self):
+        """Every row widget the list has made, on screen or waiting for reuse."""
+        widgets = [widget for _kind, widget, _window_id in self._active.values()]
+        for free in self._free.values():
+            widgets.extend(widget for widget, _window_id in free)
+        return widgets
+
+    def rebind_visible(self):
+        """Re-run bind_row on rows currently on screen (e.g. after a selection)."""
+        for index, (kind, widget, _window_id) in self._active.items():
+            self.bind_row(kind, widget, self._items[index][1])
+
+    def widget_count(self):
+        return len(self._active) + sum(len(v) for v in self._free.values())
+
+    # ---------- internals ----------
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self._schedule_refresh()
+
+    def _on_configure(self, event):
+        self._width = max(event.width, 1)
+        for _kind, _widget, window_id in self._active.values():
+            self.canvas.itemconfigure(window_id, width=self._width)
+        total = self._offsets[-1] + self.row_heights[self._items[-1][0]] if self._items else 0
+        self.canvas.configure(scrollregion=(0, 0, self._width, total))
+        self._schedule_refresh()
+
+    def _on_mousewheel(self, event):
+        if not self.canvas.winfo_exists():
+            return
+        if getattr(event, "delta", 0):
+            self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        elif event.num == 4:
+            self.canvas.yview_scroll(-1, "units")
+        elif event.num == 5:
+            self.canvas.yview_scroll(1, "units")
+        self._schedule_refresh()
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_mousewheel)   # Windows / Mac
+        widget.bind("<Button-4>", self._on_mousewheel)     # Linux up
+        widget.bind("<Button-5>", self._on_mousewheel)     # Linux down
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    def _schedule_refresh(self):
+        if self._refresh_id is None:
+            self._refresh_id = self.canvas.after_idle(self._refresh)
+
+    def _visible_range(self):
+        if not self._items:
+            return range(0)
+        top = self.canvas.canvasy(0)
+        bottom = top + max(self.canvas.winfo_height(), 1)
+        first = max(bisect.bisect_right(self._offsets, top) - 1, 0)
+        last = bisect.bisect_left(self._offsets, bottom)
+        first = max(first - self.buffer_rows, 0)
+        last = min(last + self.buffer_rows, len(self._items))
+        return range(first, last)
+
+    def _refresh(self):
+        self._refresh_id = None
+        if not self.canvas.winfo_exists():
+            return
+        wanted = self._visible_range()
+        for index in [i for i in self._active if i not in wanted]:
+            self._release(index)
+        for index in wanted:
+            if index not in self._active:
+                self._place(index)
+
+    def _place(self, index):
+        kind, data = self._items[index]
+        free = self._free.get(kind)
+        if free:
+            widget, window_id = free.pop()
+            self.canvas.itemconfigure(window_id, state="normal")
+        else:
+            widget = self.create_row(kind, self.canvas)
+            self._bind_wheel(widget)
+            window_id = self.canvas.create_window(0, 0, window=widget, anchor="nw")
+        self.canvas.coords(window_id, 0, self._offsets[index])
+        self.canvas.itemconfigure(
+            window_id, width=self._width, height=self.row_heights[kind]
+        )
+        self.bind_row(kind, widget, data)
+        self._active[index] = (kind, widget, window_id)
+
+    def _release(self, index):
+        kind, widget, window_id = self._active.pop(index)
+        self.canvas.itemconfigure(window_id, state="hidden")
+        self._free.setdefault(kind, []).append((widget, window_id))
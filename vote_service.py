@@ -0,0 +1,338 @@
+# vote_service.py
+"""Serve one voting database to many polling terminals over HTTP/JSON.
+
+Run on the machine that holds the database:
+
+    UVS_SERVICE_TOKEN=<secret> python -m vote_service --host 0.0.0.0 --port 8765
+
+and start each terminal with UVS_SERVICE_URL=http://<host>:8765 (and the
+same UVS_SERVICE_TOKEN) so the panels use RemoteDatabase instead of
+opening the file. The service refuses to listen beyond this machine
+without a token. Every write goes
+through one writer task, so terminals never fight over SQLite's lock.
+
+Endpoints (JSON bodies and responses):
+
+    POST /login         {"username", "password"} -> {"role", "user"} (no password)
+    GET  /ballot        positions with their candidates
+    POST /cast-ballot   {"regno", "selections": {position: candidate_id}}
+    GET  /results       {"version", "tallies"}
+    GET  /duration      {"start", "end", "open", "message"}
+    GET  /metrics       instrumentation snapshot (when UVS_INSTRUMENT is set)
+    POST /api/<method>  {"args": [...]} for the DatabaseManager methods below
+
+Ballots can only be cast through /cast-ballot, which checks the voting
+window and claims the voter before anything is written.
+"""
+import argparse
+import asyncio
+import hmac
+import ipaddress
+import json
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import instrumentation
+from database import DB_NAME, BallotError, DatabaseManager
+
+
+DEFAULT_PORT = 8765
+SERVICE_TOKEN_ENV = "UVS_SERVICE_TOKEN"
+TOKEN_HEADER = "x-uvs-token"
+MAX_BODY = 1024 * 1024
+
+# DatabaseManager methods reachable through POST /api/<method>.
+# Reads run concurrently on a thread pool (one connection per thread).
+READ_METHODS = {
+    "verify_student", "verify_admin", "student_has_voted",
+    "get_candidates", "get_candidate_by_id", "get_ballot", "get_vote_counts",
+    "get_voting_duration", "is_voting_open", "get_all_positions",
+    "get_poll_status", "get_tallies", "find_existing_students",
+    "get_current_epoch", "get_elections", "get_turnout", "get_candidates_page",
+    "get_students_page",
+}
+# Writes are queued for the single writer task. get_results_version runs
+# there too: PRAGMA data_version only means something on one connection.
+SERIAL_METHODS = {
+    "register_student", "register_students",
+    "add_candidate", "update_candidate", "delete_candidate",
+    "set_voting_duration", "add_position", "delete_position",
+    "register_admin", "update_admin_password", "reset_student_password",
+    "reset_votes", "get_results_version",
+}
+# Methods returning a SELECT * row of this table; its password is blanked
+# before the row leaves the service.
+CREDENTIAL_METHODS = {"verify_student": "students", "verify_admin": "admins"}
+
+# Errors the client re-raises as the same type; anything else is a 500.
+CONFLICT_ERRORS = (BallotError, sqlite3.IntegrityError)
+
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+    409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class VoteService:
+    def __init__(self, db_path=DB_NAME, profile="server", token=None, read_workers=8):
+        self.db = DatabaseManager(db_path, profile=profile)
+        self.token = token
+        self._password_column = {}
+        for name, table in CREDENTIAL_METHODS.items():
+            columns = [row[1] for row in self.db.conn.execute(f"PRAGMA table_info({table})")]
+            self._password_column[name] = columns.index("password")
+        self._read_pool = ThreadPoolExecutor(read_workers, thread_name_prefix="uvs-read")
+        self._write_pool = ThreadPoolExecutor(1, thread_name_prefix="uvs-write")
+        self._writes = None
+        self._writer_task = None
+
+    # ---------- database access ----------
+    async def read(self, name, *args):
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self._read_pool, getattr(self.db, name), *args)
+        if name in CREDENTIAL_METHODS and result:
+            result = list(result)
+            result[self._password_column[name]] = None
+        return result
+
+    async def write(self, name, *args):
+        """Queue a call for the writer task and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((getattr(self.db, name), args, future))
+        return await future
+
+    async def _writer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            func, args, future = await self._writes.get()
+            try:
+                result = await loop.run_in_executor(self._write_pool, self._run_write, func, args)
+            except Exception as exc:
+                if not future.cancelled():
+                    future.set_exception(exc)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+
+    def _run_write(self, func, args):
+        try:
+            return func(*args)
+        except Exception:
+            # A failed INSERT leaves its transaction (and the write lock) open
+            self.db.conn.rollback()
+            raise
+
+    # ---------- routes ----------
+    async def dispatch(self, method, path, body):
+        if method == "POST" and path == "/login":
+            username, password = body.get("username"), body.get("password")
+            admin = await self.read("verify_admin", username, password)
+            if admin:
+                return {"role": "admin", "user": admin}
+            student = await self.read("verify_student", username, password)
+            if student:
+                return {"role": "student", "user": student}
+            raise HTTPError(401, "Invalid username or password.")
+
+        if method == "GET" and path == "/ballot":
+            return await self.read("get_ballot")
+
+        if method == "POST" and path == "/cast-ballot":
+            selections = {pos: int(cid) for pos, cid in (body.get("selections") or {}).items()}
+            # Only the service's clock decides whether a ballot is on time.
+            # The window is cached, but its periodic re-read is a query, so
+            # it runs on the read pool like every other database access.
+            window = await self.read("voting_window")
+            is_open, message = window.status()
+            if not is_open:
+                raise BallotError(message)
+            # Ballots bypass the writer queue and go to the group-commit
+            # writer, which batches a burst of them into one transaction.
+            await asyncio.wrap_future(self.db.submit_ballot(body.get("regno"), selections))
+            return {"recorded": len(selections)}
+
+        if method == "GET" and path == "/results":
+            return {
+                "version": await self.write("get_results_version"),
+                "tallies": await self.read("get_tallies"),
+            }
+
+        if method == "GET" and path == "/duration":
+            window = await self.read("voting_window")
+            is_open, message = window.status()
+            start, end = window.duration or (None, None)
+            return {"start": start, "end": end, "open": is_open, "message": message}
+
+        if method == "GET" and path == "/metrics":
+            if not instrumentation.ENABLED:
+                raise HTTPError(404, f"Start the service with {instrumentation.INSTRUMENT_ENV} set to collect metrics.")
+            return instrumentation.snapshot()
+
+        if method == "POST" and path.startswith("/api/"):
+            name = path[len("/api/"):]
+            args = body.get("args", [])
+            if not isinstance(args, list):
+                raise HTTPError(400, "args must be a list")
+            if name in READ_METHODS:
+                return await self.read(name, *args)
+            if name in SERIAL_METHODS:
+                result = await self.write(name, *args)
+                if name == "reset_votes":
+                    self.db.prune_history_in_background()
+                return result
+
+        raise HTTPError(404, f"No route for {method} {path}")
+
+    # ---------- HTTP ----------
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except HTTPError as exc:
+                    _write_response(writer, exc.status, {"error": str(exc), "type": "HTTPError"}, False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, headers, raw = request
+                status, payload = await self._respond(method, path, headers, raw)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method, path, headers, raw):
+        try:
+            if self.token and not hmac.compare_digest(
+                headers.get(TOKEN_HEADER, "").encode("utf-8"), self.token.encode("utf-8")
+            ):
+                raise HTTPError(401, "Missing or wrong service token.")
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                raise HTTPError(400, "Request body is not valid JSON.")
+            if not isinstance(body, dict):
+                raise HTTPError(400, "Request body must be a JSON object.")
+            return 200, {"result": await self.dispatch(method, path.split("?", 1)[0], body)}
+        except HTTPError as exc:
+            return exc.status, {"error": str(exc), "type": "HTTPError"}
+        except CONFLICT_ERRORS as exc:
+            return 409, {"error": str(exc), "type": type(exc).__name__}
+        except (TypeError, ValueError) as exc:
+            return 400, {"error": str(exc), "type": type(exc).__name__}
+        except Exception as exc:
+            return 500, {"error": str(exc), "type": type(exc).__name__}
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, ready=None):
+        """Run until cancelled. `ready` (if given) is called with the bound port."""
+        if not self.token and not is_loopback(host):
+            raise ValueError(
+                f"Refusing to serve on {host} without a token; set {SERVICE_TOKEN_ENV} "
+                "or pass --token (only 127.0.0.1/localhost may run without one)."
+            )
+        self._writes = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer())
+        # Thumbnails for candidates added before they existed are made here,
+        # next to the database, rather than on every terminal.
+        self.db.backfill_thumbnails_in_background()
+        self.db.prune_history_in_background()
+        server = await asyncio.start_server(self.handle, host, port)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._writer_task.cancel()
+            self._read_pool.shutdown(wait=False)
+            self._write_pool.shutdown(wait=True)
+            self.db.close_all()
+
+
+def is_loopback(host):
+    """True if `host` only accepts connections from this machine."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _version = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line.")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0) or 0)
+    except ValueError:
+        raise HTTPError(400, "Bad Content-Length.")
+    if length > MAX_BODY:
+        raise HTTPError(413, "Request body too large.")
+    raw = await reader.readexactly(length) if length else b""
+    return method.upper(), path, headers, raw
+
+
+def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UTAMU Voting System vote service")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address to listen on (0.0.0.0 for every terminal on the LAN)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", default=DB_NAME)
+    parser.add_argument("--profile", default="server",
+                        help="connection profile from connection.PERFORMANCE_PROFILES")
+    parser.add_argument("--token", default=os.environ.get(SERVICE_TOKEN_ENV),
+                        help=f"shared secret terminals must send (default: ${SERVICE_TOKEN_ENV}); "
+                             "required unless --host is a loopback address")
+    args = parser.parse_args()
+    if not args.token and not is_loopback(args.host):
+        parser.error(f"--host {args.host} needs a token: set {SERVICE_TOKEN_ENV} or pass --token")
+
+    service = VoteService(args.db, profile=args.profile, token=args.token)
+    print(f"Vote service for {args.db} on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
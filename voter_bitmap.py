@@ -0,0 +1,126 @@
+# voter_bitmap.py
+import threading
+import time
+
+
+class VoterBitmap:
+    """Who has voted in the current election, one bit per student id.
+
+    Ballots carry no voter link, so other terminals' votes are followed
+    through students.voted_epoch: when the voted count there moves, the
+    voted ids are re-read from idx_students_voted. Lookups and turnout are
+    O(1); the write path marks voters directly, and sync() catches up with
+    everyone else's writes.
+    """
+
+    def __init__(self, max_age=2.0):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._bits = bytearray()
+        self._ids = {}              # regno -> student id
+        self.voted = 0
+        self.epoch = None
+        self._last_student = 0
+        self._synced_at = None
+
+    # ---------- lookups ----------
+    def has_voted(self, regno):
+        """True/False for a registered student, None for an unknown regno."""
+        student_id = self._ids.get(regno)
+        if student_id is None:
+            return None
+        return self._get(student_id)
+
+    def turnout(self):
+        """(students who voted, students registered)."""
+        return self.voted, len(self._ids)
+
+    # ---------- updates ----------
+    def mark(self, regno):
+        """Record a vote the caller has just committed."""
+        with self._lock:
+            student_id = self._ids.get(regno)
+            if student_id is not None:
+                self._set(student_id)
+
+    def invalidate(self):
+        """Force a full reload on the next sync (e.g. a new election epoch)."""
+        self._synced_at = None
+        self.epoch = None
+
+    def sync(self, conn, max_age=None):
+        """Catch up with the database if the bitmap is older than max_age seconds."""
+        max_age = self.max_age if max_age is None else max_age
+        now = time.monotonic()
+        if self._synced_at is not None and now - self._synced_at < max_age:
+            return
+        with self._lock:
+            epoch = conn.execute("SELECT MAX(epoch) FROM elections").fetchone()[0]
+            if epoch != self.epoch:
+                self._reload(conn, epoch)
+            else:
+                self._catch_up(conn, epoch)
+            self._synced_at = now
+
+    def _reload(self, conn, epoch):
+        # The new maps are built aside and swapped in, so lookups on other
+        # threads never see a half-loaded bitmap.
+        bits, ids = bytearray(), {}
+        voted = last_student = 0
+        rows = conn.execute(
+            "SELECT id, regno, voted_epoch IS ? FROM students", (epoch,)
+        ).fetchall()
+        for student_id, regno, has_voted in rows:
+            last_student = max(last_student, student_id)
+            ids[regno] = student_id
+            if has_voted:
+                voted += _set_bit(bits, student_id)
+        self._bits, self._ids, self.voted = bits, ids, voted
+        self._last_student = last_student
+        self.epoch = epoch
+
+    def _catch_up(self, conn, epoch):
+        self._add_students(conn, epoch)
+        # Votes are never taken back within an epoch, so an unchanged count
+        # means nothing to do; the count and the re-read are index-only.
+        voted = conn.execute(
+            "SELECT COUNT(*) FROM students WHERE voted_epoch = ?", (epoch,)
+        ).fetchone()[0]
+        if voted == self.voted:
+            return
+        rows = conn.execute(
+            "SELECT id FROM students WHERE voted_epoch = ?", (epoch,)
+        ).fetchall()
+        for (student_id,) in rows:
+            self._set(student_id)
+
+    def _add_students(self, conn, epoch):
+        rows = conn.execute(
+            "SELECT id, regno, voted_epoch IS ? FROM students WHERE id > ?",
+            (epoch, self._last_student),
+        ).fetchall()
+        for student_id, regno, voted in rows:
+            self._last_student = max(self._last_student, student_id)
+            self._ids[regno] = student_id
+            if voted:
+                self._set(student_id)
+
+    # ---------- bits ----------
+    def _get(self, student_id):
+        index = student_id >> 3
+        return index < len(self._bits) and bool(self._bits[index] & (1 << (student_id & 7)))
+
+    def _set(self, student_id):
+        self.voted += _set_bit(self._bits, student_id)
+
+
+def _set_bit(bits, index):
+    """Set bit `index`, growing the array as needed; returns 1 if it was clear."""
+    byte = index >> 3
+    if byte >= len(bits):
+        bits.extend(bytes(byte - len(bits) + 1024))
+    mask = 1 << (index & 7)
+    if bits[byte] & mask:
+        return 0
+    bits[byte] |= mask
+    return 1
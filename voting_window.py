@@ -0,0 +1,70 @@
+# voting_window.py
+import time
+from datetime import datetime
+
+
+# Seconds a loaded window is trusted before voting_settings is read again.
+# Writes through set_voting_duration invalidate it at once; the re-check
+# only picks up a window changed by another process on the same file.
+RECHECK_SECONDS = 10.0
+
+PHASE_MESSAGES = {
+    "unset": "Voting period not set.",
+    "invalid": "Invalid voting period format.",
+    "pending": "Voting has not started yet.",
+    "open": "Voting is open.",
+    "closed": "Voting period is over.",
+}
+
+
+class VotingWindow:
+    """The voting period, parsed once from the stored (start, end) strings.
+
+    All checks are plain datetime comparisons, so asking whether voting is
+    open costs no I/O. `now` defaults to the local wall clock, which is how
+    the period is entered on the admin screen.
+    """
+
+    def __init__(self, duration):
+        self.duration = tuple(duration) if duration else None
+        self.start = self.end = None
+        self.valid = False
+        if self.duration:
+            try:
+                self.start = datetime.fromisoformat(self.duration[0])
+                self.end = datetime.fromisoformat(self.duration[1])
+                self.valid = True
+            except (TypeError, ValueError):
+                self.start = self.end = None
+        self.loaded_at = time.monotonic()
+
+    def phase(self, now=None):
+        """'unset', 'invalid', 'pending', 'open' or 'closed'."""
+        if not self.duration:
+            return "unset"
+        if not self.valid:
+            return "invalid"
+        now = now or datetime.now()
+        if now < self.start:
+            return "pending"
+        if now > self.end:
+            return "closed"
+        return "open"
+
+    def is_open(self, now=None):
+        return self.phase(now) == "open"
+
+    def status(self, now=None):
+        """(is_open, message), the shape is_voting_open has always returned."""
+        phase = self.phase(now)
+        return phase == "open", PHASE_MESSAGES[phase]
+
+    def remaining(self, now=None):
+        """Seconds until voting closes (0 once it has, None if no valid period)."""
+        if not self.valid:
+            return None
+        now = now or datetime.now()
+        return max((self.end - now).total_seconds(), 0.0)
+
+    def is_stale(self):
+        return time.monotonic() - self.loaded_at > RECHECK_SECONDS